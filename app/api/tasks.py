@@ -1,65 +1,541 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-from database.session import get_db
-from models.task import Task
+import csv
+import io
+import json
+from datetime import datetime
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import select, insert, update, delete, case, func, tuple_, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
+from database.session import get_async_db, commit_with_retry
+from database.search import tasks_fts, build_match_query, render_highlight, HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE
+from models.task import Task, TaskTombstone
 from models.user import User
-from schemas.task import TaskCreate, TaskOut, TaskStatusUpdate
-from common.auth import get_current_user
+from schemas.task import (
+    TaskCreate, TaskOut, TaskChanges, TaskSearchResult, TaskStatus, TaskStatusUpdate, TaskBulkUpdate, TaskBulkStatusUpdate,
+    TaskBulkDelete, TaskBulkItemResult, TaskImportError, TaskImportResult, TASKS_BULK_MAX_SIZE
+)
+from common.auth import get_current_principal, credentials_exception, Principal
+from common.pagination import TASKS_PAGE_SIZE, TASKS_MAX_PAGE_SIZE, encode_cursor, decode_cursor
+from common.responses import FastJSONResponse, dump_json, trusted_rows
+from common.revisions import bump_revision, get_revision, revision_headers, etag_matches, task_list_cache
+from common.metrics import InstrumentedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
+
+# Leituras só de listagem: colunas via Core, linhas como Row (tupla) em vez de instâncias ORM
+TASK_OUT_COLUMNS = tuple(getattr(Task, field) for field in TaskOut.model_fields)
 
 @router.post("/tasks", response_model=TaskOut, summary="Criar Tarefa", description="Cria uma nova tarefa para o usuário autenticado")
-def create_task(task: TaskCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    db_task = Task(**task.dict(), user_id=current_user.id)
-    db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+async def create_task(task: TaskCreate, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_async_db)):
+    values = {**task.dict(), "user_id": current_user.id}
+    
+    async def write():
+        db_task = Task(**values, revision=await bump_revision(db, current_user.id))
+        db.add(db_task)
+        return db_task
+    
+    db_task = await commit_with_retry(db, write)
+    task_list_cache.invalidate_user(current_user.id)
+    await db.refresh(db_task)
     return db_task
 
-@router.get("/tasks", response_model=List[TaskOut], summary="Listar Tarefas", description="Lista todas as tarefas do usuário autenticado")
-def get_tasks(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    return db.query(Task).filter(Task.user_id == current_user.id).all()
+def _title_prefix_upper_bound(prefix: str):
+    """Menor string maior que todas as que começam com `prefix` (None se não houver)."""
+    while prefix:
+        code = ord(prefix[-1]) + 1
+        if 0xD800 <= code <= 0xDFFF:
+            code = 0xE000
+        if code <= 0x10FFFF:
+            return prefix[:-1] + chr(code)
+        prefix = prefix[:-1]
+    return None
+
+@router.get("/tasks", response_model=List[TaskOut], summary="Listar Tarefas", description="Lista as tarefas do usuário autenticado, com filtros e ordenação, paginadas por cursor (header X-Next-Cursor)")
+async def get_tasks(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=TASKS_MAX_PAGE_SIZE, description="Quantidade máxima de tarefas na página"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado em X-Next-Cursor"),
+    status: Optional[TaskStatus] = Query(None, description="Filtrar por status"),
+    title_prefix: Optional[str] = Query(None, min_length=1, max_length=200, description="Filtrar por início do título (diferencia maiúsculas)"),
+    sort: Literal["id", "title"] = Query("id", description="Campo de ordenação"),
+    order: Literal["asc", "desc"] = Query("asc", description="Direção da ordenação"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+):
+    limit = limit or TASKS_PAGE_SIZE
+    last_id, last_title = decode_cursor(cursor, current_user.id) if cursor else (None, None)
+    if cursor and (last_title is None) != (sort == "id"):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    
+    # Nada mudou desde a revisão que o cliente já tem: 304 sem consultar as tarefas
+    revision = await get_revision(db, current_user.id)
+    headers = revision_headers(current_user.id, revision)
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    
+    # Página já serializada nesta revisão: sem consultar nem montar TaskOut
+    page_key = (revision, limit, cursor, status, title_prefix, sort, order)
+    cached = task_list_cache.get(current_user.id, page_key)
+    if cached is not None:
+        body, page_headers = cached
+        return Response(content=body, media_type="application/json", headers={**headers, **page_headers})
+    
+    # Filtros de igualdade/intervalo sobre os índices (user_id[, status], title|id)
+    query = select(*TASK_OUT_COLUMNS).where(Task.user_id == current_user.id)
+    if status is not None:
+        query = query.where(Task.status == status)
+    if title_prefix is not None:
+        # Intervalo em vez de LIKE: o LIKE do SQLite ignora maiúsculas e não usa o índice
+        upper_bound = _title_prefix_upper_bound(title_prefix)
+        query = query.where(Task.title >= title_prefix)
+        if upper_bound is not None:
+            query = query.where(Task.title < upper_bound)
+        else:
+            query = query.where(func.substr(Task.title, 1, len(title_prefix)) == title_prefix)
+    
+    # Keyset: continua após a última chave de ordenação vista em vez de OFFSET
+    sort_key = (Task.id,) if sort == "id" else (Task.title, Task.id)
+    if cursor:
+        position = tuple_(*sort_key) if sort == "title" else Task.id
+        boundary = tuple_(last_title, last_id) if sort == "title" else last_id
+        query = query.where(position > boundary if order == "asc" else position < boundary)
+    query = query.order_by(*(column.asc() if order == "asc" else column.desc() for column in sort_key))
+    
+    # Um item a mais indica próxima página
+    result = await db.execute(query.limit(limit + 1))
+    tasks = result.all()
+    page_headers = {}
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        page_headers["X-Next-Cursor"] = encode_cursor(current_user.id, last.id, last.title if sort == "title" else None)
+    
+    # Linhas do banco já são TaskOut válidas: serializa direto, sem revalidar cada item
+    body = dump_json(trusted_rows(tasks, TaskOut))
+    task_list_cache.set(current_user.id, page_key, body, page_headers)
+    return Response(content=body, media_type="application/json", headers={**headers, **page_headers})
+
+@router.get("/tasks/changes", response_model=TaskChanges, summary="Alterações de Tarefas", description="Tarefas criadas, alteradas ou removidas desde `since` (next_since da chamada anterior), para sincronização incremental")
+async def get_task_changes(
+    since: Optional[str] = Query(None, description="next_since da sincronização anterior; omitido = sincronização completa"),
+    limit: Optional[int] = Query(None, ge=1, le=TASKS_MAX_PAGE_SIZE, description="Quantidade máxima de alterações na página"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+):
+    limit = limit or TASKS_PAGE_SIZE
+    user_id = current_user.id
+    result = await db.execute(select(User.revision, User.compacted_revision).where(User.id == user_id))
+    row = result.first()
+    if row is None:
+        raise credentials_exception()
+    current_revision, compacted_revision = row
+    
+    # Posição (revisão, id) da última alteração entregue; id 0 = revisão inteira já vista
+    last_revision, last_id = 0, 0
+    if since:
+        last_id, last_revision = decode_cursor(since, user_id)
+        try:
+            last_revision = int(last_revision)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+        if (compacted_revision and last_revision <= compacted_revision) or last_revision > current_revision + 1:
+            raise HTTPException(status_code=410, detail="Alterações não disponíveis desde esta posição; faça uma sincronização completa")
+    
+    # Duas varreduras por intervalo em (user_id, revision, id), intercaladas pela mesma chave
+    result = await db.execute(
+        select(Task.revision, *TASK_OUT_COLUMNS)
+        .where(Task.user_id == user_id, tuple_(Task.revision, Task.id) > tuple_(last_revision, last_id))
+        .order_by(Task.revision, Task.id)
+        .limit(limit + 1)
+    )
+    changes = [(task.revision, task.id, task) for task in result]
+    result = await db.execute(
+        select(TaskTombstone.revision, TaskTombstone.task_id)
+        .where(TaskTombstone.user_id == user_id, tuple_(TaskTombstone.revision, TaskTombstone.task_id) > tuple_(last_revision, last_id))
+        .order_by(TaskTombstone.revision, TaskTombstone.task_id)
+        .limit(limit + 1)
+    )
+    changes += [(revision, task_id, None) for revision, task_id in result]
+    changes.sort(key=lambda change: change[:2])
+    
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    if has_more:
+        next_since = encode_cursor(user_id, changes[-1][1], str(changes[-1][0]))
+    else:
+        # Tudo até a revisão atual foi entregue: a próxima escrita terá revisão maior
+        next_since = encode_cursor(user_id, 0, str(current_revision + 1))
+    return FastJSONResponse({
+        "tasks": trusted_rows((task for _, _, task in changes if task is not None), TaskOut),
+        "deleted": [task_id for _, task_id, task in changes if task is None],
+        "next_since": next_since,
+        "has_more": has_more,
+    })
+
+SEARCH_SNIPPET_TOKENS = 12
+
+@router.get("/tasks/search", response_model=List[TaskSearchResult], summary="Buscar Tarefas", description="Busca textual no título e na descrição das tarefas do usuário, por relevância (paginada por cursor em X-Next-Cursor)")
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200, description="Palavras a buscar; a última casa por prefixo"),
+    limit: Optional[int] = Query(None, ge=1, le=TASKS_MAX_PAGE_SIZE, description="Quantidade máxima de tarefas na página"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado em X-Next-Cursor"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+):
+    limit = limit or TASKS_PAGE_SIZE
+    match = build_match_query(q, current_user.id)
+    if match is None:
+        raise HTTPException(status_code=400, detail="A busca deve conter ao menos uma palavra")
+    
+    fts = literal_column("tasks_fts")
+    query = (
+        select(
+            *TASK_OUT_COLUMNS,
+            tasks_fts.c.rank,
+            func.highlight(fts, 0, HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE).label("highlight"),
+            func.snippet(fts, 1, HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE, "…", SEARCH_SNIPPET_TOKENS).label("snippet"),
+        )
+        .select_from(tasks_fts)
+        .join(Task, Task.id == tasks_fts.c.rowid)
+        .where(fts.op("MATCH")(match), Task.user_id == current_user.id)
+    )
+    if cursor:
+        # Keyset por (relevância, id); o rank vai no cursor como texto (repr preserva o float)
+        last_id, last_rank = decode_cursor(cursor, current_user.id)
+        try:
+            last_rank = float(last_rank)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+        query = query.where(tuple_(tasks_fts.c.rank, Task.id) > tuple_(last_rank, last_id))
+    
+    result = await db.execute(query.order_by(tasks_fts.c.rank, Task.id).limit(limit + 1))
+    rows = result.all()
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Cursor"] = encode_cursor(current_user.id, rows[-1].id, repr(rows[-1].rank))
+    
+    tasks = trusted_rows(rows, TaskOut)
+    for task, row in zip(tasks, rows):
+        task["title_highlight"] = render_highlight(row.highlight)
+        task["snippet"] = render_highlight(row.snippet) if row.description else None
+    return FastJSONResponse(tasks, headers=headers)
+
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_COLUMNS = ("title", "description", "id", "status", "user_id")
+
+@router.get("/tasks/export", summary="Exportar Tarefas", description="Exporta todas as tarefas do usuário em streaming (NDJSON ou CSV)")
+async def export_tasks(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Formato da exportação"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # A sessão da dependência é fechada antes do corpo ser enviado: o streaming abre a sua própria
+    engine = db.bind
+    user_id = current_user.id
+    
+    async def rows():
+        if format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            yield buffer.getvalue()
+        
+        async with AsyncSession(engine) as stream_db:
+            # Colunas via Core + yield_per: cursor server-side, sem identity map crescendo
+            result = await stream_db.stream(
+                select(*(getattr(Task, column) for column in EXPORT_COLUMNS))
+                .where(Task.user_id == user_id)
+                .order_by(Task.id)
+                .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+            )
+            async for partition in result.partitions():
+                if format == "csv":
+                    buffer = io.StringIO()
+                    csv.writer(buffer).writerows(partition)
+                    yield buffer.getvalue()
+                else:
+                    yield "".join(
+                        json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + "\n"
+                        for row in partition
+                    )
+    
+    if format == "csv":
+        return StreamingResponse(rows(), media_type="text/csv", headers={"Content-Disposition": 'attachment; filename="tasks.csv"'})
+    return StreamingResponse(rows(), media_type="application/x-ndjson", headers={"Content-Disposition": 'attachment; filename="tasks.ndjson"'})
+
+IMPORT_BATCH_SIZE = 1000
+IMPORT_MAX_LINE_BYTES = 64 * 1024
+IMPORT_MAX_REPORTED_ERRORS = 100
+
+async def _ndjson_lines(request: Request):
+    """Gera (número da linha, bytes) à medida que o corpo chega, sem carregá-lo inteiro.
+
+    Linhas maiores que IMPORT_MAX_LINE_BYTES são descartadas e geradas como None.
+    """
+    buffer = b""
+    line_number = 0
+    skipping = False
+    async for chunk in request.stream():
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            line_number += 1
+            yield line_number, None if skipping or len(line) > IMPORT_MAX_LINE_BYTES else line
+            skipping = False
+        if len(buffer) > IMPORT_MAX_LINE_BYTES:
+            buffer = b""
+            skipping = True
+    if skipping or buffer:
+        yield line_number + 1, None if skipping or len(buffer) > IMPORT_MAX_LINE_BYTES else buffer
+
+def _parse_import_line(line: bytes) -> dict:
+    if line is None:
+        raise ValueError(f"Linha excede {IMPORT_MAX_LINE_BYTES} bytes")
+    try:
+        data = json.loads(line)
+    except RecursionError:
+        raise ValueError("JSON com aninhamento excessivo")
+    if not isinstance(data, dict):
+        raise ValueError("Cada linha deve ser um objeto JSON")
+    return TaskCreate(**data).dict()
+
+@router.post(
+    "/tasks/import",
+    response_model=TaskImportResult,
+    summary="Importar Tarefas",
+    description="Importa tarefas de um corpo NDJSON (um objeto TaskCreate por linha) em lotes",
+    openapi_extra={"requestBody": {"required": True, "content": {"application/x-ndjson": {"schema": {"type": "string"}}}}},
+)
+async def import_tasks(request: Request, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_async_db)):
+    user_id = current_user.id
+    accepted = 0
+    errors = []
+    rejected = 0
+    batch = []
+    
+    async def write_batch(rows):
+        revision = await bump_revision(db, user_id)
+        await db.execute(insert(Task), [{**row, "revision": revision} for row in rows])
+    
+    async for line_number, line in _ndjson_lines(request):
+        if line is not None and not line.strip():
+            continue
+        try:
+            task = _parse_import_line(line)
+        except HTTPException as exc:
+            detail = exc.detail
+        except ValidationError as exc:
+            detail = "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in exc.errors())
+        except (ValueError, TypeError) as exc:
+            detail = str(exc)
+        else:
+            batch.append({**task, "user_id": user_id})
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                # executemany + commit por lote: transações curtas, memória limitada ao lote
+                await commit_with_retry(db, lambda: write_batch(batch))
+                task_list_cache.invalidate_user(user_id)
+                accepted += len(batch)
+                batch = []
+            continue
+        
+        rejected += 1
+        if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+            errors.append(TaskImportError(line=line_number, detail=detail))
+    
+    if batch:
+        await commit_with_retry(db, lambda: write_batch(batch))
+        task_list_cache.invalidate_user(user_id)
+        accepted += len(batch)
+    
+    return TaskImportResult(accepted=accepted, rejected=rejected, errors=errors)
+
+# Rotas em lote: declaradas antes de /tasks/{task_id} para "bulk" não cair no parâmetro de path
+
+async def _returned_ids(db: AsyncSession, statement):
+    result = await db.execute(statement)
+    return result.scalars().all()
+
+async def _add_tombstones(db: AsyncSession, user_id: int, task_ids, revision: int):
+    if task_ids:
+        deleted_at = datetime.utcnow()
+        await db.execute(insert(TaskTombstone), [
+            {"task_id": task_id, "user_id": user_id, "revision": revision, "deleted_at": deleted_at}
+            for task_id in task_ids
+        ])
+
+def _bulk_results(requested_ids, affected_ids):
+    affected_ids = set(affected_ids)
+    results = []
+    for task_id in requested_ids:
+        if task_id <= 0:
+            results.append(TaskBulkItemResult(id=task_id, success=False, detail="ID da tarefa deve ser um número positivo"))
+        elif task_id in affected_ids:
+            results.append(TaskBulkItemResult(id=task_id, success=True))
+        else:
+            results.append(TaskBulkItemResult(id=task_id, success=False, detail="Tarefa não encontrada ou não pertence ao usuário"))
+    return results
+
+@router.post("/tasks/bulk", response_model=List[TaskOut], summary="Criar Tarefas em Lote", description="Cria várias tarefas em um único INSERT e uma única transação")
+async def create_tasks_bulk(
+    tasks: List[TaskCreate] = Body(..., min_length=1, max_length=TASKS_BULK_MAX_SIZE),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rows = [{**task.dict(), "user_id": current_user.id} for task in tasks]
+    
+    async def write():
+        revision = await bump_revision(db, current_user.id)
+        result = await db.execute(insert(Task).returning(Task, sort_by_parameter_order=True), [{**row, "revision": revision} for row in rows])
+        return result.scalars().all()
+    
+    tasks = await commit_with_retry(db, write)
+    task_list_cache.invalidate_user(current_user.id)
+    return tasks
+
+@router.put("/tasks/bulk", response_model=List[TaskBulkItemResult], summary="Atualizar Tarefas em Lote", description="Atualiza várias tarefas do usuário em um único UPDATE")
+async def update_tasks_bulk(
+    tasks: List[TaskBulkUpdate] = Body(..., min_length=1, max_length=TASKS_BULK_MAX_SIZE),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+):
+    titles = {task.id: task.title for task in tasks if task.id > 0}
+    descriptions = {task.id: task.description for task in tasks if task.id > 0 and task.description is not None}
+    
+    affected_ids = []
+    if titles:
+        # CASE por id: um único UPDATE com valores diferentes por linha; description None mantém o valor atual
+        values = {"title": case(titles, value=Task.id, else_=Task.title)}
+        if descriptions:
+            values["description"] = case(descriptions, value=Task.id, else_=Task.description)
+        statement = (
+            update(Task)
+            .where(Task.user_id == current_user.id, Task.id.in_(titles))
+            .values(**values)
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        
+        async def write():
+            revision = await bump_revision(db, current_user.id)
+            return await _returned_ids(db, statement.values(revision=revision))
+        
+        affected_ids = await commit_with_retry(db, write)
+        task_list_cache.invalidate_user(current_user.id)
+    return _bulk_results([task.id for task in tasks], affected_ids)
+
+@router.patch("/tasks/bulk/status", response_model=List[TaskBulkItemResult], summary="Atualizar Status em Lote", description="Atualiza o status de várias tarefas em um único UPDATE")
+async def update_tasks_status_bulk(status_data: TaskBulkStatusUpdate, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_async_db)):
+    statement = (
+        update(Task)
+        .where(Task.user_id == current_user.id, Task.id.in_(status_data.ids))
+        .values(status=status_data.status)
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    
+    async def write():
+        revision = await bump_revision(db, current_user.id)
+        return await _returned_ids(db, statement.values(revision=revision))
+    
+    affected_ids = await commit_with_retry(db, write)
+    task_list_cache.invalidate_user(current_user.id)
+    return _bulk_results(status_data.ids, affected_ids)
+
+@router.post("/tasks/bulk/delete", response_model=List[TaskBulkItemResult], summary="Deletar Tarefas em Lote", description="Remove várias tarefas do usuário em um único DELETE")
+async def delete_tasks_bulk(delete_data: TaskBulkDelete, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_async_db)):
+    statement = (
+        delete(Task)
+        .where(Task.user_id == current_user.id, Task.id.in_(delete_data.ids))
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    
+    async def write():
+        revision = await bump_revision(db, current_user.id)
+        ids = await _returned_ids(db, statement)
+        await _add_tombstones(db, current_user.id, ids, revision)
+        return ids
+    
+    affected_ids = await commit_with_retry(db, write)
+    task_list_cache.invalidate_user(current_user.id)
+    return _bulk_results(delete_data.ids, affected_ids)
+
+def _task_not_found():
+    return HTTPException(status_code=404, detail="Tarefa não encontrada ou não pertence ao usuário")
+
+# Escritas de uma tarefa: um UPDATE/DELETE restrito ao dono, sem SELECT antes nem refresh
+# depois; zero linhas afetadas = 404 (a revisão incrementada é descartada no rollback)
 
 @router.put("/tasks/{task_id}", response_model=TaskOut, summary="Atualizar Tarefa", description="Atualiza uma tarefa específica do usuário")
-def update_task(task_id: int, task: TaskCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def update_task(task_id: int, task: TaskCreate, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_async_db)):
     if task_id <= 0:
         raise HTTPException(status_code=400, detail="ID da tarefa deve ser um número positivo")
     
-    db_task = db.query(Task).filter(Task.id == task_id, Task.user_id == current_user.id).first()
-    if not db_task:
-        raise HTTPException(status_code=404, detail="Tarefa não encontrada ou não pertence ao usuário")
+    user_id = current_user.id
+    statement = (
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == user_id)
+        .values(**{key: value for key, value in task.dict().items() if value is not None})
+        .returning(*TASK_OUT_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
     
-    for key, value in task.dict().items():
-        if value is not None:
-            setattr(db_task, key, value)
+    async def write():
+        revision = await bump_revision(db, user_id)
+        row = (await db.execute(statement.values(revision=revision))).first()
+        if row is None:
+            raise _task_not_found()
+        return row
     
-    db.commit()
-    db.refresh(db_task)
-    return db_task
+    row = await commit_with_retry(db, write)
+    task_list_cache.invalidate_user(user_id)
+    return TaskOut.model_validate(row)
 
 @router.patch("/tasks/{task_id}/status", summary="Atualizar Status", description="Atualiza o status da tarefa (Pendente, Em Progresso, Concluída)")
-def update_task_status(task_id: int, status_data: TaskStatusUpdate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def update_task_status(task_id: int, status_data: TaskStatusUpdate, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_async_db)):
     if task_id <= 0:
         raise HTTPException(status_code=400, detail="ID da tarefa deve ser um número positivo")
     
-    db_task = db.query(Task).filter(Task.id == task_id, Task.user_id == current_user.id).first()
-    if not db_task:
-        raise HTTPException(status_code=404, detail="Tarefa não encontrada ou não pertence ao usuário")
+    user_id = current_user.id
+    statement = (
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == user_id)
+        .values(status=status_data.status)
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    
+    async def write():
+        revision = await bump_revision(db, user_id)
+        if not await _returned_ids(db, statement.values(revision=revision)):
+            raise _task_not_found()
     
-    db_task.status = status_data.status
-    db.commit()
+    await commit_with_retry(db, write)
+    task_list_cache.invalidate_user(user_id)
     return {"message": f"Status da tarefa atualizado para: {status_data.status}"}
 
 @router.delete("/tasks/{task_id}", summary="Deletar Tarefa", description="Remove uma tarefa específica do usuário")
-def delete_task(task_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def delete_task(task_id: int, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_async_db)):
     if task_id <= 0:
         raise HTTPException(status_code=400, detail="ID da tarefa deve ser um número positivo")
     
-    db_task = db.query(Task).filter(Task.id == task_id, Task.user_id == current_user.id).first()
-    if not db_task:
-        raise HTTPException(status_code=404, detail="Tarefa não encontrada ou não pertence ao usuário")
+    user_id = current_user.id
+    statement = (
+        delete(Task)
+        .where(Task.id == task_id, Task.user_id == user_id)
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    
+    async def write():
+        revision = await bump_revision(db, user_id)
+        ids = await _returned_ids(db, statement)
+        if not ids:
+            raise _task_not_found()
+        await _add_tombstones(db, user_id, ids, revision)
     
-    db.delete(db_task)
-    db.commit()
+    await commit_with_retry(db, write)
+    task_list_cache.invalidate_user(user_id)
     return {"message": "Tarefa deletada com sucesso"}
\ No newline at end of file
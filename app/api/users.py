@@ -1,29 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database.session import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.session import get_async_db, commit_with_retry
 from models.user import User
 from schemas.user import UserOut, UserCreate
-from common.auth import get_current_user, get_password_hash
+from common.auth import get_current_user, get_current_principal, get_password_hash_async, user_cache, revoked_users, credentials_exception, Principal
+from common.revisions import bump_revision, revision_headers, etag_matches, task_list_cache
+from common.metrics import InstrumentedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
 
 @router.get("/users/me", response_model=UserOut, summary="Meu Perfil", description="Obtém informações do usuário autenticado")
-def get_current_user_info(current_user: User = Depends(get_current_user)):
-    return current_user
+async def get_current_user_info(request: Request, response: Response, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_async_db)):
+    # Perfil e revisão lidos juntos do banco, sem o user_cache: o ETag é o da linha enviada
+    result = await db.execute(
+        select(User.id, User.username, User.email, User.revision).where(User.id == current_user.id)
+    )
+    row = result.first()
+    if row is None:
+        raise credentials_exception()
+    
+    headers = revision_headers(row.id, row.revision)
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return UserOut.model_validate(row)
 
 @router.put("/users/me", response_model=UserOut, summary="Atualizar Perfil", description="Atualiza dados do usuário autenticado")
-def update_current_user(user_data: UserCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    current_user.username = user_data.username
-    current_user.email = user_data.email
-    if user_data.password:
-        current_user.hashed_password = get_password_hash(user_data.password)
+async def update_current_user(user_data: UserCreate, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    user_id = current_user.id
+    hashed_password = await get_password_hash_async(user_data.password) if user_data.password else None
+    
+    async def write():
+        current_user.username = user_data.username
+        current_user.email = user_data.email
+        if hashed_password:
+            current_user.hashed_password = hashed_password
+        await bump_revision(db, user_id)
     
-    db.commit()
-    db.refresh(current_user)
+    await commit_with_retry(db, write)
+    user_cache.invalidate(user_id)
+    await db.refresh(current_user)
     return current_user
 
 @router.delete("/users/me", summary="Deletar Conta", description="Remove a conta do usuário autenticado")
-def delete_current_user(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    db.delete(current_user)
-    db.commit()
+async def delete_current_user(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    user_id = current_user.id
+    
+    async def write():
+        await db.delete(current_user)
+    
+    await commit_with_retry(db, write)
+    user_cache.invalidate(user_id)
+    task_list_cache.invalidate_user(user_id)
+    revoked_users.set(user_id, True)
     return {"message": "User deleted successfully"}
\ No newline at end of file
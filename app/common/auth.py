@@ -1,12 +1,21 @@
 import os
+import time
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from database.session import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from database.session import get_async_db
 from models.user import User
+from common.cache import TTLCache
+from common.metrics import password_hash_seconds, jwt_verify_seconds, cache_stats
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,41 +23,180 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 1024))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", 60))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 4096))
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", PASSWORD_HASH_WORKERS * 4))
+# Revogação no modo stateless só vale no processo que removeu a conta (revoked_users);
+# nos demais o token segue aceito até `exp`, exceto onde a revisão em users é lida
+# (escritas, GET /tasks e /tasks/changes respondem 401). Use tokens curtos se isso não
+# for aceitável.
+AUTH_STATELESS = os.getenv("AUTH_STATELESS", "false").lower() in ("1", "true", "yes")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Versão do formato das claims: 1 = {"sub": "<id do usuário>", "ver": 1}. users.id é
+# AUTOINCREMENT (migração 0006), então o id de uma conta removida não passa para outra.
+# Tokens sem "ver" são do formato antigo ({"sub": "<username>"}) e continuam aceitos até expirar.
+TOKEN_CLAIMS_VERSION = 1
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Usuários autenticados por id; invalidado pelas escritas em /users/me
+user_cache = cache_stats.track("user", TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS))
+USER_CACHE_COLUMNS = ("id", "username", "email", "hashed_password")
+
+# Claims de tokens já verificados, por SHA-256 do token; cada entrada expira no `exp` do token
+token_cache = cache_stats.track("token", TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60))
+
+# Ids de contas removidas neste processo, pelo tempo de vida de um token: no modo
+# stateless é o que impede tokens ainda válidos de contas deletadas de serem aceitos
+revoked_users = TTLCache(maxsize=max(USER_CACHE_SIZE, 1024), ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+class Principal:
+    """Usuário autenticado carregando só o id, para endpoints que não usam o perfil."""
+    __slots__ = ("id",)
+
+    def __init__(self, id: int):
+        self.id = id
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+# bcrypt roda num executor dedicado; o semáforo limita quantas operações podem estar
+# em andamento/na fila e as excedentes recebem 503 imediatamente
+_hash_executor = None
+_hash_slots = threading.BoundedSemaphore(PASSWORD_HASH_MAX_PENDING)
+
+def _get_hash_executor():
+    global _hash_executor
+    if _hash_executor is None:
+        if PASSWORD_HASH_EXECUTOR == "process":
+            _hash_executor = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+        else:
+            _hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+    return _hash_executor
+
+async def _run_password_hashing(operation: str, func, *args):
+    if not _hash_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado, tente novamente em instantes",
+            headers={"Retry-After": "1"},
+        )
+    started = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_hash_executor(), func, *args)
+    finally:
+        password_hash_seconds.observe(time.perf_counter() - started, (operation,))
+        _hash_slots.release()
+
+async def verify_password_async(plain_password, hashed_password):
+    return await _run_password_hashing("verify", verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    return await _run_password_hashing("hash", get_password_hash, password)
+
+def user_token_claims(user: User) -> dict:
+    return {"sub": str(user.id), "ver": TOKEN_CLAIMS_VERSION}
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
+def decode_access_token(token: str) -> dict:
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
+    
+    started = time.perf_counter()
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    finally:
+        jwt_verify_seconds.observe(time.perf_counter() - started)
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)) and exp > time.time():
+        token_cache.set(key, payload, ttl=exp - time.time())
+    return payload
+
+def credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Token de acesso requerido",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+def _verified_claims(token: str) -> dict:
     if token is None:
-        raise credentials_exception
+        raise credentials_exception()
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
+        payload = decode_access_token(token)
     except JWTError:
-        raise credentials_exception
+        raise credentials_exception()
+    
+    if payload.get("sub") is None:
+        raise credentials_exception()
+    return payload
+
+def _claims_user_id(payload: dict):
+    """Id do usuário para tokens no formato atual; None para tokens antigos (sub=username)."""
+    if payload.get("ver") != TOKEN_CLAIMS_VERSION:
+        return None
+    try:
+        return int(payload["sub"])
+    except (TypeError, ValueError):
+        raise credentials_exception()
+
+async def _user_columns(payload: dict, db: AsyncSession) -> dict:
+    """Colunas do usuário do token (cache ou SELECT só dessas colunas, sem instância ORM)."""
+    user_id = _claims_user_id(payload)
+    if user_id is None:
+        condition = User.username == payload["sub"]
+    else:
+        cached = user_cache.get(user_id)
+        if cached is not None:
+            return cached
+        condition = User.id == user_id
     
-    user = db.query(User).filter(User.username == username).first()
-    if user is None:
-        raise credentials_exception
-    return user
\ No newline at end of file
+    result = await db.execute(select(*(getattr(User, column) for column in USER_CACHE_COLUMNS)).where(condition))
+    row = result.first()
+    if row is None:
+        raise credentials_exception()
+    columns = row._asdict()
+    user_cache.set(columns["id"], columns)
+    return columns
+
+async def _load_user(payload: dict, db: AsyncSession) -> User:
+    # Instância nova por requisição, anexada à sessão como já persistida (sem SELECT)
+    user = User(**await _user_columns(payload, db))
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    return await _load_user(_verified_claims(token), db)
+
+async def get_current_principal(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    """Para endpoints que só precisam de `current_user.id`.
+
+    Com AUTH_STATELESS ligado, tokens no formato atual não consultam a tabela users.
+    """
+    payload = _verified_claims(token)
+    if AUTH_STATELESS:
+        user_id = _claims_user_id(payload)
+        if user_id is not None:
+            if revoked_users.get(user_id):
+                raise credentials_exception()
+            return Principal(user_id)
+    # Só o id é usado: confirma que o usuário existe sem montar a instância ORM
+    columns = await _user_columns(payload, db)
+    return Principal(columns["id"])
\ No newline at end of file
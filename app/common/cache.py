@@ -0,0 +1,174 @@
+import importlib
+import threading
+from abc import ABC, abstractmethod
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    """Cache LRU limitado em memória com expiração (TTL) por entrada."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+class ResponseCache(ABC):
+    """Interface dos caches de respostas serializadas, agrupadas por usuário.
+
+    Implementações alternativas (ex.: compartilhadas entre processos) são escolhidas por
+    TASK_LIST_CACHE_BACKEND=<módulo>:<fábrica>, onde a fábrica recebe `max_bytes`.
+    """
+
+    @abstractmethod
+    def get(self, user_id: int, key):
+        """Retorna (corpo, headers) ou None."""
+
+    @abstractmethod
+    def set(self, user_id: int, key, body: bytes, headers: dict = None):
+        ...
+
+    @abstractmethod
+    def invalidate_user(self, user_id: int):
+        ...
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+    @abstractmethod
+    def stats(self) -> dict:
+        ...
+
+
+class MemoryResponseCache(ResponseCache):
+    """LRU em memória limitado pelo total de bytes dos corpos e headers armazenados."""
+
+    def __init__(self, max_bytes: int, max_entry_bytes: int = None):
+        self.max_bytes = max_bytes
+        # Uma página enorme não deve expulsar o cache inteiro
+        self.max_entry_bytes = max_bytes // 8 if max_entry_bytes is None else max_entry_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._data = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int, key):
+        with self._lock:
+            entry = self._data.get((user_id, key))
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end((user_id, key))
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def set(self, user_id: int, key, body: bytes, headers: dict = None):
+        headers = headers or {}
+        size = len(body) + sum(len(name) + len(value) for name, value in headers.items())
+        if self.max_bytes <= 0 or size > self.max_entry_bytes:
+            return
+        with self._lock:
+            self._remove((user_id, key))
+            self._data[(user_id, key)] = (body, headers, size)
+            self._keys_by_user.setdefault(user_id, set()).add(key)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._data)))
+
+    def _remove(self, entry_key):
+        entry = self._data.pop(entry_key, None)
+        if entry is None:
+            return
+        self.bytes -= entry[2]
+        user_id, key = entry_key
+        keys = self._keys_by_user[user_id]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_user[user_id]
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove((user_id, key))
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._keys_by_user.clear()
+            self.bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "size": len(self._data),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def load_response_cache(backend: str, max_bytes: int) -> ResponseCache:
+    """`memory` (padrão) ou `<módulo>:<fábrica>` para um backend externo."""
+    if backend == "memory":
+        return MemoryResponseCache(max_bytes=max_bytes)
+    module_name, _, factory_name = backend.partition(":")
+    if not factory_name:
+        raise ValueError(f"Backend de cache inválido: {backend!r} (use memory ou <módulo>:<fábrica>)")
+    factory = getattr(importlib.import_module(module_name), factory_name)
+    return factory(max_bytes=max_bytes)
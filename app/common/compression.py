@@ -0,0 +1,156 @@
+"""Compressão das respostas negociada por Accept-Encoding (zstd, br ou gzip).
+
+gzip sempre está disponível; brotli e zstd entram se os pacotes `brotli` e `zstandard`
+estiverem instalados. Corpos menores que COMPRESSION_MIN_SIZE saem sem compressão.
+Respostas em streaming (exportação) são comprimidas pedaço a pedaço, com flush a cada
+pedaço, sem acumular o corpo: o cliente recebe os dados à medida que são gerados.
+"""
+import os
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+from dotenv import load_dotenv
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+load_dotenv()
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", 3))
+
+# Tipos já comprimidos (não ganham nada) e eventos (não podem esperar o compressor)
+EXCLUDED_CONTENT_TYPES = (
+    "text/event-stream", "image/", "video/", "audio/", "application/zip", "application/gzip",
+)
+
+class GzipEncoder:
+    def __init__(self, level: int = COMPRESSION_GZIP_LEVEL):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+class BrotliEncoder:
+    def __init__(self, quality: int = COMPRESSION_BROTLI_QUALITY):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.process(data) + (self._compressor.finish() if final else self._compressor.flush())
+
+class ZstdEncoder:
+    def __init__(self, level: int = COMPRESSION_ZSTD_LEVEL):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        flush_mode = zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        return self._compressor.compress(data) + self._compressor.flush(flush_mode)
+
+def available_encoders() -> dict:
+    """Codificações suportadas, na ordem de preferência do servidor."""
+    encoders = {}
+    if zstandard is not None:
+        encoders["zstd"] = ZstdEncoder
+    if brotli is not None:
+        encoders["br"] = BrotliEncoder
+    encoders["gzip"] = GzipEncoder
+    return encoders
+
+def negotiate_encoding(accept_encoding: str, encoders) -> str:
+    """Codificação com maior q aceita pelo cliente (empate: preferência do servidor) ou None."""
+    weights = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            weights[name.strip()] = q
+
+    best, best_q = None, 0.0
+    for name in encoders:
+        q = weights.get(name, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    return not headers.get("content-type", "").startswith(EXCLUDED_CONTENT_TYPES)
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE, encoders: dict = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoders = available_encoders() if encoders is None else encoders
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encoders)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        # O início da resposta só é enviado depois do primeiro pedaço do corpo, quando
+        # já se sabe se ela será comprimida (e quais headers mudar)
+        start_message = None
+        encoder = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, encoder, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                if start_message is not None:
+                    await send(start_message)
+                    start_message = None
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is not None:
+                await send({"type": "http.response.body", "body": encoder.compress(body, final=not more_body), "more_body": more_body})
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            if _compressible(headers) and (more_body or len(body) >= self.minimum_size):
+                encoder = self.encoders[encoding]()
+                compressed = encoder.compress(body, final=not more_body)
+                if more_body or len(compressed) < len(body):
+                    headers["Content-Encoding"] = encoding
+                    headers.add_vary_header("Accept-Encoding")
+                    if more_body:
+                        del headers["Content-Length"]
+                    else:
+                        headers["Content-Length"] = str(len(compressed))
+                    await send(start_message)
+                    start_message = None
+                    await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+                    return
+
+            passthrough = True
+            await send(start_message)
+            start_message = None
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,358 @@
+"""Métricas da aplicação no formato texto do Prometheus (servidas em GET /metrics).
+
+Os contadores são fatiados por thread: cada thread só escreve na sua fatia (um dict
+indexado pelos valores dos labels), então o caminho quente não usa lock; a leitura em
+`/metrics` soma as fatias. Cobre:
+- requisições por rota (contagem, latência e em andamento), via `InstrumentedRoute`;
+- pool do SQLAlchemy (espera para obter uma conexão e tempo com ela em uso) e número
+  de queries por requisição, via `instrument_engine`;
+- tempo de bcrypt e de verificação de JWT (`common/auth.py`);
+- acertos, falhas, entradas e bytes dos caches em processo registrados em `cache_stats`.
+
+Os mesmos eventos do engine acumulam, por requisição, o número de statements e o tempo
+no banco: saem no header `Server-Timing` com DEBUG_SERVER_TIMING, statements acima de
+DB_SLOW_QUERY_MS são logados com a rota, e um mesmo formato de statement repetido
+DB_N_PLUS_ONE_THRESHOLD vezes na requisição é logado como possível N+1.
+"""
+import os
+import re
+import time
+import logging
+from bisect import bisect_left
+from contextvars import ContextVar
+from threading import get_ident
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from fastapi.routing import APIRoute
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DEBUG_SERVER_TIMING = os.getenv("DEBUG_SERVER_TIMING", "false").lower() in ("1", "true", "yes")
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", 200))
+DB_N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", 5))
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names, values) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+def _format_value(value) -> str:
+    return repr(value) if isinstance(value, float) else str(value)
+
+class _Metric:
+    type = None
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._shards = {}
+
+    def _shard(self) -> dict:
+        shard = self._shards.get(get_ident())
+        if shard is None:
+            shard = self._shards.setdefault(get_ident(), {})
+        return shard
+
+    def _snapshot(self) -> list:
+        """Cópia das fatias (dict.copy é atômico sob o GIL)."""
+        return [shard.copy() for shard in list(self._shards.values())]
+
+    def clear(self):
+        self._shards.clear()
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        return lines + self._render_samples()
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, labels=(), amount=1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def value(self, labels=()):
+        return sum(shard.get(labels, 0) for shard in self._snapshot())
+
+    def _totals(self) -> dict:
+        totals = {}
+        for shard in self._snapshot():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def _render_samples(self) -> list:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(self._totals().items())
+        ]
+
+class Gauge(Counter):
+    """Soma de incrementos e decrementos (ex.: requisições em andamento)."""
+    type = "gauge"
+
+    def dec(self, labels=(), amount=1):
+        self.inc(labels, -amount)
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, labels=()):
+        shard = self._shard()
+        # Contagem por faixa (não acumulada) + faixa +Inf + soma
+        counts = shard.get(labels)
+        if counts is None:
+            counts = shard[labels] = [0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def _totals(self) -> dict:
+        totals = {}
+        for shard in self._snapshot():
+            for labels, counts in shard.items():
+                total = totals.setdefault(labels, [0] * (len(self.buckets) + 2))
+                for index, count in enumerate(list(counts)):
+                    total[index] += count
+        return totals
+
+    def count(self, labels=()) -> int:
+        total = self._totals().get(labels)
+        return sum(total[:-1]) if total else 0
+
+    def _render_samples(self) -> list:
+        lines = []
+        label_names = self.labelnames + ("le",)
+        for labels, counts in sorted(self._totals().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts[:-1]):
+                cumulative += count
+                le = bound if bound == "+Inf" else _format_value(float(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(label_names, labels + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(counts[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def clear(self):
+        for metric in self._metrics.values():
+            metric.clear()
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+class CacheStats:
+    """Acertos, falhas, tamanho e memória dos caches em processo.
+
+    Lidos de `stats()` a cada coleta: os próprios caches já contam, então nada é feito no
+    caminho da requisição.
+    """
+    name = "cache"
+    # chave de stats() -> (métrica, tipo, descrição); chaves ausentes no cache são omitidas
+    FIELDS = (
+        ("hits", "cache_hits_total", "counter", "Consultas atendidas pelo cache"),
+        ("misses", "cache_misses_total", "counter", "Consultas sem entrada válida no cache"),
+        ("size", "cache_entries", "gauge", "Entradas armazenadas"),
+        ("maxsize", "cache_max_entries", "gauge", "Limite de entradas"),
+        ("bytes", "cache_bytes", "gauge", "Bytes armazenados (corpos e headers)"),
+        ("max_bytes", "cache_max_bytes", "gauge", "Limite de bytes"),
+    )
+
+    def __init__(self):
+        self._caches = {}
+
+    def track(self, name: str, cache):
+        self._caches[name] = cache
+        return cache
+
+    def clear(self):
+        # As contagens pertencem aos caches
+        pass
+
+    def render(self) -> list:
+        stats = {name: cache.stats() for name, cache in sorted(self._caches.items())}
+        lines = []
+        for key, metric, kind, documentation in self.FIELDS:
+            samples = [(name, values[key]) for name, values in stats.items() if key in values]
+            if not samples:
+                continue
+            lines += [f"# HELP {metric} {documentation}", f"# TYPE {metric} {kind}"]
+            lines += [f"{metric}{_format_labels(('cache',), (name,))} {_format_value(value)}" for name, value in samples]
+        return lines
+
+registry = Registry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "Requisições atendidas", ("method", "route", "status")))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "Latência das requisições (até o fim do corpo da resposta)", ("method", "route")))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "Requisições em andamento", ("method", "route")))
+db_queries_per_request = registry.register(Histogram(
+    "db_queries_per_request", "Queries executadas por requisição", ("method", "route"), buckets=QUERY_COUNT_BUCKETS))
+db_pool_wait_seconds = registry.register(Histogram(
+    "db_pool_wait_seconds", "Espera para obter uma conexão do pool", ("engine",)))
+db_pool_checkout_seconds = registry.register(Histogram(
+    "db_pool_checkout_seconds", "Tempo em que cada conexão ficou fora do pool", ("engine",)))
+password_hash_seconds = registry.register(Histogram(
+    "password_hash_seconds", "Tempo de bcrypt por operação, incluindo a fila do executor", ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)))
+jwt_verify_seconds = registry.register(Histogram(
+    "jwt_verify_seconds", "Tempo de verificação de JWT (fora do cache de tokens)",
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005)))
+db_time_per_request_seconds = registry.register(Histogram(
+    "db_time_per_request_seconds", "Tempo no banco por requisição (soma dos statements)", ("method", "route")))
+db_slow_queries_total = registry.register(Counter(
+    "db_slow_queries_total", "Statements acima de DB_SLOW_QUERY_MS", ("method", "route")))
+db_n_plus_one_total = registry.register(Counter(
+    "db_n_plus_one_total", "Requisições com um mesmo statement repetido (possível N+1)", ("method", "route")))
+cache_stats = registry.register(CacheStats())
+
+# Listas de IN expandidas (`IN (?, ?, ?)`) têm o mesmo formato qualquer que seja o tamanho
+_EXPANDED_IN = re.compile(r"\(\?(?:, \?)+\)")
+
+def statement_shape(statement: str) -> str:
+    if ", ?" in statement:
+        return _EXPANDED_IN.sub("(?)", statement)
+    return statement
+
+class RequestStats:
+    """Estatísticas da requisição em andamento, acumuladas pelos eventos do engine."""
+    __slots__ = ("labels", "queries", "db_seconds", "shapes", "repeated")
+
+    def __init__(self, labels=()):
+        self.labels = labels
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.shapes = {}
+        self.repeated = set()
+
+    def record(self, statement: str, elapsed: float):
+        self.queries += 1
+        self.db_seconds += elapsed
+        shape = statement_shape(statement)
+        count = self.shapes[shape] = self.shapes.get(shape, 0) + 1
+        if count == DB_N_PLUS_ONE_THRESHOLD:
+            self.repeated.add(shape)
+            logger.warning("Possible N+1 on %s: statement executed %d times: %s", " ".join(self.labels), count, shape)
+
+    def server_timing(self, app_seconds: float) -> str:
+        return f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries", app;dur={app_seconds * 1000:.1f}'
+
+current_request: ContextVar = ContextVar("current_request", default=None)
+
+class InstrumentedRoute(APIRoute):
+    """Rota que registra contagem, latência, em andamento e queries por requisição.
+
+    O label `route` é o template do caminho (`/tasks/{task_id}`), não o caminho
+    recebido, para não criar uma série por id.
+    """
+    async def handle(self, scope, receive, send):
+        labels = (scope["method"], self.path)
+        status_code = 500
+        stats = RequestStats(labels)
+        token = current_request.set(stats)
+        http_requests_in_flight.inc(labels)
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if DEBUG_SERVER_TIMING:
+                    # Em streaming, cobre só o que rodou até o início da resposta
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", stats.server_timing(time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await super().handle(scope, receive, send_with_status)
+        finally:
+            http_request_duration_seconds.observe(time.perf_counter() - started, labels)
+            http_requests_in_flight.dec(labels)
+            http_requests_total.inc(labels + (status_code,))
+            db_queries_per_request.observe(stats.queries, labels)
+            db_time_per_request_seconds.observe(stats.db_seconds, labels)
+            if stats.repeated:
+                db_n_plus_one_total.inc(labels)
+            current_request.reset(token)
+
+_metered_pool_classes = {}
+
+def _metered_pool_class(pool_class, engine_name: str):
+    """Subclasse do pool que mede a espera em `_do_get`.
+
+    O pool não tem evento antes do checkout; a classe trocada sobrevive ao
+    `engine.dispose()`, que recria o pool com `self.__class__`.
+    """
+    key = (pool_class, engine_name)
+    if key not in _metered_pool_classes:
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return pool_class._do_get(self)
+            finally:
+                db_pool_wait_seconds.observe(time.perf_counter() - started, (engine_name,))
+        _metered_pool_classes[key] = type(f"Metered{pool_class.__name__}", (pool_class,), {"_do_get": _do_get})
+    return _metered_pool_classes[key]
+
+def instrument_engine(engine, name: str):
+    """Registra as métricas de pool e de queries no engine (sync ou async)."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    pool = sync_engine.pool
+    if type(pool) in _metered_pool_classes.values():
+        return
+    pool.__class__ = _metered_pool_class(type(pool), name)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def start_query(conn, cursor, statement, parameters, context, executemany):
+        conn.info["metrics_query_started"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def end_query(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("metrics_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        stats = current_request.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
+        if elapsed * 1000 >= DB_SLOW_QUERY_MS:
+            route = "-"
+            if stats is not None:
+                db_slow_queries_total.inc(stats.labels)
+                route = " ".join(stats.labels)
+            logger.warning("Slow query (%.1f ms) on %s: %s", elapsed * 1000, route, statement)
+
+    @event.listens_for(sync_engine, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["metrics_checkout_at"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        checkout_at = connection_record.info.pop("metrics_checkout_at", None)
+        if checkout_at is not None:
+            db_pool_checkout_seconds.observe(time.perf_counter() - checkout_at, (name,))
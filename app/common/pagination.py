@@ -0,0 +1,30 @@
+import os
+import base64
+import binascii
+from fastapi import HTTPException
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TASKS_PAGE_SIZE = int(os.getenv("TASKS_PAGE_SIZE", 100))
+TASKS_MAX_PAGE_SIZE = int(os.getenv("TASKS_MAX_PAGE_SIZE", 1000))
+
+def encode_cursor(user_id: int, last_id: int, last_key: str = None) -> str:
+    """`last_key` é a chave de ordenação além do id (título, relevância da busca), se houver."""
+    raw = f"{user_id}:{last_id}" if last_key is None else f"{user_id}:{last_id}:{last_key}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, user_id: int) -> tuple:
+    """Retorna (último id, última chave ou None); o cursor só é válido para o usuário que o recebeu."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        # A chave vem por último e pode conter ":"
+        cursor_user_id, last_id, *last_key = base64.urlsafe_b64decode(padded.encode()).decode().split(":", 2)
+        cursor_user_id, last_id = int(cursor_user_id), int(last_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    
+    if cursor_user_id != user_id or last_id < 0:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    
+    return last_id, last_key[0] if last_key else None
\ No newline at end of file
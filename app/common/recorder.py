@@ -0,0 +1,115 @@
+"""Gravação do tráfego recebido em JSONL, no formato lido por tests/bench/replay.py.
+
+Cada linha é uma requisição:
+    {"ts": 12.345, "method": "POST", "path": "/tasks?x=1", "user": 42,
+     "body": {...} | "texto" | null, "content_type": "application/json"}
+- `ts`: segundos desde o início da gravação (chegada da requisição);
+- `user`: id do token (claims lidas sem verificar a assinatura; null sem token). O token
+  em si não é gravado: o replay emite um novo para o mesmo usuário;
+- `body`: JSON decodificado, texto para outros tipos ou null; corpos acima de
+  TRAFFIC_RECORD_MAX_BODY ficam null com `"truncated": true`. Campos de senha são
+  gravados como "***" e o replay os troca pela senha informada.
+
+Ativado por TRAFFIC_RECORD_PATH (arquivo aberto em modo append).
+"""
+import os
+import json
+import time
+from jose import jwt
+from starlette.datastructures import Headers
+from dotenv import load_dotenv
+from common.auth import TOKEN_CLAIMS_VERSION
+from common.responses import dump_json
+
+load_dotenv()
+
+TRAFFIC_RECORD_PATH = os.getenv("TRAFFIC_RECORD_PATH", "")
+TRAFFIC_RECORD_MAX_BODY = int(os.getenv("TRAFFIC_RECORD_MAX_BODY", 1024 * 1024))
+
+REDACTED = "***"
+SENSITIVE_FIELDS = ("password",)
+
+def _token_user(headers: Headers):
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        claims = jwt.get_unverified_claims(token)
+    except Exception:
+        return None
+    if claims.get("ver") == TOKEN_CLAIMS_VERSION:
+        try:
+            return int(claims["sub"])
+        except (KeyError, TypeError, ValueError):
+            return None
+    # Tokens antigos: sub = username
+    return claims.get("sub")
+
+def _decode_body(body: bytes, content_type: str):
+    if not body:
+        return None
+    if content_type.startswith("application/json"):
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return body.decode("utf-8", errors="replace")
+        if isinstance(data, dict):
+            for field in SENSITIVE_FIELDS:
+                if field in data and data[field] is not None:
+                    data[field] = REDACTED
+        return data
+    return body.decode("utf-8", errors="replace")
+
+class TrafficRecorderMiddleware:
+    def __init__(self, app, path: str = TRAFFIC_RECORD_PATH, max_body: int = TRAFFIC_RECORD_MAX_BODY):
+        self.app = app
+        self.max_body = max_body
+        # Com buffer de linha: cada requisição chega ao arquivo inteira
+        self.file = open(path, "a", encoding="utf-8", buffering=1)
+        self.started = time.monotonic()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ts = time.monotonic() - self.started
+        chunks = []
+        size = 0
+        truncated = False
+
+        async def receive_recording():
+            nonlocal size, truncated
+            message = await receive()
+            if message["type"] == "http.request" and not truncated:
+                body = message.get("body", b"")
+                size += len(body)
+                if size > self.max_body:
+                    truncated = True
+                    chunks.clear()
+                else:
+                    chunks.append(body)
+            return message
+
+        try:
+            await self.app(scope, receive_recording, send)
+        finally:
+            self._write(scope, ts, b"".join(chunks), truncated)
+
+    def _write(self, scope, ts: float, body: bytes, truncated: bool):
+        headers = Headers(scope=scope)
+        content_type = headers.get("content-type", "")
+        path = scope["path"]
+        if scope.get("query_string"):
+            path += "?" + scope["query_string"].decode("latin-1")
+        record = {
+            "ts": round(ts, 6),
+            "method": scope["method"],
+            "path": path,
+            "user": _token_user(headers),
+            "body": None if truncated else _decode_body(body, content_type),
+            "content_type": content_type or None,
+        }
+        if truncated:
+            record["truncated"] = True
+        self.file.write(dump_json(record).decode("utf-8") + "\n")
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""Serialização JSON rápida para as respostas da API.
+
+`FastJSONResponse` é a classe de resposta padrão do app (orjson, com o `json` da
+biblioteca padrão como fallback). Para listas grandes, `trusted_rows` monta os dicts
+direto dos atributos das linhas vindas do banco, sem revalidar cada item contra o
+schema (que já foi validado na escrita): as rotas continuam declarando
+`response_model`, então o OpenAPI não muda, mas devolvem a resposta já pronta.
+"""
+import json
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson está no requirements.txt; sem ele, json da biblioteca padrão
+    orjson = None
+
+def dump_json(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dump_json(content)
+
+def trusted_rows(rows, model) -> list:
+    """Dicts com os campos de `model`, na ordem do schema, lidos direto de cada linha."""
+    fields = tuple(model.model_fields)
+    return [{field: getattr(row, field) for field in fields} for row in rows]
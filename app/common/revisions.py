@@ -0,0 +1,74 @@
+"""Revisão por usuário para leituras condicionais (ETag / If-None-Match).
+
+`users.revision` é incrementada na mesma transação de toda escrita de tarefas ou do
+perfil, e o ETag de GET /tasks e GET /users/me é derivado dela: responder 304 custa
+uma busca por chave primária, sem carregar nem serializar tarefas.
+
+A mesma revisão compõe a chave do cache de listagens (`task_list_cache`): uma escrita
+torna as páginas antigas inalcançáveis mesmo em outros processos, e a invalidação
+explícita após o commit só libera a memória delas.
+"""
+import os
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.user import User
+from common.auth import credentials_exception
+from common.cache import load_response_cache
+from common.metrics import cache_stats
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TASK_LIST_CACHE_BACKEND = os.getenv("TASK_LIST_CACHE_BACKEND", "memory")
+TASK_LIST_CACHE_MAX_BYTES = int(os.getenv("TASK_LIST_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# Cada cliente guarda a própria cópia e sempre revalida antes de reutilizá-la
+CACHE_CONTROL = "private, no-cache"
+
+# Páginas de GET /tasks já serializadas, por usuário e (revisão, parâmetros da página)
+task_list_cache = cache_stats.track("task_list", load_response_cache(TASK_LIST_CACHE_BACKEND, TASK_LIST_CACHE_MAX_BYTES))
+
+async def bump_revision(db: AsyncSession, user_id: int) -> int:
+    """Incrementa e retorna a revisão, com que a escrita carimba as tarefas que altera.
+
+    Deve rodar dentro do `work` de commit_with_retry, junto com a escrita: o UPDATE em
+    users serializa as escritas do usuário, então a ordem das revisões é a dos commits.
+    Sem a linha do usuário (conta removida, talvez por outro processo, com o token ainda
+    válido) levanta 401 e a escrita é descartada no rollback.
+    """
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(revision=User.revision + 1)
+        .returning(User.revision)
+        .execution_options(synchronize_session=False)
+    )
+    return _existing_revision(result.scalar())
+
+async def get_revision(db: AsyncSession, user_id: int) -> int:
+    result = await db.execute(select(User.revision).where(User.id == user_id))
+    return _existing_revision(result.scalar())
+
+def _existing_revision(revision) -> int:
+    # revision é NOT NULL: None significa que o usuário não existe
+    if revision is None:
+        raise credentials_exception()
+    return revision
+
+def revision_etag(user_id: int, revision: int) -> str:
+    return f'W/"{user_id}-{revision}"'
+
+def revision_headers(user_id: int, revision: int) -> dict:
+    return {"ETag": revision_etag(user_id, revision), "Cache-Control": CACHE_CONTROL}
+
+def _opaque_tag(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Comparação fraca, como pede o If-None-Match (aceita lista e "*")."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return _opaque_tag(etag) in {_opaque_tag(tag) for tag in if_none_match.split(",")}
\ No newline at end of file
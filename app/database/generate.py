@@ -0,0 +1,166 @@
+"""Gerador de bases sintéticas para testes de carga (usuários e tarefas em massa).
+
+Escreve direto no banco, sem passar pela API: um único hash bcrypt reaproveitado por
+todos os usuários, INSERTs em lote (`executemany`) dentro de transações grandes e os
+índices secundários de tarefas, os triggers e o índice de busca (FTS5) construídos só
+depois da carga. Títulos, descrições, status e tarefas por usuário seguem distribuições
+próximas das de uso real (poucos usuários com muitas tarefas, maioria com poucas).
+
+Uso: cd app && python -m database.generate --users 10000 --tasks 10000000 [--database-url sqlite:///./load.db]
+"""
+import argparse
+import itertools
+import random
+import sys
+import time
+from sqlalchemy import create_engine
+import models  # registra as tabelas no metadata
+from models.task import Task
+from common.auth import get_password_hash
+from .base import Base
+from .migrations import run_migrations
+from .search import rebuild_search_index
+from .session import apply_sqlite_pragmas
+
+TASK_STATUS_WEIGHTS = {"Pendente": 0.45, "Em Progresso": 0.15, "Concluída": 0.40}
+DESCRIPTION_NULL_RATIO = 0.35
+
+TITLE_VERBS = (
+    "Estudar", "Revisar", "Comprar", "Pagar", "Agendar", "Ligar para", "Enviar", "Organizar",
+    "Preparar", "Ler", "Atualizar", "Corrigir", "Planejar", "Responder", "Renovar",
+)
+TITLE_OBJECTS = (
+    "FastAPI", "relatório mensal", "conta de luz", "dentista", "proposta do cliente", "backlog",
+    "apresentação", "documentação", "e-mails pendentes", "aluguel", "passagens", "curso de inglês",
+    "orçamento da reforma", "reunião de equipe", "contrato", "notas fiscais", "academia",
+    "currículo", "presente de aniversário", "mercado", "testes de integração", "deploy",
+)
+DESCRIPTION_CONTEXTS = (
+    "antes de sexta", "até o fim do mês", "com prioridade alta", "quando sobrar tempo",
+    "junto com o time", "conforme combinado na reunião", "e anotar as dúvidas", "sem falta amanhã",
+)
+
+def _titles() -> list:
+    return [f"{verb} {obj}" for verb, obj in itertools.product(TITLE_VERBS, TITLE_OBJECTS)]
+
+def _user_cum_weights(users: int, rng: random.Random) -> list:
+    # Pareto: a maior parte das tarefas fica com uma minoria de usuários
+    return list(itertools.accumulate(rng.paretovariate(1.2) for _ in range(users)))
+
+def _drop_task_secondary_structures(conn, indexes):
+    for index in indexes:
+        index.drop(conn, checkfirst=True)
+    triggers = conn.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'tasks'"
+    ).scalars().all()
+    for name in triggers:
+        conn.exec_driver_sql(f'DROP TRIGGER "{name}"')
+
+def generate(engine, users: int, tasks: int, password: str = "senha123", seed: int = None,
+             batch_size: int = 50_000, commit_every: int = 1_000_000, progress=None) -> dict:
+    """Preenche um banco vazio com `users` usuários e `tasks` tarefas; retorna os tempos por etapa."""
+    rng = random.Random(seed)
+    timings = {}
+    started = time.perf_counter()
+
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    with engine.connect() as conn:
+        if conn.exec_driver_sql("SELECT 1 FROM users LIMIT 1").first() is not None:
+            raise ValueError("O banco já tem usuários; o gerador só preenche bancos vazios")
+    task_indexes = list(Task.__table__.indexes)
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            _drop_task_secondary_structures(conn, task_indexes)
+        hashed = get_password_hash(password)
+        conn.exec_driver_sql(
+            "INSERT INTO users (id, username, email, hashed_password) VALUES (?, ?, ?, ?)",
+            [(n, f"user{n}", f"user{n}@example.com", hashed) for n in range(1, users + 1)],
+        )
+    timings["users_s"] = round(time.perf_counter() - started, 2)
+
+    titles = _titles()
+    # Descrição = título + contexto, ou nenhuma
+    contexts = [None] + list(DESCRIPTION_CONTEXTS)
+    context_weights = [DESCRIPTION_NULL_RATIO] + [(1 - DESCRIPTION_NULL_RATIO) / len(DESCRIPTION_CONTEXTS)] * len(DESCRIPTION_CONTEXTS)
+    statuses = list(TASK_STATUS_WEIGHTS)
+    status_weights = list(TASK_STATUS_WEIGHTS.values())
+    user_ids = range(1, users + 1)
+    user_cum_weights = _user_cum_weights(users, rng)
+
+    started = time.perf_counter()
+    written = 0
+    conn = engine.connect()
+    try:
+        if engine.dialect.name == "sqlite":
+            # Banco novo: se a carga falhar no meio, basta gerar de novo
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+            conn.commit()
+        transaction = conn.begin()
+        while written < tasks:
+            size = min(batch_size, tasks - written)
+            batch_titles = rng.choices(titles, k=size)
+            batch_contexts = rng.choices(contexts, weights=context_weights, k=size)
+            conn.exec_driver_sql(
+                "INSERT INTO tasks (title, description, status, user_id, revision) VALUES (?, ?, ?, ?, 0)",
+                list(zip(
+                    batch_titles,
+                    [None if context is None else f"{title} {context}" for title, context in zip(batch_titles, batch_contexts)],
+                    rng.choices(statuses, weights=status_weights, k=size),
+                    rng.choices(user_ids, cum_weights=user_cum_weights, k=size),
+                )),
+            )
+            written += size
+            if written % commit_every < size or written == tasks:
+                transaction.commit()
+                if progress:
+                    progress(f"{written}/{tasks} tarefas ({time.perf_counter() - started:.0f}s)")
+                if written < tasks:
+                    transaction = conn.begin()
+    finally:
+        # Descarta a conexão em vez de devolvê-la ao pool com synchronous=OFF
+        conn.invalidate()
+        conn.close()
+    timings["tasks_s"] = round(time.perf_counter() - started, 2)
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        for index in task_indexes:
+            index.create(conn, checkfirst=True)
+        if engine.dialect.name == "sqlite":
+            rebuild_search_index(conn)
+            conn.exec_driver_sql("ANALYZE")
+    timings["indexes_s"] = round(time.perf_counter() - started, 2)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera usuários e tarefas sintéticos para testes de carga")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--database-url", help="padrão: DATABASE_URL")
+    parser.add_argument("--password", default="senha123", help="senha de todos os usuários (user1, user2, ...)")
+    parser.add_argument("--seed", type=int, help="semente para gerar sempre a mesma base")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="linhas por executemany")
+    parser.add_argument("--commit-every", type=int, default=1_000_000, help="linhas por transação")
+    args = parser.parse_args()
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+        apply_sqlite_pragmas(engine)
+    else:
+        from .session import engine
+
+    started = time.perf_counter()
+    try:
+        timings = generate(
+            engine, args.users, args.tasks, password=args.password, seed=args.seed,
+            batch_size=args.batch_size, commit_every=args.commit_every,
+            progress=lambda message: print(message, file=sys.stderr),
+        )
+    except ValueError as exc:
+        sys.exit(str(exc))
+    print(f"{args.users} usuários e {args.tasks} tarefas gerados em {time.perf_counter() - started:.1f}s {timings}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""Migrações de esquema versionadas para bancos já existentes.
+
+`create_all` só cria o que falta; mudanças em tabelas existentes (índices, colunas)
+ficam aqui, em ordem, e são registradas em `schema_migrations`. Cada migração deve
+ser idempotente, pois também roda em bancos recém-criados pelo `create_all`.
+
+Uso: cd app && python -m database.migrations
+"""
+from datetime import datetime
+from sqlalchemy import text
+from .search import rebuild_search_index
+
+def _0001_task_composite_indexes(conn):
+    # Índices de coluna única (inclusive em description) substituídos pelos compostos do modelo
+    for name in ("ix_tasks_id", "ix_tasks_title", "ix_tasks_description", "ix_tasks_status", "ix_tasks_user_id"):
+        conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_tasks_user_id_id ON tasks (user_id, id)")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_tasks_user_id_status_id ON tasks (user_id, status, id)")
+    conn.exec_driver_sql("ANALYZE tasks")
+
+def _0002_task_title_sort_indexes(conn):
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_tasks_user_id_title_id ON tasks (user_id, title, id)")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_tasks_user_id_status_title_id ON tasks (user_id, status, title, id)")
+    conn.exec_driver_sql("ANALYZE tasks")
+
+def _0003_task_search_index(conn):
+    rebuild_search_index(conn)
+
+def _0004_user_revision(conn):
+    columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(users)")}
+    if "revision" not in columns:
+        conn.exec_driver_sql("ALTER TABLE users ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+
+def _0005_task_changes(conn):
+    task_columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(tasks)")}
+    if "revision" not in task_columns:
+        # Tarefas existentes ficam na revisão 0: entram na primeira sincronização completa
+        conn.exec_driver_sql("ALTER TABLE tasks ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_tasks_user_id_revision_id ON tasks (user_id, revision, id)")
+    user_columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(users)")}
+    if "compacted_revision" not in user_columns:
+        conn.exec_driver_sql("ALTER TABLE users ADD COLUMN compacted_revision INTEGER NOT NULL DEFAULT 0")
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS task_tombstones ("
+        "id INTEGER NOT NULL, task_id INTEGER NOT NULL, user_id INTEGER NOT NULL, "
+        "revision INTEGER NOT NULL, deleted_at DATETIME NOT NULL, "
+        "PRIMARY KEY (id), FOREIGN KEY(user_id) REFERENCES users (id))"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_task_tombstones_user_id_revision_task_id "
+        "ON task_tombstones (user_id, revision, task_id)"
+    )
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_task_tombstones_deleted_at ON task_tombstones (deleted_at)")
+
+USERS_AUTOINCREMENT_DDL = (
+    "CREATE TABLE users_new (id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT, username VARCHAR NOT NULL, "
+    "email VARCHAR NOT NULL, hashed_password VARCHAR NOT NULL, revision INTEGER DEFAULT '0' NOT NULL, "
+    "compacted_revision INTEGER DEFAULT '0' NOT NULL)"
+)
+USERS_COLUMNS = "id, username, email, hashed_password, revision, compacted_revision"
+USERS_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_users_id ON users (id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_username ON users (username)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email ON users (email)",
+)
+
+def _0006_user_ids_not_reused(conn):
+    # Sem AUTOINCREMENT o SQLite devolve o maior id à próxima conta criada depois de uma
+    # exclusão, e o token (sub = id) da conta removida passaria a valer para a nova
+    users_sql = conn.exec_driver_sql("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'users'").scalar()
+    if "AUTOINCREMENT" not in users_sql.upper():
+        # Recriação da tabela (o SQLite não altera a chave primária); o app não liga foreign_keys
+        conn.exec_driver_sql(USERS_AUTOINCREMENT_DDL)
+        conn.exec_driver_sql(f"INSERT INTO users_new ({USERS_COLUMNS}) SELECT {USERS_COLUMNS} FROM users")
+        conn.exec_driver_sql("DROP TABLE users")
+        conn.exec_driver_sql("ALTER TABLE users_new RENAME TO users")
+        for statement in USERS_INDEXES:
+            conn.exec_driver_sql(statement)
+    # Ids de contas já removidas que ainda aparecem em tarefas ou lápides também não voltam
+    used = conn.exec_driver_sql(
+        "SELECT MAX(COALESCE((SELECT MAX(id) FROM users), 0), COALESCE((SELECT MAX(user_id) FROM tasks), 0), "
+        "COALESCE((SELECT MAX(user_id) FROM task_tombstones), 0), "
+        "COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'users'), 0))"
+    ).scalar()
+    conn.exec_driver_sql("DELETE FROM sqlite_sequence WHERE name = 'users'")
+    conn.exec_driver_sql("INSERT INTO sqlite_sequence (name, seq) VALUES ('users', ?)", (used,))
+
+MIGRATIONS = [
+    (1, "tasks: índices compostos (user_id, id) e (user_id, status, id)", _0001_task_composite_indexes),
+    (2, "tasks: índices para ordenação/prefixo de título", _0002_task_title_sort_indexes),
+    (3, "tasks: índice de busca FTS5 (tasks_fts) e triggers", _0003_task_search_index),
+    (4, "users: contador de revisão para ETags", _0004_user_revision),
+    (5, "tasks: revisão por tarefa, lápides e índices para /tasks/changes", _0005_task_changes),
+    (6, "users: ids AUTOINCREMENT, nunca reaproveitados", _0006_user_ids_not_reused),
+]
+
+def run_migrations(engine) -> list:
+    """Aplica as migrações pendentes; retorna as versões aplicadas."""
+    applied_now = []
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, description TEXT NOT NULL, applied_at TEXT NOT NULL)"
+        )
+        applied = set(conn.execute(text("SELECT version FROM schema_migrations")).scalars())
+        for version, description, migrate in MIGRATIONS:
+            if version in applied:
+                continue
+            migrate(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, description, applied_at) VALUES (:version, :description, :applied_at)"),
+                {"version": version, "description": description, "applied_at": datetime.utcnow().isoformat()},
+            )
+            applied_now.append(version)
+    return applied_now
+
+if __name__ == "__main__":
+    import models  # registra as tabelas no metadata
+    from database.base import Base
+    from database.session import engine
+    Base.metadata.create_all(bind=engine)
+    print("Migrações aplicadas:", run_migrations(engine) or "nenhuma pendente")
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""Índice de busca textual (SQLite FTS5) sobre título e descrição das tarefas.
+
+`tasks_fts` é uma tabela FTS5 de conteúdo externo: o texto fica só em `tasks` e os
+triggers mantêm o índice em sincronia a cada INSERT/UPDATE/DELETE. O `user_id` também é
+indexado, para a busca de um usuário cruzar só as suas tarefas em vez de filtrar depois.
+
+Reconstruir o índice de um banco existente: cd app && python -m database.search
+"""
+import html
+import re
+from sqlalchemy import Float, Integer, column, table
+
+TASKS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, user_id, content='tasks', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    # Título pesa mais que a descrição; user_id serve só de filtro e não entra no score
+    "INSERT INTO tasks_fts(tasks_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0, 0.0)')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description, user_id) "
+    "VALUES (new.id, new.title, new.description, new.user_id); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description, user_id) "
+    "VALUES ('delete', old.id, old.title, old.description, old.user_id); END",
+    # Mudanças só de status não tocam o índice
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description, user_id ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description, user_id) "
+    "VALUES ('delete', old.id, old.title, old.description, old.user_id); "
+    "INSERT INTO tasks_fts(rowid, title, description, user_id) "
+    "VALUES (new.id, new.title, new.description, new.user_id); END",
+)
+TASKS_FTS_DROP = "DROP TABLE IF EXISTS tasks_fts"
+
+tasks_fts = table(
+    "tasks_fts",
+    column("rowid", Integer),
+    column("title"),
+    column("description"),
+    column("user_id"),
+    column("rank", Float),
+)
+
+# Marcadores usados pelo FTS5 no trecho destacado; trocados por <mark> depois do escape de HTML
+HIGHLIGHT_OPEN = "\x02"
+HIGHLIGHT_CLOSE = "\x03"
+
+def create_search_index(conn):
+    for statement in TASKS_FTS_DDL:
+        conn.exec_driver_sql(statement)
+
+def rebuild_search_index(conn):
+    """Cria o índice se faltar e o reconstrói a partir do conteúdo atual de `tasks`."""
+    create_search_index(conn)
+    conn.exec_driver_sql("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+def build_match_query(q: str, user_id: int):
+    """Converte o texto livre do usuário em uma expressão MATCH segura (None se não houver termos).
+
+    Cada palavra vira um termo entre aspas (sem operadores do FTS5 vindos do cliente), todas
+    obrigatórias; a última casa por prefixo para a busca funcionar enquanto se digita.
+    """
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return None
+    expression = " ".join(f'"{term}"' for term in terms) + "*"
+    return f'user_id : "{user_id}" AND {{title description}} : ({expression})'
+
+def render_highlight(value):
+    if value is None:
+        return None
+    return html.escape(value).replace(HIGHLIGHT_OPEN, "<mark>").replace(HIGHLIGHT_CLOSE, "</mark>")
+
+if __name__ == "__main__":
+    import models  # registra as tabelas no metadata
+    from database.base import Base
+    from database.session import engine
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        rebuild_search_index(conn)
+        total = conn.exec_driver_sql("SELECT count(*) FROM tasks").scalar()
+    print(f"Índice de busca reconstruído ({total} tarefas)")
\ No newline at end of file
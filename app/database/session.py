@@ -1,21 +1,113 @@
-from sqlalchemy import create_engine
+import os
+import asyncio
+import random
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+from common.metrics import instrument_engine
 from .base import Base
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./todo.db"
+load_dotenv()
+
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./todo.db")
+SQLALCHEMY_ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL", SQLALCHEMY_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+)
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_LOCK_RETRIES = int(os.getenv("DB_LOCK_RETRIES", 3))
+DB_LOCK_BACKOFF_SECONDS = float(os.getenv("DB_LOCK_BACKOFF_SECONDS", 0.05))
+
+# Aplicados em cada nova conexão SQLite (valores vazios são ignorados)
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "mmap_size": os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+    "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-65536"),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+    "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+}
+
+def _engine_options(url: str) -> dict:
+    url = make_url(url)
+    # SQLite em memória usa um pool próprio, sem tamanho configurável
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    return {"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW, "pool_timeout": DB_POOL_TIMEOUT}
+
+def apply_sqlite_pragmas(engine, pragmas: dict = None):
+    """Registra os PRAGMAs de desempenho no evento connect do engine (sync ou async)."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if sync_engine.dialect.name != "sqlite":
+        return
+    pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+
+    @event.listens_for(sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            if value not in (None, ""):
+                cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
 
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {},
+    **_engine_options(SQLALCHEMY_DATABASE_URL),
 )
+apply_sqlite_pragmas(engine)
+instrument_engine(engine, "sync")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine assíncrono usado pelos routers (aiosqlite)
+async_engine = create_async_engine(SQLALCHEMY_ASYNC_DATABASE_URL, **_engine_options(SQLALCHEMY_ASYNC_DATABASE_URL))
+apply_sqlite_pragmas(async_engine)
+instrument_engine(async_engine, "async")
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 def create_database():
+    from .migrations import run_migrations
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def is_lock_error(exc: OperationalError) -> bool:
+    message = str(exc.orig if exc.orig is not None else exc).lower()
+    return "database is locked" in message or "database is busy" in message
+
+async def commit_with_retry(db: AsyncSession, work):
+    """Executa `await work()` seguido de commit, repetindo a unidade inteira se o SQLite estiver travado.
+
+    Após um erro de lock a sessão precisa de rollback (que descarta as mudanças pendentes),
+    por isso `work` deve refazer todas as escritas a cada tentativa.
+    """
+    for attempt in range(DB_LOCK_RETRIES + 1):
+        try:
+            result = await work()
+            await db.commit()
+            return result
+        except OperationalError as exc:
+            await db.rollback()
+            if attempt == DB_LOCK_RETRIES or not is_lock_error(exc):
+                raise
+            # Backoff exponencial com jitter para os escritores não colidirem de novo
+            await asyncio.sleep(DB_LOCK_BACKOFF_SECONDS * (2 ** attempt) * random.uniform(0.5, 1.5))
@@ -0,0 +1,41 @@
+"""Compactação das lápides de tarefas removidas (tabela `task_tombstones`).
+
+As lápides só servem para /tasks/changes avisar clientes offline das exclusões. As mais
+antigas que TASK_TOMBSTONE_RETENTION_DAYS são apagadas e `users.compacted_revision`
+guarda até que revisão isso aconteceu: clientes sincronizados antes disso recebem 410
+e fazem uma sincronização completa.
+
+Uso: cd app && python -m database.tombstones
+"""
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import DateTime, bindparam, text
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TASK_TOMBSTONE_RETENTION_DAYS = float(os.getenv("TASK_TOMBSTONE_RETENTION_DAYS", 30))
+
+def compact_tombstones(conn, older_than: datetime) -> int:
+    """Remove as lápides anteriores a `older_than`; retorna quantas foram removidas."""
+    cutoff = bindparam("cutoff", older_than, type_=DateTime)
+    # Por usuário, a compactação remove revisões inteiras: tudo até a maior revisão expirada
+    conn.execute(text(
+        "UPDATE users SET compacted_revision = expired.revision "
+        "FROM (SELECT user_id, max(revision) AS revision FROM task_tombstones "
+        "WHERE deleted_at < :cutoff GROUP BY user_id) AS expired "
+        "WHERE users.id = expired.user_id AND expired.revision > users.compacted_revision"
+    ).bindparams(cutoff))
+    result = conn.execute(text(
+        "DELETE FROM task_tombstones "
+        "WHERE user_id IN (SELECT user_id FROM task_tombstones WHERE deleted_at < :cutoff) "
+        "AND revision <= (SELECT compacted_revision FROM users WHERE users.id = task_tombstones.user_id)"
+    ).bindparams(cutoff))
+    return result.rowcount
+
+if __name__ == "__main__":
+    from database.session import engine
+    cutoff = datetime.utcnow() - timedelta(days=TASK_TOMBSTONE_RETENTION_DAYS)
+    with engine.begin() as conn:
+        removed = compact_tombstones(conn, cutoff)
+    print(f"Lápides removidas: {removed} (anteriores a {cutoff.isoformat()})")
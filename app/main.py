@@ -4,6 +4,10 @@ from sqlalchemy.exc import IntegrityError
 from api.tasks import router as tasks_router
 from api.auth import router as auth_router
 from api.users import router as users_router
+from api.metrics import router as metrics_router
+from common.responses import FastJSONResponse
+from common.compression import CompressionMiddleware
+from common.recorder import TrafficRecorderMiddleware, TRAFFIC_RECORD_PATH
 from common.exceptions import (
     validation_exception_handler,
     integrity_error_handler,
@@ -22,8 +26,16 @@ app = FastAPI(
     license_info={
         "name": "MIT",
     },
+    default_response_class=FastJSONResponse,
 )
 
+# Compressão negociada por Accept-Encoding (gzip, br, zstd)
+app.add_middleware(CompressionMiddleware)
+
+# Gravação do tráfego para replay (tests/bench/replay.py)
+if TRAFFIC_RECORD_PATH:
+    app.add_middleware(TrafficRecorderMiddleware, path=TRAFFIC_RECORD_PATH)
+
 # Exception handlers
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(IntegrityError, integrity_error_handler)
@@ -33,6 +45,7 @@ app.add_exception_handler(Exception, general_exception_handler)
 app.include_router(auth_router, tags=["Autenticação"])
 app.include_router(users_router, tags=["Usuários"])
 app.include_router(tasks_router, tags=["Tarefas"])
+app.include_router(metrics_router)
 
 @app.get("/")
 def read_root():
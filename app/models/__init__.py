@@ -1,2 +1,2 @@
 from .user import User
-from .task import Task
+from .task import Task, TaskTombstone
@@ -1,14 +1,48 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from datetime import datetime
+from sqlalchemy import DDL, Column, DateTime, Integer, String, ForeignKey, Index, event
 from sqlalchemy.orm import relationship
 from database.base import Base
+from database.search import TASKS_FTS_DDL, TASKS_FTS_DROP
 
 class Task(Base):
     __tablename__ = "tasks"
 
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, index=True, nullable=False)
-    description = Column(String, index=True, nullable=True)
-    status = Column(String, index=True, default="Pendente")
-    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    id = Column(Integer, primary_key=True)
+    title = Column(String, nullable=False)
+    description = Column(String, nullable=True)
+    status = Column(String, default="Pendente")
+    user_id = Column(Integer, ForeignKey("users.id"))
+    # Revisão do usuário (users.revision) na última escrita da tarefa; base de /tasks/changes
+    revision = Column(Integer, nullable=False, default=0, server_default="0")
 
-    user = relationship("User", backref="tasks")
\ No newline at end of file
+    user = relationship("User", backref="tasks")
+
+    # Acesso sempre por usuário: listagem/paginação por (user_id, id) ou (user_id, title, id),
+    # com ou sem filtro por status; o prefixo de título vira um intervalo em title
+    __table_args__ = (
+        Index("ix_tasks_user_id_id", "user_id", "id"),
+        Index("ix_tasks_user_id_status_id", "user_id", "status", "id"),
+        Index("ix_tasks_user_id_title_id", "user_id", "title", "id"),
+        Index("ix_tasks_user_id_status_title_id", "user_id", "status", "title", "id"),
+        Index("ix_tasks_user_id_revision_id", "user_id", "revision", "id"),
+    )
+
+class TaskTombstone(Base):
+    """Tarefa removida, mantida para /tasks/changes até ser compactada (database/tombstones.py)."""
+    __tablename__ = "task_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    revision = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_task_tombstones_user_id_revision_task_id", "user_id", "revision", "task_id"),
+        Index("ix_task_tombstones_deleted_at", "deleted_at"),
+    )
+
+# Índice FTS5 e triggers criados/removidos junto com a tabela (bancos antigos: migração 0003)
+for statement in TASKS_FTS_DDL:
+    event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(Task.__table__, "before_drop", DDL(TASKS_FTS_DROP).execute_if(dialect="sqlite"))
\ No newline at end of file
@@ -3,8 +3,14 @@ from database.base import Base
 
 class User(Base):
     __tablename__ = "users"
+    # AUTOINCREMENT: ids de contas removidas nunca são reaproveitados (o token identifica o usuário pelo id)
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String, unique=True, index=True, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
-    hashed_password = Column(String, nullable=False)
\ No newline at end of file
+    hashed_password = Column(String, nullable=False)
+    # Incrementada a cada escrita nas tarefas ou no perfil; origem dos ETags (common/revisions.py)
+    revision = Column(Integer, nullable=False, default=0, server_default="0")
+    # Lápides com revisão até este valor já foram compactadas (database/tombstones.py)
+    compacted_revision = Column(Integer, nullable=False, default=0, server_default="0")
\ No newline at end of file
@@ -1,6 +1,14 @@
+import os
 from pydantic import BaseModel, Field, validator
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 from common.validators import validate_task_title, validate_task_description
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TASKS_BULK_MAX_SIZE = int(os.getenv("TASKS_BULK_MAX_SIZE", 500))
+
+TaskStatus = Literal["Pendente", "Em Progresso", "Concluída"]
 
 class TaskBase(BaseModel):
     title: str = Field(..., description="Título da tarefa", example="Estudar FastAPI")
@@ -25,5 +33,38 @@ class TaskOut(TaskBase):
     class Config:
         from_attributes = True
 
+class TaskSearchResult(TaskOut):
+    title_highlight: str = Field(..., description="Título com os termos encontrados entre <mark></mark> (HTML escapado)")
+    snippet: Optional[str] = Field(None, description="Trecho da descrição com os termos destacados")
+
+class TaskChanges(BaseModel):
+    tasks: List[TaskOut] = Field(default_factory=list, description="Tarefas criadas ou alteradas, na ordem das alterações")
+    deleted: List[int] = Field(default_factory=list, description="IDs das tarefas removidas (aplicar antes de `tasks`: um id pode ter sido reaproveitado)")
+    next_since: str = Field(..., description="Valor de `since` para a próxima chamada")
+    has_more: bool = Field(..., description="Se há mais alterações além desta página")
+
 class TaskStatusUpdate(BaseModel):
-    status: Literal["Pendente", "Em Progresso", "Concluída"] = Field(..., description="Novo status da tarefa", example="Em Progresso")
\ No newline at end of file
+    status: TaskStatus = Field(..., description="Novo status da tarefa", example="Em Progresso")
+
+class TaskBulkUpdate(TaskCreate):
+    id: int = Field(..., description="ID da tarefa a atualizar")
+
+class TaskBulkStatusUpdate(TaskStatusUpdate):
+    ids: List[int] = Field(..., min_length=1, max_length=TASKS_BULK_MAX_SIZE, description="IDs das tarefas")
+
+class TaskBulkDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=TASKS_BULK_MAX_SIZE, description="IDs das tarefas")
+
+class TaskBulkItemResult(BaseModel):
+    id: int = Field(..., description="ID da tarefa")
+    success: bool = Field(..., description="Se a operação foi aplicada")
+    detail: Optional[str] = Field(None, description="Motivo da falha")
+
+class TaskImportError(BaseModel):
+    line: int = Field(..., description="Número da linha no arquivo enviado")
+    detail: str = Field(..., description="Motivo da rejeição")
+
+class TaskImportResult(BaseModel):
+    accepted: int = Field(..., description="Linhas importadas")
+    rejected: int = Field(..., description="Linhas rejeitadas")
+    errors: List[TaskImportError] = Field(default_factory=list, description="Primeiras linhas rejeitadas")
\ No newline at end of file
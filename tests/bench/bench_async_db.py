@@ -0,0 +1,70 @@
+"""Benchmark: GET /tasks com 500 clientes concorrentes, caminho síncrono vs assíncrono.
+
+Uso: python -m tests.bench.bench_async_db [--concurrency 500] [--requests 4]
+"""
+import argparse
+import asyncio
+import json
+from typing import List
+
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.security import OAuth2PasswordBearer
+from jose import jwt
+
+from tests.bench.utils import install_database, seed, auth_headers, run_load
+from common.auth import SECRET_KEY, ALGORITHM
+from models.task import Task
+from models.user import User
+from schemas.task import TaskOut
+
+
+def build_sync_app(SessionLocal):
+    """Reproduz a implementação anterior: handlers `def` sobre Session no threadpool."""
+    sync_app = FastAPI()
+    oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def get_current_user(token: str = Depends(oauth2_scheme), db=Depends(get_db)):
+        user_id = int(jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])["sub"])
+        user = db.get(User, user_id)
+        if user is None:
+            raise HTTPException(status_code=401)
+        return user
+
+    @sync_app.get("/tasks", response_model=List[TaskOut])
+    def get_tasks(current_user: User = Depends(get_current_user), db=Depends(get_db)):
+        return db.query(Task).filter(Task.user_id == current_user.id).all()
+
+    return sync_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=4, help="requisições por cliente")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--tasks-per-user", type=int, default=20)
+    args = parser.parse_args()
+
+    engine, SessionLocal = install_database()
+    usernames = seed(engine, users=args.users, tasks_per_user=args.tasks_per_user)
+    headers = [auth_headers(user_id) for user_id in range(1, len(usernames) + 1)]
+
+    async def get_tasks(client, worker_id, n):
+        return await client.get("/tasks", headers=headers[worker_id % len(headers)])
+
+    results = {
+        "sync": asyncio.run(run_load(get_tasks, args.concurrency, args.requests, target=build_sync_app(SessionLocal))),
+        "async": asyncio.run(run_load(get_tasks, args.concurrency, args.requests)),
+    }
+    print(json.dumps({"benchmark": "async_db", "concurrency": args.concurrency, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark: CPU vs bytes da compressão de respostas em cada nível.
+
+Para cada codificação disponível (gzip sempre; br e zstd se `brotli`/`zstandard` estiverem
+instalados) e cada nível, comprime:
+- page: uma página de GET /tasks com --rows tarefas (corpo inteiro de uma vez);
+- export: a mesma lista em NDJSON, em pedaços de --chunk linhas com flush a cada pedaço
+  (como o middleware faz na exportação em streaming).
+
+Reporta p50 de tempo, bytes, taxa de compressão e vazão (MB/s de entrada).
+
+Uso: python -m tests.bench.bench_compression [--rows 10000] [--chunk 1000] [--repeat 10]
+"""
+import argparse
+import json
+import time
+
+from tests.bench.utils import percentile, STATUSES
+from common.compression import available_encoders
+from common.responses import dump_json
+
+LEVELS = {
+    "gzip": [1, 3, 6, 9],
+    "br": [1, 4, 6, 11],
+    "zstd": [1, 3, 9, 19],
+}
+
+
+def make_payloads(rows, chunk):
+    tasks = [
+        {"title": f"Tarefa {n}", "description": f"Descrição da tarefa {n}", "id": n, "status": STATUSES[n % 3], "user_id": 1}
+        for n in range(1, rows + 1)
+    ]
+    page = [dump_json(tasks)]
+    lines = [dump_json(task) + b"\n" for task in tasks]
+    export = [b"".join(lines[start:start + chunk]) for start in range(0, rows, chunk)]
+    return {"page": page, "export": export}
+
+
+def compress(encoder_class, level, chunks):
+    encoder = encoder_class(level)
+    last = len(chunks) - 1
+    return sum(len(encoder.compress(data, final=index == last)) for index, data in enumerate(chunks))
+
+
+def measure(encoder_class, level, chunks, repeat):
+    raw = sum(len(data) for data in chunks)
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = compress(encoder_class, level, chunks)
+        latencies.append(time.perf_counter() - started)
+    p50 = percentile(latencies, 50)
+    return {
+        "p50_ms": round(p50 * 1000, 2),
+        "bytes": size,
+        "ratio": round(raw / size, 2),
+        "mb_per_s": round(raw / p50 / 1_000_000, 1) if p50 else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--chunk", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    payloads = make_payloads(args.rows, args.chunk)
+    results = {}
+    for name, chunks in payloads.items():
+        results[name] = {"identity_bytes": sum(len(data) for data in chunks)}
+        for encoding, encoder_class in available_encoders().items():
+            results[name][encoding] = {
+                level: measure(encoder_class, level, chunks, args.repeat) for level in LEVELS[encoding]
+            }
+
+    print(json.dumps({"benchmark": "compression", "rows": args.rows, "chunk": args.chunk, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark: listagem via instâncias ORM (select(Task)) vs colunas via Core (Row).
+
+Carrega --rows tarefas de um usuário pelos dois caminhos, em AsyncSession como nos
+routers, e mede o tempo (consulta + serialização da resposta) e o pico de memória
+alocada (tracemalloc) de cada um.
+
+Uso: python -m tests.bench.bench_core_rows [--rows 100000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from tests.bench.utils import install_database, seed, percentile
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from api.tasks import TASK_OUT_COLUMNS
+from models.task import Task
+from schemas.task import TaskOut
+from common.responses import dump_json, trusted_rows
+
+
+async def orm_listing(session):
+    result = await session.execute(select(Task).where(Task.user_id == 1).order_by(Task.id))
+    return result.scalars().all()
+
+
+async def core_listing(session):
+    result = await session.execute(select(*TASK_OUT_COLUMNS).where(Task.user_id == 1).order_by(Task.id))
+    return result.all()
+
+
+async def timed_run(async_engine, load, trace=False):
+    # Sessão nova por rodada, como uma requisição: sem identity map reaproveitado
+    async with AsyncSession(async_engine) as session:
+        if trace:
+            tracemalloc.start()
+        started = time.perf_counter()
+        rows = await load(session)
+        body = dump_json(trusted_rows(rows, TaskOut))
+        elapsed = time.perf_counter() - started
+        peak = None
+        if trace:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return len(rows), len(body), elapsed, peak
+
+
+async def measure(async_engine, load, repeat):
+    latencies = []
+    for _ in range(repeat):
+        rows, size, elapsed, _ = await timed_run(async_engine, load)
+        latencies.append(elapsed)
+    # Memória numa rodada à parte: o tracemalloc distorce o tempo
+    _, _, _, peak = await timed_run(async_engine, load, trace=True)
+    return {
+        "rows": rows,
+        "bytes": size,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "peak_mb": round(peak / 2**20, 1),
+    }
+
+
+async def run(args, path):
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    results = {
+        "orm": await measure(async_engine, orm_listing, args.repeat),
+        "core": await measure(async_engine, core_listing, args.repeat),
+    }
+    await async_engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix="todo-bench-"), "bench.db")
+    engine, _ = install_database(path)
+    seed(engine, users=1, tasks_per_user=args.rows)
+    results = asyncio.run(run(args, path))
+    print(json.dumps({"benchmark": "core_rows", "rows": args.rows, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
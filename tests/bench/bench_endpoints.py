@@ -0,0 +1,230 @@
+"""Benchmark: todas as rotas de app/api sobre bases semeadas em várias escalas.
+
+Para cada escala (--scales) semeia um banco modelo (reaproveitado entre execuções em
+--data-dir; --reseed recria) e roda os cenários sobre uma cópia descartável, então as
+escritas não alteram o modelo e duas execuções (ex.: dois commits) partem da mesma base.
+Os cenários rodam em ordem: leituras, escritas e por fim exclusões.
+
+Por rota reporta vazão, latência p50/p95/p99, erros e o pico de memória alocada pelo
+Python (tracemalloc, numa passada separada para não distorcer o tempo); por escala, o
+pico de RSS do processo. A saída é JSON (--output grava em arquivo); --compare recebe o
+JSON de outra execução e acrescenta a variação de rps e p95 por rota.
+
+Uso: python -m tests.bench.bench_endpoints [--scales 1k 100k] [--concurrency 10] [--requests 50]
+     [--routes "GET /tasks" ...] [--output atual.json] [--compare base.json]
+     (escala 10m: 10M tarefas em 10k usuários; semear leva bastante tempo)
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+from tests.bench.utils import install_database, seed, auth_headers, run_load, STATUSES
+
+# escala -> (usuários, tarefas por usuário)
+SCALES = {
+    "1k": (10, 100),
+    "100k": (1_000, 100),
+    "10m": (10_000, 1_000),
+}
+PASSWORD = "benchpass123"
+BULK_SIZE = 10
+IMPORT_LINES = 50
+
+
+def build_scenarios(users, tasks_per_user, tokens):
+    """Cenários na ordem de execução: (rota, função(client, k), tipo).
+
+    `k` é o índice global da requisição no cenário; o usuário é `k % users + 1` e as
+    tarefas dele têm ids `(usuário - 1) * tasks_per_user + 1 ...` (ordem do seed).
+    """
+    def user_of(k):
+        return k % users + 1
+
+    def task_id(k, index):
+        return (user_of(k) - 1) * tasks_per_user + index % tasks_per_user + 1
+
+    def headers(k):
+        return tokens[user_of(k) - 1]
+
+    def bulk_ids(k):
+        start = (k // users) * BULK_SIZE
+        return [task_id(k, start + i) for i in range(BULK_SIZE)]
+
+    def import_body(k):
+        return "".join(json.dumps({"title": f"Importada {k}-{i}"}) + "\n" for i in range(IMPORT_LINES))
+
+    return [
+        # Leituras
+        ("GET /tasks", lambda c, k: c.get("/tasks", params={"limit": 100}, headers=headers(k)), "normal"),
+        ("GET /tasks?status&sort=title", lambda c, k: c.get(
+            "/tasks", params={"limit": 100, "status": STATUSES[k % 3], "sort": "title"}, headers=headers(k)), "normal"),
+        ("GET /tasks/search", lambda c, k: c.get("/tasks/search", params={"q": "tarefa"}, headers=headers(k)), "normal"),
+        ("GET /tasks/changes", lambda c, k: c.get("/tasks/changes", params={"limit": 100}, headers=headers(k)), "normal"),
+        ("GET /tasks/export", lambda c, k: c.get("/tasks/export", headers=headers(k)), "normal"),
+        ("GET /users/me", lambda c, k: c.get("/users/me", headers=headers(k)), "normal"),
+        ("POST /token", lambda c, k: c.post(
+            "/token", json={"username": f"bench_user_{user_of(k) - 1}", "password": PASSWORD}), "auth"),
+        # Escritas
+        ("POST /tasks", lambda c, k: c.post("/tasks", json={"title": f"Nova {k}"}, headers=headers(k)), "normal"),
+        ("POST /tasks/bulk", lambda c, k: c.post(
+            "/tasks/bulk", json=[{"title": f"Lote {k}-{i}"} for i in range(BULK_SIZE)], headers=headers(k)), "normal"),
+        ("POST /tasks/import", lambda c, k: c.post(
+            "/tasks/import", content=import_body(k), headers={**headers(k), "Content-Type": "application/x-ndjson"}), "normal"),
+        ("PUT /tasks/{task_id}", lambda c, k: c.put(
+            f"/tasks/{task_id(k, k // users)}", json={"title": f"Editada {k}"}, headers=headers(k)), "normal"),
+        ("PATCH /tasks/{task_id}/status", lambda c, k: c.patch(
+            f"/tasks/{task_id(k, k // users)}/status", json={"status": STATUSES[k % 3]}, headers=headers(k)), "normal"),
+        ("PUT /tasks/bulk", lambda c, k: c.put(
+            "/tasks/bulk", json=[{"id": i, "title": f"Lote editado {k}"} for i in bulk_ids(k)], headers=headers(k)), "normal"),
+        ("PATCH /tasks/bulk/status", lambda c, k: c.patch(
+            "/tasks/bulk/status", json={"ids": bulk_ids(k), "status": STATUSES[k % 3]}, headers=headers(k)), "normal"),
+        ("PUT /users/me", lambda c, k: c.put(
+            "/users/me", json={"username": f"bench_user_{user_of(k) - 1}", "email": f"bench_{k}@example.com"},
+            headers=headers(k)), "normal"),
+        ("POST /register", lambda c, k: c.post(
+            "/register", json={"username": f"registered_{k}", "email": f"registered_{k}@example.com", "password": PASSWORD}), "auth"),
+        # Exclusões: tarefas a partir do fim da lista de cada usuário, usuários por último
+        ("DELETE /tasks/{task_id}", lambda c, k: c.delete(
+            f"/tasks/{task_id(k, tasks_per_user - 1 - k // users)}", headers=headers(k)), "normal"),
+        ("POST /tasks/bulk/delete", lambda c, k: c.post("/tasks/bulk/delete", json={"ids": bulk_ids(k)}, headers=headers(k)), "normal"),
+        ("DELETE /users/me", lambda c, k: c.delete("/users/me", headers=headers(k)), "once_per_user"),
+    ]
+
+
+def prepare_database(scale, data_dir, reseed):
+    """Semeia (ou reaproveita) o banco modelo da escala e devolve uma cópia de trabalho."""
+    users, tasks_per_user = SCALES[scale]
+    template = os.path.join(data_dir, f"bench-{scale}.db")
+    seed_seconds = None
+    if reseed and os.path.exists(template):
+        os.remove(template)
+    if not os.path.exists(template):
+        started = time.perf_counter()
+        engine, _ = install_database(template)
+        seed(engine, users=users, tasks_per_user=tasks_per_user)
+        with engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        engine.dispose()
+        seed_seconds = round(time.perf_counter() - started, 1)
+
+    work_path = os.path.join(tempfile.mkdtemp(prefix="todo-bench-"), "bench.db")
+    shutil.copyfile(template, work_path)
+    return work_path, seed_seconds
+
+
+async def run_scenario(fn, kind, users, concurrency, requests, offset):
+    if kind == "auth":
+        requests = max(1, requests // 10)
+    elif kind == "once_per_user":
+        requests = max(1, min(requests, (users - offset) // concurrency))
+
+    async def make_request(client, worker_id, n):
+        return await fn(client, offset + worker_id * requests + n)
+
+    result = await run_load(make_request, concurrency, requests)
+    return result, concurrency * requests
+
+
+async def peak_memory(fn, kind, users, concurrency, requests, offset):
+    tracemalloc.start()
+    try:
+        _, done = await run_scenario(fn, kind, users, concurrency, requests, offset)
+        return round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2), done
+    finally:
+        tracemalloc.stop()
+
+
+async def run_scale(scale, args):
+    users, tasks_per_user = SCALES[scale]
+    work_path, seed_seconds = prepare_database(scale, args.data_dir, args.reseed)
+    engine, _ = install_database(work_path)
+    tokens = [auth_headers(user_id) for user_id in range(1, users + 1)]
+
+    routes = {}
+    try:
+        for route, fn, kind in build_scenarios(users, tasks_per_user, tokens):
+            if args.routes and route not in args.routes:
+                continue
+            result, done = await run_scenario(fn, kind, users, args.concurrency, args.requests, 0)
+            result["peak_alloc_mb"], _ = await peak_memory(fn, kind, users, args.concurrency, args.memory_requests, done)
+            routes[route] = result
+    finally:
+        engine.dispose()
+        shutil.rmtree(os.path.dirname(work_path), ignore_errors=True)
+
+    return {
+        "users": users,
+        "tasks": users * tasks_per_user,
+        "seed_s": seed_seconds,
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "routes": routes,
+    }
+
+
+def compare(results, baseline):
+    """Variação percentual de rps e p95 por rota em relação a outra execução."""
+    changes = {}
+    for scale, data in results.items():
+        base_routes = baseline.get("scales", {}).get(scale, {}).get("routes", {})
+        for route, stats in data["routes"].items():
+            base = base_routes.get(route)
+            if not base:
+                continue
+            changes.setdefault(scale, {})[route] = {
+                "rps_pct": round((stats["rps"] / base["rps"] - 1) * 100, 1) if base["rps"] else None,
+                "p95_pct": round((stats["p95_ms"] / base["p95_ms"] - 1) * 100, 1) if base["p95_ms"] else None,
+            }
+    return changes
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["1k", "100k"])
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=50, help="requisições por cliente em cada rota")
+    parser.add_argument("--memory-requests", type=int, default=2, help="requisições por cliente na passada de memória")
+    parser.add_argument("--routes", nargs="+", help="só estas rotas (ex.: \"GET /tasks\")")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "todo-bench-data"))
+    parser.add_argument("--reseed", action="store_true", help="recria os bancos modelo")
+    parser.add_argument("--output", help="grava o JSON neste arquivo")
+    parser.add_argument("--compare", help="JSON de outra execução para comparar")
+    args = parser.parse_args()
+    os.makedirs(args.data_dir, exist_ok=True)
+
+    results = {scale: asyncio.run(run_scale(scale, args)) for scale in args.scales}
+    report = {
+        "benchmark": "endpoints",
+        "commit": current_commit(),
+        "concurrency": args.concurrency,
+        "requests_per_client": args.requests,
+        "scales": results,
+    }
+    if args.compare:
+        with open(args.compare) as baseline:
+            report["compare"] = compare(results, json.load(baseline))
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark: vazão (linhas/s) de POST /tasks/import vs POST /tasks um a um.
+
+Uso: python -m tests.bench.bench_import [--rows 200000] [--single-rows 2000]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from tests.bench.utils import app, install_database, seed, auth_headers, run_load, dispose_async_engines
+
+
+async def import_rows(headers, rows):
+    body = "\n".join(json.dumps({"title": f"Tarefa {n}", "description": "Importada"}) for n in range(rows))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        response = await client.post("/tasks/import", headers=headers, content=body)
+        elapsed = time.perf_counter() - start
+    await dispose_async_engines()
+    result = response.json()
+    return {
+        "rows": rows,
+        "accepted": result["accepted"],
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_s": round(result["accepted"] / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--single-rows", type=int, default=2_000, help="linhas enviadas via POST /tasks")
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    engine, _ = install_database()
+    seed(engine, users=1, tasks_per_user=0)
+    headers = auth_headers(1)
+
+    async def create_task(client, worker_id, n):
+        return await client.post("/tasks", headers=headers, json={"title": f"Tarefa {n}", "description": "Unitária"})
+
+    single = asyncio.run(run_load(create_task, args.concurrency, max(1, args.single_rows // args.concurrency)))
+    results = {
+        "single_post": {"rows": single["requests"], "rows_per_s": single["rps"], "errors": single["errors"]},
+        "import": asyncio.run(import_rows(headers, args.rows)),
+    }
+    print(json.dumps({"benchmark": "import", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
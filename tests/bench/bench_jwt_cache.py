@@ -0,0 +1,50 @@
+"""Microbenchmark: custo da dependência get_current_user com e sem cache de JWT verificados.
+
+O usuário fica no cache de usuários nos dois cenários, isolando a verificação do token.
+
+Uso: python -m tests.bench.bench_jwt_cache [--iterations 20000]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tests.bench.utils import auth_headers
+from common.auth import get_current_user, token_cache, user_cache, TOKEN_CACHE_SIZE
+
+
+async def measure(token, iterations):
+    db = AsyncSession()
+    await get_current_user(token=token, db=db)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await get_current_user(token=token, db=db)
+        db.expunge_all()
+    elapsed = time.perf_counter() - start
+    await db.close()
+    return {"iterations": iterations, "us_per_call": round(elapsed / iterations * 1e6, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    username = "bench_user_0"
+    token = auth_headers(1)["Authorization"].split(" ")[1]
+    user_cache.set(1, {"id": 1, "username": username, "email": f"{username}@example.com", "hashed_password": "x"}, ttl=3600)
+
+    token_cache.maxsize = 0
+    token_cache.clear()
+    cache_off = asyncio.run(measure(token, args.iterations))
+
+    token_cache.maxsize = TOKEN_CACHE_SIZE or 4096
+    cache_on = asyncio.run(measure(token, args.iterations))
+
+    print(json.dumps({"benchmark": "jwt_cache", "results": {"cache_off": cache_off, "cache_on": cache_on}}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark: p99 de GET /tasks com e sem uma tempestade de logins em /token.
+
+Uso: python -m tests.bench.bench_password_hashing [--login-clients 200] [--task-clients 50]
+"""
+import argparse
+import asyncio
+import json
+
+from tests.bench.utils import install_database, seed, auth_headers, run_load, dispose_async_engines
+from common.auth import BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--login-clients", type=int, default=200)
+    parser.add_argument("--logins", type=int, default=5, help="logins por cliente")
+    parser.add_argument("--task-clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=20, help="GET /tasks por cliente")
+    args = parser.parse_args()
+
+    engine, _ = install_database()
+    usernames = seed(engine, users=20, tasks_per_user=20)
+    headers = [auth_headers(user_id) for user_id in range(1, len(usernames) + 1)]
+
+    async def get_tasks(client, worker_id, n):
+        return await client.get("/tasks", headers=headers[worker_id % len(headers)])
+
+    async def login(client, worker_id, n):
+        return await client.post("/token", json={"username": usernames[worker_id % len(usernames)], "password": "benchpass123"})
+
+    async def under_load():
+        tasks, logins = await asyncio.gather(
+            run_load(get_tasks, args.task_clients, args.requests, dispose=False),
+            run_load(login, args.login_clients, args.logins, dispose=False),
+        )
+        await dispose_async_engines()
+        # Respostas 503 do limite de admissão aparecem como erros de /token
+        return {"get_tasks": tasks, "token": logins}
+
+    results = {
+        "idle": {"get_tasks": asyncio.run(run_load(get_tasks, args.task_clients, args.requests))},
+        "login_storm": asyncio.run(under_load()),
+    }
+    print(json.dumps({
+        "benchmark": "password_hashing",
+        "bcrypt_rounds": BCRYPT_ROUNDS,
+        "hash_workers": PASSWORD_HASH_WORKERS,
+        "hash_max_pending": PASSWORD_HASH_MAX_PENDING,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark: serialização de listas de tarefas (caminho padrão do FastAPI vs caminho rápido).
+
+Compara, para respostas de --rows tarefas:
+- fastapi: validação de cada linha contra List[TaskOut] + serialização do schema + json
+  (o que o FastAPI faz com `response_model` e JSONResponse);
+- fast: dicts lidos direto das linhas (`trusted_rows`) + orjson (`dump_json`).
+
+Uso: python -m tests.bench.bench_serialization [--rows 10000] [--repeat 20]
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import List
+
+from tests.bench.utils import percentile, STATUSES
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from models.task import Task
+from schemas.task import TaskOut
+from common.responses import dump_json, trusted_rows
+
+
+def make_tasks(rows):
+    return [
+        Task(id=n, title=f"Tarefa {n}", description=f"Descrição da tarefa {n}", status=STATUSES[n % 3], user_id=1)
+        for n in range(1, rows + 1)
+    ]
+
+
+def timed(fn, repeat):
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        latencies.append(time.perf_counter() - started)
+    return body, {
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "bytes": len(body),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    tasks = make_tasks(args.rows)
+    field = create_model_field(name="Response_get_tasks", type_=List[TaskOut], mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def fastapi_path():
+        content = loop.run_until_complete(serialize_response(field=field, response_content=tasks, is_coroutine=True))
+        return JSONResponse(content=content).body
+
+    def fast_path():
+        return dump_json(trusted_rows(tasks, TaskOut))
+
+    fastapi_body, fastapi_stats = timed(fastapi_path, args.repeat)
+    fast_body, fast_stats = timed(fast_path, args.repeat)
+    loop.close()
+    assert json.loads(fastapi_body) == json.loads(fast_body)
+
+    print(json.dumps({
+        "benchmark": "serialization", "rows": args.rows,
+        "results": {"fastapi": fastapi_stats, "fast": fast_stats},
+        "speedup": round(fastapi_stats["p50_ms"] / fast_stats["p50_ms"], 1) if fast_stats["p50_ms"] else None,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
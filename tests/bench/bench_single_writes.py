@@ -0,0 +1,156 @@
+"""Benchmark: escritas de uma tarefa (editar, mudar status, deletar) com SELECT antes vs um único statement.
+
+O caminho "select" reproduz os handlers anteriores: carrega a tarefa pelo ORM, altera ou
+remove o objeto, faz commit e (na edição) `refresh`. O caminho "single" chama os handlers
+atuais de app/api/tasks.py, que fazem UPDATE/DELETE ... RETURNING restrito ao dono. Os dois
+incrementam a revisão e gravam o tombstone da mesma forma.
+
+--concurrency clientes, um por usuário, escrevem nas próprias tarefas; reporta vazão,
+latência e statements por escrita de cada caminho.
+
+Uso: python -m tests.bench.bench_single_writes [--writes 2000] [--concurrency 10]
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from tests.bench.utils import install_database, seed, summarize, STATUSES
+from fastapi import HTTPException
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from api.tasks import update_task, update_task_status, delete_task, _add_tombstones
+from common.auth import Principal
+from common.revisions import bump_revision
+from database.session import apply_sqlite_pragmas, commit_with_retry
+from models.task import Task
+from schemas.task import TaskCreate, TaskStatusUpdate
+
+
+async def _load_owned(db, task_id, user_id):
+    result = await db.execute(select(Task).where(Task.id == task_id, Task.user_id == user_id))
+    db_task = result.scalars().first()
+    if not db_task:
+        raise HTTPException(status_code=404)
+    return db_task
+
+
+async def select_update(db, task_id, user_id, title):
+    async def write():
+        db_task = await _load_owned(db, task_id, user_id)
+        db_task.title = title
+        db_task.revision = await bump_revision(db, user_id)
+        return db_task
+
+    db_task = await commit_with_retry(db, write)
+    await db.refresh(db_task)
+
+
+async def select_status(db, task_id, user_id, status):
+    async def write():
+        db_task = await _load_owned(db, task_id, user_id)
+        db_task.status = status
+        db_task.revision = await bump_revision(db, user_id)
+
+    await commit_with_retry(db, write)
+
+
+async def select_delete(db, task_id, user_id):
+    async def write():
+        db_task = await _load_owned(db, task_id, user_id)
+        revision = await bump_revision(db, user_id)
+        await db.delete(db_task)
+        await _add_tombstones(db, user_id, [task_id], revision)
+
+    await commit_with_retry(db, write)
+
+
+WRITERS = {
+    "select": {
+        "update": lambda db, task_id, user_id, n: select_update(db, task_id, user_id, f"Editada {n}"),
+        "status": lambda db, task_id, user_id, n: select_status(db, task_id, user_id, STATUSES[n % 3]),
+        "delete": lambda db, task_id, user_id, n: select_delete(db, task_id, user_id),
+    },
+    "single": {
+        "update": lambda db, task_id, user_id, n: update_task(
+            task_id, TaskCreate(title=f"Editada {n}"), current_user=Principal(user_id), db=db),
+        "status": lambda db, task_id, user_id, n: update_task_status(
+            task_id, TaskStatusUpdate(status=STATUSES[n % 3]), current_user=Principal(user_id), db=db),
+        "delete": lambda db, task_id, user_id, n: delete_task(task_id, current_user=Principal(user_id), db=db),
+    },
+}
+
+
+async def run_operation(Session, write, task_ids, concurrency, writes_per_client):
+    """Cada cliente (usuário `worker_id + 1`) escreve em sequência nas próprias tarefas."""
+    latencies = []
+
+    async def worker(worker_id):
+        user_id = worker_id + 1
+        for n in range(writes_per_client):
+            started = time.perf_counter()
+            # Sessão nova por escrita, como uma requisição
+            async with Session() as db:
+                await write(db, task_ids[user_id][n], user_id, n)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def run_path(path, writers, args):
+    engine, _ = install_database(path)
+    seed(engine, users=args.concurrency, tasks_per_user=args.writes // args.concurrency)
+    with engine.connect() as conn:
+        task_ids = {}
+        for task_id, user_id in conn.exec_driver_sql("SELECT id, user_id FROM tasks ORDER BY id"):
+            task_ids.setdefault(user_id, []).append(task_id)
+    engine.dispose()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    apply_sqlite_pragmas(async_engine)
+    statements = 0
+
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        nonlocal statements
+        statements += 1
+
+    Session = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    writes_per_client = args.writes // args.concurrency
+    results = {}
+    # Deletar por último: as mesmas tarefas servem às três operações
+    for operation in ("update", "status", "delete"):
+        statements = 0
+        result = await run_operation(Session, writers[operation], task_ids, args.concurrency, writes_per_client)
+        result["statements_per_write"] = round(statements / result["requests"], 2)
+        results[operation] = result
+    await async_engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writes", type=int, default=2_000, help="escritas por operação")
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    results = {}
+    for name, writers in WRITERS.items():
+        path = os.path.join(tempfile.mkdtemp(prefix="todo-bench-"), "bench.db")
+        results[name] = asyncio.run(run_path(path, writers, args))
+    speedup = {
+        operation: round(results["single"][operation]["rps"] / results["select"][operation]["rps"], 2)
+        for operation in results["single"]
+    }
+    print(json.dumps({
+        "benchmark": "single_writes", "writes": args.writes, "concurrency": args.concurrency,
+        "results": results, "rps_speedup": speedup,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Benchmark: escrita concorrente (POST /tasks) com PRAGMAs padrão do SQLite vs configuração do app.
+
+Uso: python -m tests.bench.bench_sqlite_pragmas [--concurrency 50] [--requests 40]
+"""
+import argparse
+import asyncio
+import json
+
+from tests.bench.utils import install_database, seed, auth_headers, run_load
+from database.session import SQLITE_PRAGMAS
+
+# Comportamento anterior: rollback journal, fsync completo a cada commit
+DEFAULT_PRAGMAS = {"journal_mode": "DELETE", "synchronous": "FULL"}
+
+
+def run_scenario(pragmas, args):
+    engine, _ = install_database(pragmas=pragmas)
+    seed(engine, users=args.users, tasks_per_user=0)
+    headers = [auth_headers(user_id) for user_id in range(1, args.users + 1)]
+
+    async def create_task(client, worker_id, n):
+        return await client.post("/tasks", headers=headers[worker_id % len(headers)], json={"title": f"Tarefa {n}"})
+
+    return asyncio.run(run_load(create_task, args.concurrency, args.requests))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=40, help="POST /tasks por cliente")
+    parser.add_argument("--users", type=int, default=50)
+    args = parser.parse_args()
+
+    results = {
+        "sqlite_defaults": run_scenario(DEFAULT_PRAGMAS, args),
+        "app_pragmas": run_scenario(None, args),
+    }
+    print(json.dumps({"benchmark": "sqlite_pragmas", "app_pragmas": SQLITE_PRAGMAS, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark: ressincronizar um cliente baixando tudo (GET /tasks) vs GET /tasks/changes.
+
+Um usuário com --tasks tarefas sincroniza uma vez; depois sofre --changes escritas
+(edições, mudanças de status e exclusões) e ressincroniza pelos dois caminhos. O tempo
+de /tasks/changes deve acompanhar o número de alterações, não o tamanho da lista.
+
+Uso: python -m tests.bench.bench_task_changes [--tasks 200000] [--changes 100 1000 10000]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+
+from tests.bench.utils import install_database, seed, auth_headers, dispose_async_engines, STATUSES
+from main import app
+
+PAGE_SIZE = 1000
+
+
+async def full_download(client, headers):
+    requests = 0
+    cursor = None
+    while True:
+        params = {"limit": PAGE_SIZE, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/tasks", params=params, headers=headers)
+        requests += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return requests
+
+
+async def sync_changes(client, headers, since):
+    requests = 0
+    items = 0
+    while True:
+        params = {"limit": PAGE_SIZE, **({"since": since} if since else {})}
+        data = (await client.get("/tasks/changes", params=params, headers=headers)).json()
+        requests += 1
+        items += len(data["tasks"]) + len(data["deleted"])
+        since = data["next_since"]
+        if not data["has_more"]:
+            return since, requests, items
+
+
+async def apply_changes(client, headers, task_ids, count, rng):
+    for _ in range(count):
+        task_id = rng.choice(task_ids)
+        kind = rng.random()
+        if kind < 0.5:
+            await client.put(f"/tasks/{task_id}", json={"title": f"Editada {task_id}"}, headers=headers)
+        elif kind < 0.9:
+            await client.patch(f"/tasks/{task_id}/status", json={"status": rng.choice(STATUSES)}, headers=headers)
+        else:
+            await client.delete(f"/tasks/{task_id}", headers=headers)
+            task_ids.remove(task_id)
+
+
+async def run(args):
+    engine, _ = install_database()
+    seed(engine, users=1, tasks_per_user=args.tasks)
+    with engine.connect() as conn:
+        task_ids = [row[0] for row in conn.exec_driver_sql("SELECT id FROM tasks")]
+    headers = auth_headers(1)
+    rng = random.Random(42)
+    results = {}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        since, _, _ = await sync_changes(client, headers, None)
+        for count in args.changes:
+            await apply_changes(client, headers, task_ids, count, rng)
+
+            started = time.perf_counter()
+            since, requests, items = await sync_changes(client, headers, since)
+            changes_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            full_requests = await full_download(client, headers)
+            full_seconds = time.perf_counter() - started
+
+            results[count] = {
+                "changes_ms": round(changes_seconds * 1000, 2),
+                "changes_requests": requests,
+                "changed_items": items,
+                "full_download_ms": round(full_seconds * 1000, 2),
+                "full_download_requests": full_requests,
+            }
+    await dispose_async_engines()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--changes", type=int, nargs="+", default=[100, 1000, 10_000])
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps({"benchmark": "task_changes", "tasks": args.tasks, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark: índices antigos de coluna única vs índices compostos de tasks.
+
+Mede a carga em massa (INSERT) e as consultas de listagem por usuário (keyset por id
+e filtro por status) em dois bancos com os mesmos dados. Com o padrão de 10M linhas
+leva vários minutos e alguns GB de disco; use --rows menor para uma rodada rápida.
+
+Uso: python -m tests.bench.bench_task_indexes [--rows 10000000] [--users 10000] [--queries 2000]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from tests.bench.utils import STATUSES, percentile
+from sqlalchemy import create_engine
+from database.session import apply_sqlite_pragmas
+from database.migrations import _0001_task_composite_indexes
+
+TASKS_DDL = (
+    "CREATE TABLE tasks (id INTEGER NOT NULL PRIMARY KEY, title VARCHAR NOT NULL, "
+    "description VARCHAR, status VARCHAR, user_id INTEGER)"
+)
+# Índices criados pelo modelo antes da migração 0001
+LEGACY_INDEXES = (
+    "CREATE INDEX ix_tasks_id ON tasks (id)",
+    "CREATE INDEX ix_tasks_title ON tasks (title)",
+    "CREATE INDEX ix_tasks_description ON tasks (description)",
+    "CREATE INDEX ix_tasks_status ON tasks (status)",
+    "CREATE INDEX ix_tasks_user_id ON tasks (user_id)",
+)
+LIST_SQL = "SELECT id, title, description, status, user_id FROM tasks WHERE user_id = ? AND id > ? ORDER BY id LIMIT 100"
+STATUS_SQL = (
+    "SELECT id, title, description, status, user_id FROM tasks "
+    "WHERE user_id = ? AND status = ? AND id > ? ORDER BY id LIMIT 100"
+)
+
+
+def build_database(layout, args):
+    path = os.path.join(tempfile.mkdtemp(prefix="todo-bench-"), f"{layout}.db")
+    engine = create_engine(f"sqlite:///{path}")
+    apply_sqlite_pragmas(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(TASKS_DDL)
+        for statement in LEGACY_INDEXES:
+            conn.exec_driver_sql(statement)
+        if layout == "composite":
+            # Só a troca de índices comparada aqui: run_migrations também instalaria os triggers
+            # de busca (FTS5) e outras tabelas, que pesariam na carga
+            _0001_task_composite_indexes(conn)
+
+    rng = random.Random(42)
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        for offset in range(0, args.rows, args.batch_size):
+            rows = [
+                (f"Tarefa {n}", f"Descrição da tarefa {n}", rng.choice(STATUSES), rng.randint(1, args.users))
+                for n in range(offset, min(offset + args.batch_size, args.rows))
+            ]
+            conn.exec_driver_sql("INSERT INTO tasks (title, description, status, user_id) VALUES (?, ?, ?, ?)", rows)
+    insert_seconds = time.perf_counter() - started
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE tasks")
+    return engine, path, insert_seconds
+
+
+def time_queries(engine, sql, params):
+    latencies = []
+    with engine.connect() as conn:
+        for param in params:
+            started = time.perf_counter()
+            conn.exec_driver_sql(sql, param).fetchall()
+            latencies.append(time.perf_counter() - started)
+        plan = [row[-1] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql, params[0])]
+    return {
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "plan": plan,
+    }
+
+
+def run_scenario(layout, args):
+    engine, path, insert_seconds = build_database(layout, args)
+    rng = random.Random(7)
+    list_params = [(rng.randint(1, args.users), 0) for _ in range(args.queries)]
+    status_params = [(rng.randint(1, args.users), rng.choice(STATUSES), 0) for _ in range(args.queries)]
+    result = {
+        "insert_seconds": round(insert_seconds, 2),
+        "insert_rows_per_second": round(args.rows / insert_seconds),
+        "file_mb": round(os.path.getsize(path) / 2**20, 1),
+        "list_by_user": time_queries(engine, LIST_SQL, list_params),
+        "list_by_user_and_status": time_queries(engine, STATUS_SQL, status_params),
+    }
+    engine.dispose()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    results = {layout: run_scenario(layout, args) for layout in ("legacy", "composite")}
+    print(json.dumps({"benchmark": "task_indexes", "rows": args.rows, "users": args.users, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
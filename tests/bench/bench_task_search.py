@@ -0,0 +1,108 @@
+"""Benchmark: GET /tasks/search (FTS5) vs LIKE '%termo%' sobre título e descrição.
+
+Popula o banco com um vocabulário sintético, reconstrói o índice de busca uma vez ao
+final (como no comando de rebuild) e mede a latência da rota de busca em processo e de
+um SELECT equivalente com LIKE. O padrão de 5M tarefas leva alguns minutos.
+
+Uso: python -m tests.bench.bench_task_search [--tasks 5000000] [--users 10000] [--queries 500]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from tests.bench.utils import install_database, seed, auth_headers, run_load, percentile, STATUSES
+from database.search import rebuild_search_index
+
+WORDS = (
+    "comprar estudar revisar enviar relatório reunião mercado projeto cliente fatura "
+    "documentação contrato pagar ligar agendar médico academia viagem orçamento código "
+    "deploy banco backup planilha apresentação email entrevista curso livro aluguel "
+    "conserto carro casa jardim presente aniversário festa treino corrida consulta exame"
+).split()
+# Cauda longa de palavras raras, sorteadas com distribuição de Zipf como em texto real
+RARE_WORDS = [f"termo{n}" for n in range(50_000)]
+LIKE_SQL = (
+    "SELECT id FROM tasks WHERE user_id = ? AND (title LIKE ? OR description LIKE ?) ORDER BY id LIMIT 100"
+)
+
+
+def populate(engine, args):
+    seed(engine, users=args.users, tasks_per_user=0)
+    rng = random.Random(42)
+    weights = [1 / (rank + 1) for rank in range(len(WORDS) + len(RARE_WORDS))]
+    vocabulary = list(WORDS) + RARE_WORDS
+
+    def text(k):
+        return " ".join(rng.choices(vocabulary, weights=weights, k=k))
+
+    with engine.begin() as conn:
+        # Carga em massa sem os triggers; o índice é reconstruído de uma vez no fim
+        for trigger in ("tasks_fts_insert", "tasks_fts_update", "tasks_fts_delete"):
+            conn.exec_driver_sql(f"DROP TRIGGER {trigger}")
+        for offset in range(0, args.tasks, args.batch_size):
+            conn.exec_driver_sql(
+                "INSERT INTO tasks (title, description, status, user_id) VALUES (?, ?, ?, ?)",
+                [
+                    (text(3), text(12),
+                     rng.choice(STATUSES), rng.randint(1, args.users))
+                    for _ in range(min(args.batch_size, args.tasks - offset))
+                ],
+            )
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        rebuild_search_index(conn)
+    return time.perf_counter() - started
+
+
+def like_latencies(engine, args):
+    rng = random.Random(7)
+    latencies = []
+    with engine.connect() as conn:
+        for _ in range(args.like_queries):
+            pattern = f"%{rng.choice(WORDS)}%"
+            started = time.perf_counter()
+            conn.exec_driver_sql(LIKE_SQL, (rng.randint(1, args.users), pattern, pattern)).fetchall()
+            latencies.append(time.perf_counter() - started)
+    return {
+        "queries": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=5_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=500, help="buscas por cliente")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--like-queries", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    engine, _ = install_database()
+    rebuild_seconds = populate(engine, args)
+    rng = random.Random(11)
+    headers = {}
+
+    async def search(client, worker_id, n):
+        user_id = rng.randint(1, args.users)
+        headers.setdefault(user_id, auth_headers(user_id))
+        words = " ".join(rng.sample(WORDS, rng.choice((1, 2))))
+        return await client.get("/tasks/search", params={"q": words, "limit": 20}, headers=headers[user_id])
+
+    results = {
+        "fts5_route": asyncio.run(run_load(search, args.concurrency, args.queries)),
+        "like_sql": like_latencies(engine, args),
+    }
+    print(json.dumps({
+        "benchmark": "task_search", "tasks": args.tasks, "users": args.users,
+        "rebuild_seconds": round(rebuild_seconds, 2), "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
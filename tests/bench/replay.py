@@ -0,0 +1,219 @@
+"""Gerador de carga: replay de um trace JSONL de requisições contra o app.
+
+O trace tem uma requisição por linha, no formato gravado por TrafficRecorderMiddleware
+(app/common/recorder.py): {"ts", "method", "path", "user", "body", "content_type"}. Para
+cada `user` é emitido um token novo (mesmo SECRET_KEY do servidor); senhas gravadas como
+"***" viram --password (a senha comum das bases de database.generate).
+
+Alvo: em processo via ASGI (padrão; --database aponta o app para um SQLite existente)
+ou HTTP (--target http://127.0.0.1:8000, ex.: uvicorn local).
+
+Chegadas:
+- closed: --concurrency clientes; cada um envia a próxima requisição do trace assim que
+  a anterior termina (mede a vazão máxima);
+- open: as requisições partem nos instantes gravados (`ts`, acelerados por --speed) ou
+  a --rate req/s (Poisson), sem esperar as anteriores; --concurrency limita as em
+  andamento. A latência conta a partir do instante agendado, então a espera por causa
+  de um servidor lento entra na medida (sem omissão coordenada).
+
+Reporta vazão, status, latência p50/p95/p99 e histograma, no total e por rota (ids no
+caminho viram {id}), em JSON.
+
+Uso: python -m tests.bench.replay trace.jsonl [--target URL] [--mode open --speed 2 | --rate 500]
+     [--concurrency 50] [--loops 3] [--database load.db] [--password senha123]
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+
+import httpx
+
+from tests.bench.utils import install_database, auth_headers, dispose_async_engines, summarize
+from common.auth import create_access_token
+from common.recorder import REDACTED, SENSITIVE_FIELDS
+from main import app
+
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def load_trace(path):
+    with open(path, encoding="utf-8") as trace:
+        return [json.loads(line) for line in trace if line.strip()]
+
+
+def route_of(path):
+    return _ID_SEGMENT.sub("/{id}", path.split("?", 1)[0])
+
+
+def histogram(latencies):
+    counts = {f"le_{bound}ms": 0 for bound in HISTOGRAM_BUCKETS_MS}
+    counts["le_inf"] = 0
+    for latency in latencies:
+        ms = latency * 1000
+        for bound in HISTOGRAM_BUCKETS_MS:
+            if ms <= bound:
+                counts[f"le_{bound}ms"] += 1
+                break
+        else:
+            counts["le_inf"] += 1
+    return counts
+
+
+class Replayer:
+    def __init__(self, client, password):
+        self.client = client
+        self.password = password
+        self._tokens = {}
+        self.latencies = {}
+        self.statuses = {}
+        self.errors = 0
+
+    def _headers(self, entry):
+        headers = {}
+        if entry.get("content_type"):
+            headers["Content-Type"] = entry["content_type"]
+        user = entry.get("user")
+        if user is not None:
+            if user not in self._tokens:
+                # Ids inteiros: formato atual do token; strings: tokens antigos (sub = username)
+                self._tokens[user] = auth_headers(user) if isinstance(user, int) else {
+                    "Authorization": f"Bearer {create_access_token(data={'sub': user})}"
+                }
+            headers.update(self._tokens[user])
+        return headers
+
+    def _content(self, entry):
+        body = entry.get("body")
+        if body is None:
+            return None
+        if isinstance(body, str):
+            return body.encode("utf-8")
+        if isinstance(body, dict):
+            body = {key: self.password if key in SENSITIVE_FIELDS and value == REDACTED else value for key, value in body.items()}
+        return json.dumps(body).encode("utf-8")
+
+    async def send(self, entry, scheduled=None):
+        started = time.perf_counter() if scheduled is None else scheduled
+        try:
+            response = await self.client.request(
+                entry["method"], entry["path"], content=self._content(entry), headers=self._headers(entry)
+            )
+            status = response.status_code
+        except Exception:
+            status = "exception"
+        latency = time.perf_counter() - started
+
+        self.latencies.setdefault(f"{entry['method']} {route_of(entry['path'])}", []).append(latency)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if status == "exception" or status >= 400:
+            self.errors += 1
+
+    def report(self, elapsed):
+        routes = {}
+        all_latencies = []
+        for route, latencies in sorted(self.latencies.items()):
+            routes[route] = {**summarize(latencies, elapsed), "histogram": histogram(latencies)}
+            all_latencies += latencies
+        return {
+            **summarize(all_latencies, elapsed),
+            "errors": self.errors,
+            "status": {str(status): count for status, count in sorted(self.statuses.items(), key=str)},
+            "histogram": histogram(all_latencies),
+            "routes": routes,
+        }
+
+
+async def replay(entries, client, mode="closed", concurrency=10, rate=None, speed=1.0, password="senha123", seed=None):
+    replayer = Replayer(client, password)
+    started = time.perf_counter()
+
+    if mode == "closed":
+        pending = iter(entries)
+
+        async def worker():
+            for entry in pending:
+                await replayer.send(entry)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    else:
+        if rate:
+            rng = random.Random(seed)
+            offsets, offset = [], 0.0
+            for _ in entries:
+                offsets.append(offset)
+                offset += rng.expovariate(rate)
+        else:
+            first = entries[0].get("ts", 0.0) if entries else 0.0
+            offsets = [(entry.get("ts", 0.0) - first) / speed for entry in entries]
+
+        slots = asyncio.Semaphore(concurrency) if concurrency else None
+
+        async def arrival(entry, scheduled):
+            if slots is None:
+                await replayer.send(entry, scheduled)
+                return
+            async with slots:
+                await replayer.send(entry, scheduled)
+
+        tasks = []
+        for entry, offset in sorted(zip(entries, offsets), key=lambda pair: pair[1]):
+            scheduled = started + offset
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(arrival(entry, scheduled)))
+        await asyncio.gather(*tasks)
+
+    result = replayer.report(time.perf_counter() - started)
+    result["mode"] = mode
+    return result
+
+
+async def run(args, entries):
+    if args.target:
+        limits = httpx.Limits(max_connections=args.concurrency or None)
+        async with httpx.AsyncClient(base_url=args.target, timeout=None, limits=limits) as client:
+            return await replay(entries, client, args.mode, args.concurrency, args.rate, args.speed, args.password, args.seed)
+
+    if args.database:
+        install_database(args.database)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://replay", timeout=None) as client:
+        result = await replay(entries, client, args.mode, args.concurrency, args.rate, args.speed, args.password, args.seed)
+    await dispose_async_engines()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("trace", help="arquivo JSONL com as requisições")
+    parser.add_argument("--target", help="URL base (ex.: http://127.0.0.1:8000); padrão: app em processo")
+    parser.add_argument("--database", help="em processo: caminho de um banco SQLite existente")
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed")
+    parser.add_argument("--concurrency", type=int, default=10, help="closed: clientes; open: limite em andamento (0 = sem limite)")
+    parser.add_argument("--rate", type=float, help="open: chegadas por segundo (Poisson) em vez dos instantes gravados")
+    parser.add_argument("--speed", type=float, default=1.0, help="open: fator de aceleração dos instantes gravados")
+    parser.add_argument("--loops", type=int, default=1, help="repetições do trace")
+    parser.add_argument("--limit", type=int, help="no máximo N requisições")
+    parser.add_argument("--password", default="senha123", help="substitui as senhas gravadas como ***")
+    parser.add_argument("--seed", type=int, help="semente das chegadas Poisson")
+    args = parser.parse_args()
+
+    trace = load_trace(args.trace)
+    duration = (trace[-1].get("ts", 0.0) - trace[0].get("ts", 0.0)) if trace else 0.0
+    entries = []
+    for loop in range(args.loops):
+        # Em modo aberto, cada repetição começa depois do fim da anterior
+        entries += [{**entry, "ts": entry.get("ts", 0.0) + loop * duration} for entry in trace]
+    entries = entries[:args.limit] if args.limit else entries
+
+    result = asyncio.run(run(args, entries))
+    print(json.dumps({"benchmark": "replay", "trace": args.trace, "target": args.target or "asgi", **result}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Utilitários compartilhados pelos benchmarks (banco temporário, seed e driver de carga)."""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# Adicionar app ao path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'app'))
+os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+
+import httpx
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from main import app
+from database.base import Base
+from database.session import get_db, get_async_db, apply_sqlite_pragmas
+from common.metrics import instrument_engine
+from models.user import User
+from models.task import Task
+from common.auth import create_access_token, get_password_hash, TOKEN_CLAIMS_VERSION
+
+STATUSES = ("Pendente", "Em Progresso", "Concluída")
+
+# Engines assíncronos criados pelo benchmark; descartados ao fim de cada run_load,
+# senão as threads do aiosqlite mantêm o processo vivo
+_async_engines = []
+
+
+def install_database(path=None, pragmas=None):
+    """Cria um banco SQLite temporário e aponta as dependências do app para ele.
+
+    `pragmas` substitui os PRAGMAs configurados em database.session (None = padrão do app).
+    """
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="todo-bench-"), "bench.db")
+    # NullPool: com 500 clientes o QueuePool padrão (5+10) trava o threadpool esperando checkout
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}, poolclass=NullPool
+    )
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    _async_engines.append(async_engine)
+    apply_sqlite_pragmas(engine, pragmas)
+    apply_sqlite_pragmas(async_engine, pragmas)
+    instrument_engine(async_engine, "async")
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    def bench_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def bench_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = bench_get_db
+    app.dependency_overrides[get_async_db] = bench_get_async_db
+    Base.metadata.create_all(bind=engine)
+    return engine, SessionLocal
+
+
+def seed(engine, users=1, tasks_per_user=10, batch_size=10_000):
+    """Insere usuários e tarefas em lote; retorna os usernames criados (id = posição + 1)."""
+    # Um único hash reaproveitado: bcrypt não é o que estamos medindo
+    hashed = get_password_hash("benchpass123")
+    usernames = [f"bench_user_{i}" for i in range(users)]
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i + 1, "username": name, "email": f"{name}@example.com", "hashed_password": hashed}
+            for i, name in enumerate(usernames)
+        ])
+        rows = []
+        for user_id in range(1, users + 1):
+            for n in range(tasks_per_user):
+                rows.append({
+                    "title": f"Tarefa {n}",
+                    "description": f"Descrição da tarefa {n}",
+                    "status": STATUSES[n % 3],
+                    "user_id": user_id,
+                })
+                if len(rows) >= batch_size:
+                    conn.execute(insert(Task), rows)
+                    rows = []
+        if rows:
+            conn.execute(insert(Task), rows)
+    return usernames
+
+
+def auth_headers(user_id):
+    """Token no formato atual para o usuário `user_id` (ids do seed começam em 1)."""
+    claims = {"sub": str(user_id), "ver": TOKEN_CLAIMS_VERSION}
+    return {"Authorization": f"Bearer {create_access_token(data=claims)}"}
+
+
+async def dispose_async_engines():
+    """Fecha as conexões aiosqlite do pool; chamar no mesmo loop que as abriu."""
+    for async_engine in _async_engines:
+        await async_engine.dispose()
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies, elapsed):
+    return {
+        "requests": len(latencies),
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+async def run_load(make_request, concurrency, requests_per_client, target=None, dispose=True):
+    """Loop fechado: `concurrency` clientes, cada um faz `requests_per_client` requisições.
+
+    `make_request(client, worker_id, n)` recebe um httpx.AsyncClient e deve retornar a resposta.
+    Ao rodar várias cargas em paralelo, passe `dispose=False` e chame
+    `dispose_async_engines()` depois de todas terminarem.
+    """
+    transport = httpx.ASGITransport(app=target or app)
+    latencies = []
+    errors = 0
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker(worker_id):
+            nonlocal errors
+            for n in range(requests_per_client):
+                start = time.perf_counter()
+                try:
+                    response = await make_request(client, worker_id, n)
+                except Exception:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+                if response.status_code >= 400:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    if dispose:
+        await dispose_async_engines()
+
+    result = summarize(latencies, elapsed)
+    result["errors"] = errors
+    return result
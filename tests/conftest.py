@@ -4,22 +4,35 @@ import os
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
 
 # Adicionar app ao path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'app'))
+# Custo mínimo do bcrypt nos testes
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
 
 from main import app
-from database.session import get_db
+from database.session import get_db, get_async_db, apply_sqlite_pragmas
+from common.metrics import instrument_engine
 from database.base import Base
 from models.user import User
 from models.task import Task
-from common.auth import get_password_hash
+from common.auth import get_password_hash, user_cache, token_cache, revoked_users
+from common.revisions import task_list_cache
 
 # Banco de dados de teste em memória
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+apply_sqlite_pragmas(engine)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Cada TestClient roda seu próprio event loop: sem pool para não reaproveitar conexões entre loops
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+apply_sqlite_pragmas(async_engine)
+instrument_engine(async_engine, "async")
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 def override_get_db():
     try:
         db = TestingSessionLocal()
@@ -27,11 +40,36 @@ def override_get_db():
     finally:
         db.close()
 
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
+
+# Testes marcados com @pytest.mark.slow (volume grande ou medidas de tempo sensíveis à
+# carga da máquina) só rodam com --run-slow
+def pytest_addoption(parser):
+    parser.addoption("--run-slow", action="store_true", default=False, help="roda também os testes marcados como slow")
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: teste lento ou sensível a tempo; roda só com --run-slow")
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="teste lento: use --run-slow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
 
 @pytest.fixture(scope="function")
 def db_session():
     Base.metadata.create_all(bind=engine)
+    user_cache.clear()
+    token_cache.clear()
+    revoked_users.clear()
+    task_list_cache.clear()
     db = TestingSessionLocal()
     try:
         yield db
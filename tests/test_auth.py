@@ -1,6 +1,11 @@
 import pytest
 from fastapi import status
 
+def register_and_login(client, username):
+    client.post("/register", json={"username": username, "email": f"{username}@example.com", "password": "senha123"})
+    token = client.post("/token", json={"username": username, "password": "senha123"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
 class TestAuth:
     """Testes para endpoints de autenticação"""
     
@@ -109,4 +114,134 @@ class TestAuth:
             "password": ""
         })
         assert response.status_code == status.HTTP_400_BAD_REQUEST
-        assert "obrigatórios" in response.json()["detail"]
\ No newline at end of file
+        assert "obrigatórios" in response.json()["detail"]
+    
+    def test_login_hashing_saturated(self, client, test_user, monkeypatch):
+        """Teste: Login retorna 503 quando o limite de hashing está esgotado"""
+        import threading
+        import common.auth
+        monkeypatch.setattr(common.auth, "_hash_slots", threading.BoundedSemaphore(1))
+        common.auth._hash_slots.acquire()
+        response = client.post("/token", json={
+            "username": "testuser",
+            "password": "testpass123"
+        })
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers["Retry-After"] == "1"
+    
+    def test_password_hash_uses_configured_rounds(self):
+        """Teste: Custo do bcrypt vem da configuração"""
+        from common.auth import get_password_hash, BCRYPT_ROUNDS
+        assert get_password_hash("senha123").split("$")[2] == f"{BCRYPT_ROUNDS:02d}"
+    
+    def test_token_cache_hit(self, client, auth_headers):
+        """Teste: Token já verificado é servido do cache"""
+        from common.auth import token_cache
+        client.get("/users/me", headers=auth_headers)
+        hits = token_cache.stats()["hits"]
+        client.get("/users/me", headers=auth_headers)
+        assert token_cache.stats()["hits"] == hits + 1
+    
+    def test_token_cache_rejects_tampered_token(self, client, auth_headers):
+        """Teste: Token adulterado não é aceito mesmo com o original em cache"""
+        client.get("/users/me", headers=auth_headers)
+        token = auth_headers["Authorization"].split(" ")[1]
+        tampered = token[:-2] + ("AA" if not token.endswith("AA") else "BB")
+        response = client.get("/users/me", headers={"Authorization": f"Bearer {tampered}"})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_token_cache_entry_expires_with_token(self, db_session, monkeypatch):
+        """Teste: Entrada do cache expira junto com o token"""
+        import time
+        import hashlib
+        from jose import jwt
+        from common import auth
+        token = jwt.encode({"sub": "testuser", "exp": int(time.time()) + 5}, auth.SECRET_KEY, algorithm=auth.ALGORITHM)
+        assert auth.decode_access_token(token)["sub"] == "testuser"
+        _, expires_at = auth.token_cache._data[hashlib.sha256(token.encode()).digest()]
+        assert expires_at - time.monotonic() <= 5
+    
+    def test_expired_token_rejected(self, client, test_user):
+        """Teste: Token expirado é rejeitado"""
+        import time
+        from jose import jwt
+        from common.auth import SECRET_KEY, ALGORITHM
+        token = jwt.encode({"sub": "testuser", "exp": int(time.time()) - 10}, SECRET_KEY, algorithm=ALGORITHM)
+        response = client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_token_claims_use_user_id(self, client, test_user):
+        """Teste: Token carrega o id do usuário e a versão das claims"""
+        from jose import jwt
+        from common.auth import SECRET_KEY, ALGORITHM, TOKEN_CLAIMS_VERSION
+        response = client.post("/token", json={"username": "testuser", "password": "testpass123"})
+        claims = jwt.decode(response.json()["access_token"], SECRET_KEY, algorithms=[ALGORITHM])
+        assert claims["sub"] == str(test_user.id)
+        assert claims["ver"] == TOKEN_CLAIMS_VERSION
+    
+    def test_legacy_username_token_accepted(self, client, test_user):
+        """Teste: Token no formato antigo (sub=username) continua aceito"""
+        from common.auth import create_access_token
+        token = create_access_token(data={"sub": "testuser"})
+        response = client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["id"] == test_user.id
+    
+    def test_stateless_mode_skips_user_lookup(self, client, auth_headers, test_task, monkeypatch):
+        """Teste: Modo stateless não carrega o usuário do token nos endpoints de tarefas"""
+        import common.auth
+        
+        async def fail_user_columns(payload, db):
+            raise AssertionError("usuário do token consultado")
+        
+        monkeypatch.setattr(common.auth, "AUTH_STATELESS", True)
+        monkeypatch.setattr(common.auth, "_user_columns", fail_user_columns)
+        response = client.get("/tasks", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()[0]["id"] == test_task.id
+    
+    def test_stateless_mode_rejects_deleted_user(self, client, auth_headers, monkeypatch):
+        """Teste: Modo stateless rejeita token de conta deletada"""
+        import common.auth
+        monkeypatch.setattr(common.auth, "AUTH_STATELESS", True)
+        assert client.delete("/users/me", headers=auth_headers).status_code == status.HTTP_200_OK
+        response = client.get("/tasks", headers=auth_headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_stateless_mode_rejects_user_deleted_elsewhere(self, client, auth_headers, db_session, test_user, monkeypatch):
+        """Teste: Conta removida por outro processo não escreve nem lista tarefas"""
+        import common.auth
+        from models.task import Task
+        monkeypatch.setattr(common.auth, "AUTH_STATELESS", True)
+        db_session.delete(test_user)
+        db_session.commit()
+        
+        assert client.post("/tasks", headers=auth_headers, json={"title": "Órfã"}).status_code == status.HTTP_401_UNAUTHORIZED
+        assert client.get("/tasks", headers=auth_headers).status_code == status.HTTP_401_UNAUTHORIZED
+        assert client.get("/tasks/changes", headers=auth_headers).status_code == status.HTTP_401_UNAUTHORIZED
+        assert db_session.query(Task).count() == 0
+    
+    def test_deleted_user_token_not_reused_by_new_account(self, client, db_session):
+        """Teste: Token de conta deletada não vale para a próxima conta registrada"""
+        register_and_login(client, "alice")
+        bob = register_and_login(client, "bob")
+        bob_id = client.get("/users/me", headers=bob).json()["id"]
+        assert client.delete("/users/me", headers=bob).status_code == status.HTTP_200_OK
+        carol = register_and_login(client, "carol")
+        
+        assert client.get("/users/me", headers=carol).json()["id"] > bob_id
+        assert client.get("/users/me", headers=bob).status_code == status.HTTP_401_UNAUTHORIZED
+        assert client.post("/tasks", headers=bob, json={"title": "Invasão"}).status_code == status.HTTP_401_UNAUTHORIZED
+        assert client.get("/tasks", headers=carol).json() == []
+    
+    def test_stateless_mode_new_account_after_deletion(self, client, db_session, monkeypatch):
+        """Teste: Modo stateless não confunde a conta nova com a deletada"""
+        import common.auth
+        monkeypatch.setattr(common.auth, "AUTH_STATELESS", True)
+        
+        bob = register_and_login(client, "bob")
+        assert client.delete("/users/me", headers=bob).status_code == status.HTTP_200_OK
+        carol = register_and_login(client, "carol")
+        
+        assert client.get("/tasks", headers=carol).status_code == status.HTTP_200_OK
+        assert client.get("/tasks", headers=bob).status_code == status.HTTP_401_UNAUTHORIZED
\ No newline at end of file
@@ -0,0 +1,106 @@
+import pytest
+from common.cache import TTLCache, ResponseCache, MemoryResponseCache, load_response_cache
+
+class TestTTLCache:
+    """Testes para o cache LRU com TTL"""
+    
+    def test_get_and_stats(self):
+        """Teste: Hits e misses são contabilizados"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.stats() == {"hits": 1, "misses": 1, "hit_ratio": 0.5, "size": 1, "maxsize": 2}
+    
+    def test_lru_eviction(self):
+        """Teste: Entrada menos usada recentemente é removida"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+    
+    def test_expiration(self, monkeypatch):
+        """Teste: Entrada expira após o TTL"""
+        import common.cache
+        now = [1000.0]
+        monkeypatch.setattr(common.cache.time, "monotonic", lambda: now[0])
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=30)
+        now[0] += 11
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+    
+    def test_invalidate_and_disabled(self):
+        """Teste: Invalidação e cache desabilitado (maxsize=0)"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.invalidate("a")
+        assert cache.get("a") is None
+        
+        disabled = TTLCache(maxsize=0, ttl=60)
+        disabled.set("a", 1)
+        assert disabled.get("a") is None
+
+class TestMemoryResponseCache:
+    """Testes para o cache de respostas serializadas"""
+    
+    def test_get_and_stats(self):
+        """Teste: Hits, misses e bytes armazenados"""
+        cache = MemoryResponseCache(max_bytes=1000)
+        assert cache.get(1, "page") is None
+        cache.set(1, "page", b"[]", {"X-Next-Cursor": "abc"})
+        assert cache.get(1, "page") == (b"[]", {"X-Next-Cursor": "abc"})
+        assert cache.stats() == {"hits": 1, "misses": 1, "hit_ratio": 0.5, "size": 1, "bytes": 18, "max_bytes": 1000}
+    
+    def test_byte_limit_evicts_lru(self):
+        """Teste: Acima do limite de bytes, as entradas menos usadas saem primeiro"""
+        cache = MemoryResponseCache(max_bytes=300, max_entry_bytes=100)
+        for key in ("a", "b", "c"):
+            cache.set(1, key, b"x" * 100)
+        cache.get(1, "a")
+        cache.set(2, "d", b"x" * 100)
+        assert cache.get(1, "b") is None
+        assert cache.get(1, "a") is not None
+        assert cache.stats()["bytes"] == 300
+        
+        # Entrada maior que o limite por entrada não é armazenada
+        cache.set(1, "e", b"x" * 101)
+        assert cache.get(1, "e") is None
+    
+    def test_invalidate_user(self):
+        """Teste: Invalidação remove só as páginas do usuário"""
+        cache = MemoryResponseCache(max_bytes=1000)
+        cache.set(1, "a", b"1")
+        cache.set(1, "b", b"2")
+        cache.set(2, "a", b"3")
+        cache.invalidate_user(1)
+        assert cache.get(1, "a") is None and cache.get(1, "b") is None
+        assert cache.get(2, "a") == (b"3", {})
+        assert cache.stats()["bytes"] == 1
+    
+    def test_disabled_and_custom_backend(self):
+        """Teste: max_bytes=0 desabilita; backend externo por <módulo>:<fábrica>"""
+        disabled = load_response_cache("memory", 0)
+        disabled.set(1, "a", b"1")
+        assert disabled.get(1, "a") is None
+        
+        custom = load_response_cache("common.cache:MemoryResponseCache", 10)
+        assert isinstance(custom, MemoryResponseCache) and custom.max_bytes == 10
+        with pytest.raises(ValueError):
+            load_response_cache("redis", 10)
+    
+    def test_response_cache_interface_is_abstract(self):
+        """Teste: Backend que não implementa a interface inteira não é instanciado"""
+        class Incomplete(ResponseCache):
+            def get(self, user_id, key):
+                return None
+        
+        with pytest.raises(TypeError):
+            ResponseCache()
+        with pytest.raises(TypeError):
+            Incomplete()
\ No newline at end of file
@@ -0,0 +1,106 @@
+import pytest
+from datetime import datetime, timedelta
+from fastapi import status
+from database.tombstones import compact_tombstones
+
+def sync(client, headers, since=None, limit=None):
+    params = {}
+    if since:
+        params["since"] = since
+    if limit:
+        params["limit"] = limit
+    response = client.get("/tasks/changes", params=params, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+class TestTaskChanges:    
+    """Testes para a sincronização incremental de tarefas"""
+    
+    def test_full_sync_includes_existing_tasks(self, client, auth_headers, test_task):
+        """Teste: Sem `since`, retorna todas as tarefas (inclusive as anteriores às revisões)"""
+        data = sync(client, auth_headers)
+        assert [task["id"] for task in data["tasks"]] == [test_task.id]
+        assert data["deleted"] == []
+        assert data["has_more"] is False
+    
+    def test_changes_since_last_sync(self, client, auth_headers, test_task):
+        """Teste: Só retorna o que foi criado, alterado ou removido depois da última sincronização"""
+        other = client.post("/tasks", headers=auth_headers, json={"title": "Outra"}).json()
+        since = sync(client, auth_headers)["next_since"]
+    
+        client.put(f"/tasks/{test_task.id}", headers=auth_headers, json={"title": "Editada"})
+        client.delete(f"/tasks/{other['id']}", headers=auth_headers)
+        created = client.post("/tasks", headers=auth_headers, json={"title": "Nova"}).json()
+    
+        data = sync(client, auth_headers, since)
+        assert [task["title"] for task in data["tasks"]] == ["Editada", "Nova"]
+        assert data["deleted"] == [other["id"]]
+    
+        # Nada novo desde a última resposta
+        data = sync(client, auth_headers, data["next_since"])
+        assert data["tasks"] == [] and data["deleted"] == []
+    
+        client.patch(f"/tasks/{created['id']}/status", headers=auth_headers, json={"status": "Concluída"})
+        data = sync(client, auth_headers, data["next_since"])
+        assert [(task["id"], task["status"]) for task in data["tasks"]] == [(created["id"], "Concluída")]
+    
+    def test_changes_from_bulk_writes(self, client, auth_headers):
+        """Teste: Escritas em lote e importação também entram nas alterações"""
+        tasks = client.post("/tasks/bulk", headers=auth_headers, json=[{"title": "A"}, {"title": "B"}]).json()
+        since = sync(client, auth_headers)["next_since"]
+    
+        client.post("/tasks/import", headers=auth_headers, content=b'{"title": "C"}\n')
+        client.patch("/tasks/bulk/status", headers=auth_headers, json={"ids": [tasks[0]["id"]], "status": "Concluída"})
+        client.post("/tasks/bulk/delete", headers=auth_headers, json={"ids": [tasks[1]["id"]]})
+    
+        data = sync(client, auth_headers, since)
+        assert [task["title"] for task in data["tasks"]] == ["C", "A"]
+        assert data["deleted"] == [tasks[1]["id"]]
+    
+    def test_changes_paginated(self, client, auth_headers):
+        """Teste: Paginar alterações de uma mesma revisão sem repetir nem perder itens"""
+        client.post("/tasks/bulk", headers=auth_headers, json=[{"title": f"Tarefa {i}"} for i in range(5)])
+    
+        seen = []
+        since = None
+        while True:
+            data = sync(client, auth_headers, since, limit=2)
+            seen += [task["id"] for task in data["tasks"]]
+            since = data["next_since"]
+            if not data["has_more"]:
+                break
+    
+        assert len(seen) == 5
+        assert len(set(seen)) == 5
+    
+    def test_compacted_tombstones_require_full_sync(self, client, auth_headers, db_session, test_task):
+        """Teste: Após compactar lápides, posições anteriores recebem 410"""
+        since = sync(client, auth_headers)["next_since"]
+        client.delete(f"/tasks/{test_task.id}", headers=auth_headers)
+        current = sync(client, auth_headers, since)["next_since"]
+    
+        assert compact_tombstones(db_session.connection(), datetime.utcnow() + timedelta(minutes=1)) == 1
+        db_session.commit()
+    
+        response = client.get("/tasks/changes", params={"since": since}, headers=auth_headers)
+        assert response.status_code == status.HTTP_410_GONE
+        # Quem já tinha recebido a exclusão continua sincronizando normalmente
+        assert sync(client, auth_headers, current)["deleted"] == []
+    
+    def test_compaction_keeps_recent_tombstones(self, client, auth_headers, db_session, test_task):
+        """Teste: Lápides mais novas que o corte não são removidas"""
+        task_id = test_task.id
+        client.delete(f"/tasks/{task_id}", headers=auth_headers)
+        assert compact_tombstones(db_session.connection(), datetime.utcnow() - timedelta(days=1)) == 0
+        db_session.commit()
+        assert sync(client, auth_headers)["deleted"] == [task_id]
+    
+    def test_changes_invalid_since(self, client, auth_headers):
+        """Teste: `since` inválido"""
+        response = client.get("/tasks/changes?since=invalido", headers=auth_headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_changes_unauthorized(self, client):
+        """Teste: Sincronizar sem autenticação"""
+        response = client.get("/tasks/changes")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
\ No newline at end of file
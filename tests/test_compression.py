@@ -0,0 +1,102 @@
+import asyncio
+import json
+import zlib
+from fastapi import status
+from common.compression import CompressionMiddleware, GzipEncoder, negotiate_encoding
+
+ENCODERS = {"zstd": object, "br": object, "gzip": GzipEncoder}
+
+def run_middleware(app, accept_encoding="gzip", minimum_size=100):
+    messages = []
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(CompressionMiddleware(app, minimum_size=minimum_size, encoders={"gzip": GzipEncoder})(scope, receive, send))
+    return messages
+
+class TestCompression:
+    """Testes para a compressão negociada das respostas"""
+
+    def test_negotiate_encoding(self):
+        """Teste: Escolhe a maior q aceita, com empate decidido pela preferência do servidor"""
+        assert negotiate_encoding("gzip, deflate, br, zstd", ENCODERS) == "zstd"
+        assert negotiate_encoding("gzip;q=1.0, br;q=0.5", ENCODERS) == "gzip"
+        assert negotiate_encoding("*;q=0.1, br;q=0", ENCODERS) == "zstd"
+        assert negotiate_encoding("gzip;q=0", ENCODERS) is None
+        assert negotiate_encoding("identity", ENCODERS) is None
+        assert negotiate_encoding("", ENCODERS) is None
+
+    def test_large_listing_compressed(self, client, auth_headers):
+        """Teste: Listagem grande é comprimida com gzip quando o cliente aceita"""
+        client.post("/tasks/bulk", headers=auth_headers, json=[{"title": f"Tarefa {i}", "description": "Descrição"} for i in range(50)])
+        response = client.get("/tasks", headers={**auth_headers, "Accept-Encoding": "gzip"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) < len(response.content)
+        assert len(response.json()) == 50
+
+    def test_identity_when_not_accepted(self, client, auth_headers):
+        """Teste: Sem gzip no Accept-Encoding a resposta sai sem compressão"""
+        client.post("/tasks/bulk", headers=auth_headers, json=[{"title": f"Tarefa {i}", "description": "Descrição"} for i in range(50)])
+        for accept_encoding in ("identity", "gzip;q=0"):
+            response = client.get("/tasks", headers={**auth_headers, "Accept-Encoding": accept_encoding})
+            assert "content-encoding" not in response.headers
+            assert len(response.json()) == 50
+
+    def test_small_body_not_compressed(self, client):
+        """Teste: Corpos abaixo do limite mínimo não são comprimidos"""
+        response = client.get("/", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == status.HTTP_200_OK
+        assert "content-encoding" not in response.headers
+
+    def test_not_modified_not_compressed(self, client, auth_headers, test_task):
+        """Teste: 304 sem corpo passa direto pelo middleware"""
+        etag = client.get("/tasks", headers=auth_headers).headers["etag"]
+        response = client.get("/tasks", headers={**auth_headers, "If-None-Match": etag, "Accept-Encoding": "gzip"})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert "content-encoding" not in response.headers
+
+    def test_export_stream_compressed(self, client, auth_headers, test_task):
+        """Teste: Exportação em streaming é comprimida sem Content-Length"""
+        response = client.get("/tasks/export", headers={**auth_headers, "Accept-Encoding": "gzip"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert json.loads(response.text)["id"] == test_task.id
+
+    def test_stream_compressed_chunk_by_chunk(self):
+        """Teste: Cada pedaço do streaming sai comprimido e decodificável assim que chega"""
+        chunks = [f"linha {i}\n".encode() * 50 for i in range(3)]
+
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/x-ndjson")]})
+            for index, chunk in enumerate(chunks):
+                await send({"type": "http.response.body", "body": chunk, "more_body": index < len(chunks) - 1})
+
+        messages = run_middleware(app)
+        assert (b"content-encoding", b"gzip") in messages[0]["headers"]
+        bodies = [message["body"] for message in messages[1:]]
+        assert len(bodies) == len(chunks)
+
+        decoder = zlib.decompressobj(31)
+        for body, chunk in zip(bodies, chunks):
+            assert decoder.decompress(body) == chunk
+        assert decoder.eof
+
+    def test_already_encoded_not_compressed(self):
+        """Teste: Respostas com Content-Encoding próprio passam intactas"""
+        body = b"x" * 1000
+
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": [(b"content-encoding", b"br")]})
+            await send({"type": "http.response.body", "body": body})
+
+        messages = run_middleware(app)
+        assert messages[0]["headers"] == [(b"content-encoding", b"br")]
+        assert messages[1]["body"] == body
\ No newline at end of file
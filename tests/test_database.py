@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+import database.session
+from database.session import commit_with_retry, is_lock_error
+
+def operational_error(message):
+    return OperationalError("COMMIT", {}, Exception(message))
+
+class FakeSession:
+    def __init__(self, commit_errors):
+        self.commit_errors = list(commit_errors)
+        self.commits = 0
+        self.rollbacks = 0
+    
+    async def commit(self):
+        self.commits += 1
+        if self.commit_errors:
+            raise self.commit_errors.pop(0)
+    
+    async def rollback(self):
+        self.rollbacks += 1
+
+class TestDatabase:
+    """Testes para a configuração do banco e retry de locks"""
+    
+    def test_sqlite_pragmas_applied(self, db_session):
+        """Teste: PRAGMAs de desempenho aplicados na conexão"""
+        assert db_session.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert db_session.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert db_session.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert db_session.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+    
+    def test_is_lock_error(self):
+        """Teste: Identificação de erros de lock do SQLite"""
+        assert is_lock_error(operational_error("database is locked"))
+        assert not is_lock_error(operational_error("no such table: tasks"))
+    
+    def test_commit_with_retry_recovers(self, monkeypatch):
+        """Teste: Unidade de trabalho é repetida após erro de lock"""
+        monkeypatch.setattr(database.session, "DB_LOCK_BACKOFF_SECONDS", 0)
+        db = FakeSession([operational_error("database is locked")])
+        calls = []
+        
+        async def work():
+            calls.append(1)
+            return "ok"
+        
+        assert asyncio.run(commit_with_retry(db, work)) == "ok"
+        assert len(calls) == 2
+        assert db.rollbacks == 1
+    
+    def test_commit_with_retry_gives_up(self, monkeypatch):
+        """Teste: Erro de lock persistente é propagado após o limite de tentativas"""
+        monkeypatch.setattr(database.session, "DB_LOCK_BACKOFF_SECONDS", 0)
+        monkeypatch.setattr(database.session, "DB_LOCK_RETRIES", 2)
+        db = FakeSession([operational_error("database is locked")] * 3)
+        
+        async def work():
+            pass
+        
+        with pytest.raises(OperationalError):
+            asyncio.run(commit_with_retry(db, work))
+        assert db.commits == 3
+    
+    def test_commit_with_retry_other_errors(self):
+        """Teste: Erros que não são de lock não são repetidos"""
+        db = FakeSession([operational_error("disk I/O error")])
+        
+        async def work():
+            pass
+        
+        with pytest.raises(OperationalError):
+            asyncio.run(commit_with_retry(db, work))
+        assert db.commits == 1
\ No newline at end of file
@@ -0,0 +1,110 @@
+import asyncio
+import csv
+import io
+import json
+import os
+import pytest
+from fastapi import status
+from sqlalchemy import insert
+
+from main import app
+from models.task import Task
+
+EXPORT_RSS_ROWS = 1_000_000
+EXPORT_RSS_LIMIT_MB = 64
+
+def current_rss_mb():
+    # Só memória anônima (heap): páginas do arquivo mapeadas pelo mmap do SQLite não contam
+    with open("/proc/self/status") as proc_status:
+        for line in proc_status:
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1]) / 1024
+
+class TestTasksExport:
+    """Testes para exportação de tarefas em streaming"""
+    
+    def test_export_ndjson(self, client, auth_headers, test_task):
+        """Teste: Exportar tarefas em NDJSON"""
+        response = client.get("/tasks/export", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines == [{
+            "title": "Test Task",
+            "description": "Test Description",
+            "id": test_task.id,
+            "status": "Pendente",
+            "user_id": test_task.user_id
+        }]
+    
+    def test_export_csv(self, client, auth_headers, test_task):
+        """Teste: Exportar tarefas em CSV"""
+        response = client.get("/tasks/export?format=csv", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert rows[0] == ["title", "description", "id", "status", "user_id"]
+        assert rows[1][:2] == ["Test Task", "Test Description"]
+        assert len(rows) == 2
+    
+    def test_export_only_own_tasks(self, client, auth_headers, db_session, test_task):
+        """Teste: Exportação não inclui tarefas de outros usuários"""
+        db_session.add(Task(title="Outra", user_id=test_task.user_id + 1))
+        db_session.commit()
+        response = client.get("/tasks/export", headers=auth_headers)
+        assert len(response.text.splitlines()) == 1
+    
+    def test_export_invalid_format(self, client, auth_headers):
+        """Teste: Formato de exportação inválido"""
+        response = client.get("/tasks/export?format=xml", headers=auth_headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    def test_export_unauthorized(self, client):
+        """Teste: Exportar sem autenticação"""
+        response = client.get("/tasks/export")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    @pytest.mark.slow
+    @pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="requer /proc para medir RSS")
+    def test_export_constant_memory(self, client, auth_headers, db_session, test_user):
+        """Teste: Pico de RSS limitado ao exportar 1M de tarefas"""
+        batch = 50_000
+        for start in range(0, EXPORT_RSS_ROWS, batch):
+            db_session.execute(insert(Task), [
+                {"title": f"Tarefa {n}", "description": "Descrição", "status": "Pendente", "user_id": test_user.id}
+                for n in range(start, min(start + batch, EXPORT_RSS_ROWS))
+            ])
+        db_session.commit()
+        
+        # Chama o app ASGI diretamente: TestClient/httpx acumulariam o corpo inteiro em memória
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": "/tasks/export", "raw_path": b"/tasks/export", "query_string": b"",
+            "root_path": "", "server": ("test", 80), "client": ("test", 1234),
+            "headers": [(b"authorization", auth_headers["Authorization"].encode())],
+        }
+        baseline = current_rss_mb()
+        stats = {"lines": 0, "peak": baseline, "status": None}
+        
+        request_sent = False
+        
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # Sem desconexão: o StreamingResponse fica esperando até o fim do corpo
+            await asyncio.Event().wait()
+        
+        async def send(message):
+            if message["type"] == "http.response.start":
+                stats["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                stats["lines"] += message.get("body", b"").count(b"\n")
+                stats["peak"] = max(stats["peak"], current_rss_mb())
+        
+        asyncio.run(app(scope, receive, send))
+        
+        assert stats["status"] == status.HTTP_200_OK
+        assert stats["lines"] == EXPORT_RSS_ROWS
+        assert stats["peak"] - baseline < EXPORT_RSS_LIMIT_MB
\ No newline at end of file
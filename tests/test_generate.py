@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import create_engine, inspect
+from database.generate import generate, TASK_STATUS_WEIGHTS
+from database.session import apply_sqlite_pragmas
+from common.auth import verify_password
+
+@pytest.fixture
+def generated_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'generated.db'}")
+    apply_sqlite_pragmas(engine)
+    generate(engine, users=20, tasks=500, password="senha123", seed=1, batch_size=64, commit_every=200)
+    yield engine
+    engine.dispose()
+
+class TestGenerate:
+    """Testes para o gerador de bases sintéticas"""
+    
+    def test_generates_users_and_tasks(self, generated_engine):
+        """Teste: Quantidades, status válidos e senha única reaproveitada"""
+        with generated_engine.connect() as conn:
+            assert conn.exec_driver_sql("SELECT count(*) FROM users").scalar() == 20
+            assert conn.exec_driver_sql("SELECT count(*) FROM tasks").scalar() == 500
+            statuses = set(conn.exec_driver_sql("SELECT DISTINCT status FROM tasks").scalars())
+            assert statuses <= set(TASK_STATUS_WEIGHTS)
+            assert conn.exec_driver_sql("SELECT count(DISTINCT user_id) FROM tasks WHERE user_id NOT BETWEEN 1 AND 20").scalar() == 0
+            hashes = set(conn.exec_driver_sql("SELECT hashed_password FROM users").scalars())
+        assert len(hashes) == 1
+        assert verify_password("senha123", hashes.pop())
+    
+    def test_indexes_and_search_rebuilt(self, generated_engine):
+        """Teste: Índices, triggers e índice de busca existem depois da carga"""
+        indexes = {index["name"] for index in inspect(generated_engine).get_indexes("tasks")}
+        assert "ix_tasks_user_id_id" in indexes and "ix_tasks_user_id_revision_id" in indexes
+        with generated_engine.begin() as conn:
+            searchable = conn.exec_driver_sql("SELECT count(*) FROM tasks_fts WHERE tasks_fts MATCH 'relatório'").scalar()
+            expected = conn.exec_driver_sql("SELECT count(*) FROM tasks WHERE title LIKE '%relatório%' OR description LIKE '%relatório%'").scalar()
+            assert searchable == expected > 0
+            # Triggers de volta: novas tarefas entram no índice
+            conn.exec_driver_sql("INSERT INTO tasks (title, status, user_id) VALUES ('Tarefa xylofone', 'Pendente', 1)")
+            assert conn.exec_driver_sql("SELECT count(*) FROM tasks_fts WHERE tasks_fts MATCH 'xylofone'").scalar() == 1
+    
+    def test_refuses_non_empty_database(self, generated_engine):
+        """Teste: Não mistura dados gerados com um banco já preenchido"""
+        with pytest.raises(ValueError):
+            generate(generated_engine, users=1, tasks=1)
\ No newline at end of file
@@ -0,0 +1,106 @@
+import json
+import pytest
+from fastapi import status
+
+def ndjson(*objects):
+    return "\n".join(obj if isinstance(obj, str) else json.dumps(obj) for obj in objects)
+
+class TestTasksImport:
+    """Testes para importação de tarefas em NDJSON"""
+    
+    def test_import_success(self, client, auth_headers):
+        """Teste: Importar tarefas válidas"""
+        body = ndjson(*({"title": f"Tarefa {i}", "description": "Importada"} for i in range(3)))
+        response = client.post("/tasks/import", headers=auth_headers, content=body)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"accepted": 3, "rejected": 0, "errors": []}
+        
+        tasks = client.get("/tasks", headers=auth_headers).json()
+        assert [task["title"] for task in tasks] == ["Tarefa 0", "Tarefa 1", "Tarefa 2"]
+        assert all(task["status"] == "Pendente" for task in tasks)
+    
+    def test_import_reports_rejected_lines(self, client, auth_headers):
+        """Teste: Linhas inválidas são rejeitadas e reportadas"""
+        body = ndjson(
+            {"title": "Válida"},
+            {"title": ""},
+            "não é json",
+            {"description": "sem título"},
+            "[1, 2]",
+            "",
+            {"title": "a" * 201},
+        )
+        response = client.post("/tasks/import", headers=auth_headers, content=body)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["accepted"] == 1
+        assert data["rejected"] == 5
+        assert [error["line"] for error in data["errors"]] == [2, 3, 4, 5, 7]
+        assert "não pode estar vazio" in data["errors"][0]["detail"]
+        assert "máximo 200 caracteres" in data["errors"][4]["detail"]
+    
+    def test_import_across_batches(self, client, auth_headers):
+        """Teste: Importação maior que um lote"""
+        from api.tasks import IMPORT_BATCH_SIZE
+        total = IMPORT_BATCH_SIZE * 2 + 5
+        body = ndjson(*({"title": f"Tarefa {i}"} for i in range(total)))
+        response = client.post("/tasks/import", headers=auth_headers, content=body)
+        assert response.json()["accepted"] == total
+        
+        export = client.get("/tasks/export", headers=auth_headers)
+        assert len(export.text.splitlines()) == total
+    
+    def test_import_line_too_long(self, client, auth_headers):
+        """Teste: Linha acima do limite é rejeitada sem afetar as demais"""
+        from api.tasks import IMPORT_MAX_LINE_BYTES
+        body = ndjson({"title": "x" * IMPORT_MAX_LINE_BYTES}, {"title": "Depois"})
+        response = client.post("/tasks/import", headers=auth_headers, content=body)
+        data = response.json()
+        assert data["accepted"] == 1
+        assert data["errors"][0]["line"] == 1
+    
+    def test_import_line_too_long_in_single_chunk(self, client, auth_headers):
+        """Teste: Linha válida acima do limite é rejeitada mesmo chegando inteira num chunk"""
+        from api.tasks import IMPORT_MAX_LINE_BYTES
+        padded = '{"title": "Longa"' + " " * IMPORT_MAX_LINE_BYTES + "}"
+        response = client.post("/tasks/import", headers=auth_headers, content=ndjson(padded, {"title": "Depois"}))
+        data = response.json()
+        assert data["accepted"] == 1
+        assert data["errors"][0]["line"] == 1
+        assert "excede" in data["errors"][0]["detail"]
+    
+    def test_import_deeply_nested_line(self, client, auth_headers):
+        """Teste: JSON aninhado demais é rejeitado como linha inválida, sem erro 500"""
+        nested = "[" * 30_000 + "]" * 30_000
+        response = client.post("/tasks/import", headers=auth_headers, content=ndjson({"title": "Antes"}, nested, {"title": "Depois"}))
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["accepted"] == 2
+        assert data["errors"][0]["line"] == 2
+    
+    def test_ndjson_lines_across_chunks(self):
+        """Teste: Linhas divididas entre chunks e linha longa descartada"""
+        import asyncio
+        from api.tasks import _ndjson_lines, IMPORT_MAX_LINE_BYTES
+        
+        body = b'{"title": "A"}\n' + b"x" * (IMPORT_MAX_LINE_BYTES * 2) + b'\n{"title": "B"}\n{"title": "C"}'
+        
+        class ChunkedRequest:
+            async def stream(self):
+                for start in range(0, len(body), 1000):
+                    yield body[start:start + 1000]
+        
+        async def collect():
+            return [item async for item in _ndjson_lines(ChunkedRequest())]
+        
+        assert asyncio.run(collect()) == [
+            (1, b'{"title": "A"}'),
+            (2, None),
+            (3, b'{"title": "B"}'),
+            (4, b'{"title": "C"}'),
+        ]
+    
+    def test_import_unauthorized(self, client):
+        """Teste: Importar sem autenticação"""
+        response = client.post("/tasks/import", content=ndjson({"title": "Tarefa"}))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
\ No newline at end of file
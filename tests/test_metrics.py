@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import re
+import threading
+import time
+import pytest
+from fastapi import APIRouter, FastAPI, status
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from common import metrics
+from common.metrics import (
+    Counter, Histogram, InstrumentedRoute, http_requests_total, http_requests_in_flight,
+    db_queries_per_request, db_pool_wait_seconds, db_pool_checkout_seconds, password_hash_seconds, jwt_verify_seconds,
+    db_n_plus_one_total, instrument_engine, statement_shape,
+)
+
+# Limite do custo da instrumentação por requisição (folgado para máquinas lentas de CI)
+INSTRUMENTATION_OVERHEAD_LIMIT_US = 100
+
+def make_app(route_class):
+    router = APIRouter(route_class=route_class)
+
+    @router.get("/ping/{item_id}")
+    async def ping(item_id: int):
+        return {"id": item_id}
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+async def drive(app, requests):
+    """Chama o app ASGI direto, sem cliente HTTP, para medir só o caminho do servidor."""
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "GET", "scheme": "http", "path": "/ping/1",
+        "raw_path": b"/ping/1", "query_string": b"", "root_path": "", "headers": [], "server": ("test", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / requests
+
+class TestMetrics:
+    """Testes para o endpoint /metrics e a instrumentação"""
+
+    def test_metrics_endpoint(self, client, auth_headers, test_task):
+        """Teste: /metrics expõe contagem, latência e queries por rota (template do caminho)"""
+        labels = ("PUT", "/tasks/{task_id}")
+        before = http_requests_total.value(labels + (200,))
+        queries_before = db_queries_per_request.count(labels)
+
+        assert client.put(f"/tasks/{test_task.id}", headers=auth_headers, json={"title": "Editada"}).status_code == status.HTTP_200_OK
+        assert client.put("/tasks/999999", headers=auth_headers, json={"title": "Editada"}).status_code == status.HTTP_404_NOT_FOUND
+
+        assert http_requests_total.value(labels + (200,)) == before + 1
+        assert http_requests_total.value(labels + (404,)) >= 1
+        assert db_queries_per_request.count(labels) == queries_before + 2
+        assert http_requests_in_flight.value(labels) == 0
+
+        response = client.get("/metrics")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+        assert '# TYPE http_request_duration_seconds histogram' in response.text
+        assert 'http_requests_total{method="PUT",route="/tasks/{task_id}",status="200"}' in response.text
+        assert 'db_queries_per_request_bucket{method="PUT",route="/tasks/{task_id}",le="+Inf"}' in response.text
+
+    def test_auth_and_pool_metrics(self, client, test_user):
+        """Teste: Tempo de bcrypt, de verificação de JWT e do pool são registrados"""
+        verify_before = password_hash_seconds.count(("verify",))
+        jwt_before = jwt_verify_seconds.count()
+        wait_before = db_pool_wait_seconds.count(("async",))
+        checkout_before = db_pool_checkout_seconds.count(("async",))
+
+        token = client.post("/token", json={"username": "testuser", "password": "testpass123"}).json()["access_token"]
+        client.get("/tasks", headers={"Authorization": f"Bearer {token}"})
+
+        assert password_hash_seconds.count(("verify",)) == verify_before + 1
+        assert jwt_verify_seconds.count() == jwt_before + 1
+        assert db_pool_wait_seconds.count(("async",)) > wait_before
+        assert db_pool_checkout_seconds.count(("async",)) > checkout_before
+
+    def test_cache_metrics(self, client, auth_headers):
+        """Teste: Acertos, falhas e tamanho dos caches saem em /metrics"""
+        client.get("/tasks", headers=auth_headers)
+        client.get("/tasks", headers=auth_headers)
+
+        text = client.get("/metrics").text
+        assert "# TYPE cache_hits_total counter" in text
+        assert 'cache_hits_total{cache="token"} ' in text
+        assert 'cache_entries{cache="task_list"} 1' in text
+        assert re.search(r'cache_hits_total\{cache="task_list"\} [1-9]', text)
+        assert re.search(r'cache_bytes\{cache="task_list"\} [1-9]', text)
+        assert 'cache_max_entries{cache="user"} ' in text
+
+    def test_sharded_counters(self):
+        """Teste: Incrementos de várias threads somam sem perda"""
+        counter = Counter("test_total", "Teste", ("kind",))
+        histogram = Histogram("test_seconds", "Teste", buckets=(0.1, 1.0))
+
+        def work():
+            for _ in range(10_000):
+                counter.inc(("a",))
+                histogram.observe(0.5)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.value(("a",)) == 40_000
+        assert histogram.count() == 40_000
+        lines = histogram.render()
+        assert 'test_seconds_bucket{le="0.1"} 0' in lines
+        assert 'test_seconds_bucket{le="1.0"} 40000' in lines
+        assert 'test_seconds_count 40000' in lines
+
+    @pytest.mark.slow
+    def test_instrumentation_overhead(self):
+        """Teste: Custo da instrumentação por requisição (rota instrumentada vs APIRoute)"""
+        plain, instrumented = make_app(APIRoute), make_app(InstrumentedRoute)
+
+        async def measure():
+            await drive(plain, 200)
+            await drive(instrumented, 200)
+            # Menor de várias rodadas: descarta ruído do agendador
+            plain_cost = min([await drive(plain, 500) for _ in range(5)])
+            instrumented_cost = min([await drive(instrumented, 500) for _ in range(5)])
+            return plain_cost, instrumented_cost
+
+        plain_cost, instrumented_cost = asyncio.run(measure())
+        overhead_us = (instrumented_cost - plain_cost) * 1_000_000
+        assert overhead_us < INSTRUMENTATION_OVERHEAD_LIMIT_US, f"{overhead_us:.1f} µs/requisição"
+
+class TestQueryInstrumentation:
+    """Testes para Server-Timing, log de queries lentas e detecção de N+1"""
+
+    def test_server_timing_only_when_debugging(self, client, auth_headers, monkeypatch):
+        """Teste: Header Server-Timing com queries e tempo no banco só com DEBUG_SERVER_TIMING"""
+        assert "server-timing" not in client.get("/tasks", headers=auth_headers).headers
+
+        monkeypatch.setattr(metrics, "DEBUG_SERVER_TIMING", True)
+        response = client.get("/tasks", headers=auth_headers)
+        match = re.match(r'db;dur=[\d.]+;desc="(\d+) queries", app;dur=[\d.]+$', response.headers["server-timing"])
+        assert match and int(match.group(1)) >= 1
+
+    def test_slow_query_logged_with_route(self, client, auth_headers, monkeypatch, caplog):
+        """Teste: Statements acima do limite são logados com a rota"""
+        monkeypatch.setattr(metrics, "DB_SLOW_QUERY_MS", 0)
+        with caplog.at_level(logging.WARNING, logger="common.metrics"):
+            client.get("/tasks", headers=auth_headers)
+        assert any("Slow query" in message and "GET /tasks" in message for message in caplog.messages)
+
+    def test_n_plus_one_detected(self, caplog):
+        """Teste: O mesmo formato de statement repetido na requisição é sinalizado"""
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=NullPool)
+        instrument_engine(engine, "n_plus_one")
+        router = APIRouter(route_class=InstrumentedRoute)
+
+        @router.get("/items")
+        async def items():
+            async with engine.connect() as conn:
+                for item_id in range(metrics.DB_N_PLUS_ONE_THRESHOLD + 1):
+                    await conn.execute(text("SELECT :id"), {"id": item_id})
+            return {}
+
+        app = FastAPI()
+        app.include_router(router)
+        before = db_n_plus_one_total.value(("GET", "/items"))
+        with caplog.at_level(logging.WARNING, logger="common.metrics"):
+            TestClient(app).get("/items")
+
+        assert db_n_plus_one_total.value(("GET", "/items")) == before + 1
+        assert [message for message in caplog.messages if "Possible N+1 on GET /items" in message]
+
+    def test_statement_shape(self):
+        """Teste: Listas de IN expandidas têm o mesmo formato"""
+        assert statement_shape("SELECT id FROM tasks WHERE id IN (?, ?, ?)") == statement_shape("SELECT id FROM tasks WHERE id IN (?, ?)")
+        assert statement_shape("SELECT id FROM tasks WHERE id = ?") == "SELECT id FROM tasks WHERE id = ?"
\ No newline at end of file
@@ -0,0 +1,106 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from database.migrations import run_migrations, MIGRATIONS
+
+LEGACY_SCHEMA = [
+    "CREATE TABLE users (id INTEGER NOT NULL PRIMARY KEY, username VARCHAR NOT NULL, email VARCHAR NOT NULL, hashed_password VARCHAR NOT NULL)",
+    "CREATE TABLE tasks (id INTEGER NOT NULL PRIMARY KEY, title VARCHAR NOT NULL, description VARCHAR, status VARCHAR, user_id INTEGER REFERENCES users (id))",
+    "CREATE INDEX ix_tasks_id ON tasks (id)",
+    "CREATE INDEX ix_tasks_title ON tasks (title)",
+    "CREATE INDEX ix_tasks_description ON tasks (description)",
+    "CREATE INDEX ix_tasks_status ON tasks (status)",
+    "CREATE INDEX ix_tasks_user_id ON tasks (user_id)",
+]
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        for statement in LEGACY_SCHEMA:
+            conn.exec_driver_sql(statement)
+        conn.exec_driver_sql("INSERT INTO users VALUES (1, 'legacy', 'legacy@example.com', 'x')")
+        conn.exec_driver_sql("INSERT INTO tasks (title, status, user_id) VALUES ('Antiga', 'Pendente', 1)")
+    yield engine
+    engine.dispose()
+
+def task_indexes(conn):
+    rows = conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'tasks'"))
+    return {row[0] for row in rows}
+
+class TestMigrations:
+    """Testes para as migrações de esquema"""
+    
+    def test_migrates_legacy_indexes(self, legacy_engine):
+        """Teste: Banco antigo recebe os índices compostos e perde os de coluna única"""
+        assert run_migrations(legacy_engine) == [version for version, _, _ in MIGRATIONS]
+        with legacy_engine.connect() as conn:
+            assert task_indexes(conn) == {
+                "ix_tasks_user_id_id", "ix_tasks_user_id_status_id",
+                "ix_tasks_user_id_title_id", "ix_tasks_user_id_status_title_id",
+                "ix_tasks_user_id_revision_id",
+            }
+            assert conn.execute(text("SELECT title FROM tasks")).scalar() == "Antiga"
+            assert conn.execute(text("SELECT revision FROM users")).scalar() == 0
+    
+    def test_migrations_idempotent(self, legacy_engine):
+        """Teste: Migrações já aplicadas não rodam de novo"""
+        run_migrations(legacy_engine)
+        assert run_migrations(legacy_engine) == []
+        with legacy_engine.connect() as conn:
+            versions = conn.execute(text("SELECT version FROM schema_migrations")).scalars().all()
+        assert versions == [version for version, _, _ in MIGRATIONS]
+    
+    def test_task_listing_uses_composite_index(self, legacy_engine):
+        """Teste: Listagem por usuário usa o índice (user_id, id)"""
+        with legacy_engine.begin() as conn:
+            conn.exec_driver_sql(
+                "INSERT INTO tasks (title, status, user_id) VALUES (?, 'Pendente', ?)",
+                [(f"Tarefa {i}", i % 50) for i in range(5000)],
+            )
+        run_migrations(legacy_engine)
+        with legacy_engine.connect() as conn:
+            plan = " ".join(str(row[-1]) for row in conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT id, title FROM tasks WHERE user_id = 1 AND id > 0 ORDER BY id LIMIT 10"
+            )))
+        assert "ix_tasks_user_id_id" in plan
+        assert "TEMP B-TREE" not in plan
+    
+    def test_status_filter_uses_composite_index(self, legacy_engine):
+        """Teste: Filtro por status ordenado por título usa o índice (user_id, status, title, id)"""
+        with legacy_engine.begin() as conn:
+            conn.exec_driver_sql(
+                "INSERT INTO tasks (title, status, user_id) VALUES (?, ?, ?)",
+                [(f"Tarefa {i}", ("Pendente", "Concluída")[i % 2], i % 50) for i in range(5000)],
+            )
+        run_migrations(legacy_engine)
+        with legacy_engine.connect() as conn:
+            plan = " ".join(str(row[-1]) for row in conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT id, title FROM tasks WHERE user_id = 1 AND status = 'Pendente' "
+                "AND title >= 'Tar' AND title < 'Tas' ORDER BY title DESC, id DESC LIMIT 10"
+            )))
+        assert "ix_tasks_user_id_status_title_id" in plan
+        assert "TEMP B-TREE" not in plan
+    
+    def test_search_index_built_for_legacy_tasks(self, legacy_engine):
+        """Teste: Migração indexa as tarefas existentes e instala os triggers de busca"""
+        run_migrations(legacy_engine)
+        with legacy_engine.begin() as conn:
+            conn.exec_driver_sql("INSERT INTO tasks (title, status, user_id) VALUES ('Antiga também', 'Pendente', 1)")
+            matches = conn.execute(text("SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH 'antiga' ORDER BY rowid")).scalars().all()
+        assert matches == [1, 2]
+    
+    def test_user_ids_not_reused_after_migration(self, legacy_engine):
+        """Teste: Após a migração, ids de contas removidas (inclusive só referenciados por tarefas) não voltam"""
+        with legacy_engine.begin() as conn:
+            conn.exec_driver_sql("INSERT INTO users VALUES (2, 'removida', 'removida@example.com', 'x')")
+            conn.exec_driver_sql("INSERT INTO tasks (title, status, user_id) VALUES ('Órfã', 'Pendente', 3)")
+        run_migrations(legacy_engine)
+        with legacy_engine.begin() as conn:
+            assert "AUTOINCREMENT" in conn.exec_driver_sql("SELECT sql FROM sqlite_master WHERE name = 'users'").scalar()
+            assert conn.execute(text("SELECT username FROM users ORDER BY id")).scalars().all() == ["legacy", "removida"]
+            conn.exec_driver_sql("DELETE FROM users WHERE id = 2")
+            conn.exec_driver_sql("INSERT INTO users (username, email, hashed_password) VALUES ('nova', 'nova@example.com', 'x')")
+            assert conn.execute(text("SELECT id FROM users WHERE username = 'nova'")).scalar() == 4
+            indexes = conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'users'")).scalars().all()
+        assert {"ix_users_id", "ix_users_username", "ix_users_email"} <= set(indexes)
\ No newline at end of file
@@ -0,0 +1,64 @@
+import asyncio
+import json
+import httpx
+from fastapi.testclient import TestClient
+from main import app
+from common.recorder import TrafficRecorderMiddleware, REDACTED
+from tests.bench.replay import load_trace, replay, route_of
+
+def record(tmp_path, test_user):
+    trace_path = tmp_path / "trace.jsonl"
+    with TestClient(TrafficRecorderMiddleware(app, path=str(trace_path))) as client:
+        token = client.post("/token", json={"username": "testuser", "password": "testpass123"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        task = client.post("/tasks", json={"title": "Gravada"}, headers=headers).json()
+        client.get("/tasks?limit=5", headers=headers)
+        client.patch(f"/tasks/{task['id']}/status", json={"status": "Concluída"}, headers=headers)
+        client.post("/tasks/import", content=b'{"title": "Importada"}\n', headers={**headers, "Content-Type": "application/x-ndjson"})
+    return trace_path
+
+def run_replay(entries, **options):
+    async def go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://replay") as client:
+            return await replay(entries, client, password="testpass123", **options)
+    return asyncio.run(go())
+
+class TestTrafficReplay:
+    """Testes para a gravação e o replay de tráfego"""
+    
+    def test_recorder_writes_trace(self, tmp_path, client, test_user):
+        """Teste: Cada requisição vira uma linha com usuário, caminho e corpo (senha mascarada)"""
+        entries = load_trace(record(tmp_path, test_user))
+        assert [(entry["method"], entry["path"]) for entry in entries][:3] == [
+            ("POST", "/token"), ("POST", "/tasks"), ("GET", "/tasks?limit=5"),
+        ]
+        assert entries[0]["body"] == {"username": "testuser", "password": REDACTED}
+        assert entries[0]["user"] is None
+        assert all(entry["user"] == test_user.id for entry in entries[1:])
+        assert entries[1]["body"] == {"title": "Gravada"}
+        assert entries[4]["body"] == '{"title": "Importada"}\n'
+        assert entries[4]["content_type"] == "application/x-ndjson"
+        assert [entry["ts"] for entry in entries] == sorted(entry["ts"] for entry in entries)
+        assert "testpass123" not in (tmp_path / "trace.jsonl").read_text()
+    
+    def test_replay_closed_loop(self, tmp_path, client, test_user):
+        """Teste: Replay em processo, loop fechado, sem erros e com latência por rota"""
+        entries = load_trace(record(tmp_path, test_user))
+        result = run_replay(entries, mode="closed", concurrency=2)
+        assert result["requests"] == len(entries)
+        assert result["errors"] == 0
+        assert result["routes"]["PATCH /tasks/{id}/status"]["requests"] == 1
+        assert sum(result["histogram"].values()) == len(entries)
+    
+    def test_replay_open_loop(self, tmp_path, client, test_user):
+        """Teste: Loop aberto a uma taxa fixa (chegadas Poisson)"""
+        entries = load_trace(record(tmp_path, test_user)) * 3
+        result = run_replay(entries, mode="open", rate=500, concurrency=4, seed=1)
+        assert result["requests"] == len(entries)
+        assert result["errors"] == 0
+    
+    def test_route_of(self):
+        """Teste: Ids no caminho e query string não criam rotas distintas"""
+        assert route_of("/tasks/42/status?x=1") == "/tasks/{id}/status"
+        assert route_of("/tasks?limit=5") == "/tasks"
\ No newline at end of file
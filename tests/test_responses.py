@@ -0,0 +1,37 @@
+import pytest
+from fastapi import status
+from fastapi.responses import JSONResponse
+from common import responses
+from common.responses import FastJSONResponse
+from main import app
+
+# Conteúdos com acentos, escapes, números grandes/negativos, floats, None e aninhamento.
+# Floats em notação científica divergem (orjson: 1e-7, json: 1e-07); a API não os emite.
+SAMPLES = [
+    {"title": "Ação rápida ✓", "description": None, "id": 1, "status": "Concluída", "user_id": 2},
+    [{"a": [1, -2, 3.5, 0.001, 2 ** 53]}, {"b": {"c": True, "d": False}}, [], {}],
+    {"escape": "aspas \" barra \\ nova\nlinha \t tab \u0001 controle / barra", "emoji": "😀"},
+    "texto",
+    12345678901234567890,
+    0.1,
+]
+
+class TestResponses:
+    """Testes para a serialização JSON das respostas"""
+    
+    @pytest.mark.parametrize("content", SAMPLES)
+    def test_fast_json_matches_json_response(self, content):
+        """Teste: FastJSONResponse gera os mesmos bytes que o JSONResponse padrão"""
+        assert FastJSONResponse(content).body == JSONResponse(content).body
+    
+    @pytest.mark.parametrize("content", SAMPLES)
+    def test_stdlib_fallback_matches(self, content, monkeypatch):
+        """Teste: Sem orjson, o fallback gera os mesmos bytes"""
+        monkeypatch.setattr(responses, "orjson", None)
+        assert FastJSONResponse(content).body == JSONResponse(content).body
+    
+    def test_openapi_output_unchanged(self, client):
+        """Teste: /openapi.json é idêntico byte a byte ao do JSONResponse padrão"""
+        response = client.get("/openapi.json")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == JSONResponse(app.openapi()).body
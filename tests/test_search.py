@@ -0,0 +1,95 @@
+import pytest
+from fastapi import status
+from models.user import User
+from models.task import Task
+
+class TestTaskSearch:
+    """Testes para a busca textual de tarefas"""
+    
+    def test_search_ranks_title_matches_first(self, client, auth_headers, db_session, test_user):
+        """Teste: Busca encontra título e descrição, com o título mais relevante"""
+        db_session.add_all([
+            Task(title="Comprar pão", description="Passar no mercado", user_id=test_user.id),
+            Task(title="Ir ao mercado", description="Lista da semana", user_id=test_user.id),
+            Task(title="Estudar", description="FastAPI", user_id=test_user.id),
+        ])
+        db_session.commit()
+        
+        response = client.get("/tasks/search?q=mercado", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [task["title"] for task in data] == ["Ir ao mercado", "Comprar pão"]
+        assert data[0]["title_highlight"] == "Ir ao <mark>mercado</mark>"
+        assert data[1]["snippet"] == "Passar no <mark>mercado</mark>"
+    
+    def test_search_ignores_accents_and_matches_prefix(self, client, auth_headers, db_session, test_user):
+        """Teste: Busca sem acentos e pelo início da última palavra"""
+        db_session.add(Task(title="Revisar documentação", user_id=test_user.id))
+        db_session.commit()
+        
+        response = client.get("/tasks/search?q=documenta", headers=auth_headers)
+        assert [task["title"] for task in response.json()] == ["Revisar documentação"]
+        response = client.get("/tasks/search?q=revisar documentacao", headers=auth_headers)
+        assert [task["title"] for task in response.json()] == ["Revisar documentação"]
+    
+    def test_search_only_own_tasks(self, client, auth_headers, db_session, test_user):
+        """Teste: Busca não retorna tarefas de outros usuários"""
+        other = User(username="outro", email="outro@example.com", hashed_password="x")
+        db_session.add(other)
+        db_session.commit()
+        db_session.add_all([
+            Task(title="Relatório mensal", user_id=test_user.id),
+            Task(title="Relatório do outro", user_id=other.id),
+        ])
+        db_session.commit()
+        
+        response = client.get("/tasks/search?q=relatório", headers=auth_headers)
+        assert [task["title"] for task in response.json()] == ["Relatório mensal"]
+        # O id do usuário indexado não pode ser buscado como texto
+        response = client.get(f"/tasks/search?q={other.id}", headers=auth_headers)
+        assert response.json() == []
+    
+    def test_search_follows_updates_and_deletes(self, client, auth_headers, test_task):
+        """Teste: Índice acompanha atualização e exclusão da tarefa"""
+        client.put(f"/tasks/{test_task.id}", headers=auth_headers, json={"title": "Lavar carro"})
+        assert client.get("/tasks/search?q=task", headers=auth_headers).json() == []
+        assert len(client.get("/tasks/search?q=carro", headers=auth_headers).json()) == 1
+        
+        client.delete(f"/tasks/{test_task.id}", headers=auth_headers)
+        assert client.get("/tasks/search?q=carro", headers=auth_headers).json() == []
+    
+    def test_search_paginated(self, client, auth_headers, db_session, test_user):
+        """Teste: Paginar resultados da busca por cursor"""
+        db_session.add_all([Task(title=f"Reunião {i}", user_id=test_user.id) for i in range(5)])
+        db_session.commit()
+        
+        seen = []
+        cursor = None
+        while True:
+            page = client.get("/tasks/search?q=reuniao&limit=2" + (f"&cursor={cursor}" if cursor else ""), headers=auth_headers)
+            assert page.status_code == status.HTTP_200_OK
+            seen += [task["id"] for task in page.json()]
+            cursor = page.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        
+        assert len(seen) == 5
+        assert len(set(seen)) == 5
+    
+    def test_search_escapes_html(self, client, auth_headers, db_session, test_user):
+        """Teste: Trechos destacados escapam HTML do conteúdo"""
+        db_session.add(Task(title="<b>alerta</b>", user_id=test_user.id))
+        db_session.commit()
+        
+        data = client.get("/tasks/search?q=alerta", headers=auth_headers).json()
+        assert data[0]["title_highlight"] == "&lt;b&gt;<mark>alerta</mark>&lt;/b&gt;"
+    
+    def test_search_without_words(self, client, auth_headers):
+        """Teste: Busca só com símbolos"""
+        response = client.get('/tasks/search?q="*()', headers=auth_headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_search_unauthorized(self, client):
+        """Teste: Buscar sem autenticação"""
+        response = client.get("/tasks/search?q=teste")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
\ No newline at end of file
@@ -80,6 +80,188 @@ class TestTasks:
         assert response.status_code == status.HTTP_200_OK
         assert response.json() == []
     
+    def test_get_tasks_paginated(self, client, auth_headers, db_session, test_user):
+        """Teste: Paginar tarefas por cursor"""
+        from models.task import Task
+        db_session.add_all([Task(title=f"Tarefa {i}", user_id=test_user.id) for i in range(5)])
+        db_session.commit()
+        
+        first = client.get("/tasks?limit=2", headers=auth_headers)
+        assert first.status_code == status.HTTP_200_OK
+        assert [task["title"] for task in first.json()] == ["Tarefa 0", "Tarefa 1"]
+        
+        seen = [task["id"] for task in first.json()]
+        cursor = first.headers["X-Next-Cursor"]
+        while cursor:
+            page = client.get(f"/tasks?limit=2&cursor={cursor}", headers=auth_headers)
+            assert page.status_code == status.HTTP_200_OK
+            seen += [task["id"] for task in page.json()]
+            cursor = page.headers.get("X-Next-Cursor")
+        
+        assert len(seen) == 5
+        assert seen == sorted(set(seen))
+    
+    def test_get_tasks_last_page_without_cursor(self, client, auth_headers, test_task):
+        """Teste: Última página não retorna X-Next-Cursor"""
+        response = client.get("/tasks?limit=1", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) == 1
+        assert "X-Next-Cursor" not in response.headers
+    
+    def test_get_tasks_invalid_cursor(self, client, auth_headers):
+        """Teste: Cursor inválido"""
+        response = client.get("/tasks?cursor=nao-e-um-cursor", headers=auth_headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "Cursor inválido" in response.json()["detail"]
+    
+    def test_get_tasks_cursor_from_other_user(self, client, auth_headers, test_user):
+        """Teste: Cursor emitido para outro usuário"""
+        from common.pagination import encode_cursor
+        cursor = encode_cursor(test_user.id + 1, 10)
+        response = client.get(f"/tasks?cursor={cursor}", headers=auth_headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_get_tasks_limit_above_max(self, client, auth_headers):
+        """Teste: Limite acima do tamanho máximo de página"""
+        from common.pagination import TASKS_MAX_PAGE_SIZE
+        response = client.get(f"/tasks?limit={TASKS_MAX_PAGE_SIZE + 1}", headers=auth_headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    def test_get_tasks_filter_by_status(self, client, auth_headers, db_session, test_user):
+        """Teste: Filtrar tarefas por status"""
+        from models.task import Task
+        db_session.add_all([
+            Task(title="Pendente 1", user_id=test_user.id),
+            Task(title="Feita", status="Concluída", user_id=test_user.id),
+            Task(title="Pendente 2", user_id=test_user.id),
+        ])
+        db_session.commit()
+        
+        response = client.get("/tasks?status=Pendente", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert [task["title"] for task in response.json()] == ["Pendente 1", "Pendente 2"]
+    
+    def test_get_tasks_invalid_status_filter(self, client, auth_headers):
+        """Teste: Filtro com status inválido"""
+        response = client.get("/tasks?status=Arquivada", headers=auth_headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    def test_get_tasks_filter_by_title_prefix(self, client, auth_headers, db_session, test_user):
+        """Teste: Filtrar tarefas pelo início do título"""
+        from models.task import Task
+        db_session.add_all([Task(title=title, user_id=test_user.id) for title in ("Estudar", "estudar", "Estudo", "Estante", "Ler")])
+        db_session.commit()
+        
+        response = client.get("/tasks?title_prefix=Estud", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert [task["title"] for task in response.json()] == ["Estudar", "Estudo"]
+    
+    def test_get_tasks_sorted_by_title_paginated(self, client, auth_headers, db_session, test_user):
+        """Teste: Ordenar por título (decrescente) paginando por cursor"""
+        from models.task import Task
+        titles = ["b", "a", "c", "b", "d:e"]
+        db_session.add_all([Task(title=title, user_id=test_user.id) for title in titles])
+        db_session.commit()
+        
+        seen = []
+        url = "/tasks?sort=title&order=desc&limit=2"
+        cursor = None
+        while True:
+            page = client.get(url + (f"&cursor={cursor}" if cursor else ""), headers=auth_headers)
+            assert page.status_code == status.HTTP_200_OK
+            seen += [(task["title"], task["id"]) for task in page.json()]
+            cursor = page.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        
+        assert [title for title, _ in seen] == ["d:e", "c", "b", "b", "a"]
+        assert seen == sorted(seen, reverse=True)
+    
+    def test_get_tasks_cursor_from_other_sort(self, client, auth_headers, db_session, test_user):
+        """Teste: Cursor de ordenação por id usado com ordenação por título"""
+        from models.task import Task
+        db_session.add_all([Task(title=f"Tarefa {i}", user_id=test_user.id) for i in range(3)])
+        db_session.commit()
+        
+        cursor = client.get("/tasks?limit=1", headers=auth_headers).headers["X-Next-Cursor"]
+        response = client.get(f"/tasks?sort=title&cursor={cursor}", headers=auth_headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_get_tasks_not_modified(self, client, auth_headers, test_task):
+        """Teste: Listagem com If-None-Match da revisão atual retorna 304 sem corpo"""
+        response = client.get("/tasks", headers=auth_headers)
+        etag = response.headers["ETag"]
+        assert etag.startswith('W/"')
+        
+        response = client.get("/tasks", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+    
+    def test_get_tasks_etag_changes_on_writes(self, client, auth_headers, test_task):
+        """Teste: Cada escrita em tarefas invalida o ETag da listagem"""
+        writes = [
+            lambda: client.post("/tasks", headers=auth_headers, json={"title": "Nova"}),
+            lambda: client.put(f"/tasks/{test_task.id}", headers=auth_headers, json={"title": "Editada"}),
+            lambda: client.patch(f"/tasks/{test_task.id}/status", headers=auth_headers, json={"status": "Concluída"}),
+            lambda: client.patch("/tasks/bulk/status", headers=auth_headers, json={"ids": [test_task.id], "status": "Pendente"}),
+            lambda: client.post("/tasks/import", headers=auth_headers, content=b'{"title": "Importada"}\n'),
+            lambda: client.delete(f"/tasks/{test_task.id}", headers=auth_headers),
+        ]
+        etag = client.get("/tasks", headers=auth_headers).headers["ETag"]
+        for write in writes:
+            assert write().status_code == status.HTTP_200_OK
+            response = client.get("/tasks", headers={**auth_headers, "If-None-Match": etag})
+            assert response.status_code == status.HTTP_200_OK
+            assert response.headers["ETag"] != etag
+            etag = response.headers["ETag"]
+    
+    def test_get_tasks_failed_write_keeps_etag(self, client, auth_headers):
+        """Teste: Escrita que não altera nada não invalida o ETag"""
+        etag = client.get("/tasks", headers=auth_headers).headers["ETag"]
+        client.put("/tasks/999", headers=auth_headers, json={"title": "Inexistente"})
+        response = client.get("/tasks", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    
+    def test_get_tasks_serialized_as_task_out(self, client, auth_headers, db_session, test_user):
+        """Teste: Serialização direta das linhas gera o mesmo JSON do schema TaskOut"""
+        from models.task import Task
+        from schemas.task import TaskOut
+        task = Task(title="Ação rápida", description=None, status="Pendente", user_id=test_user.id)
+        db_session.add(task)
+        db_session.commit()
+        
+        response = client.get("/tasks", headers=auth_headers)
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == [TaskOut.model_validate(task).model_dump()]
+        assert list(response.json()[0]) == list(TaskOut.model_fields)
+        assert "Ação rápida".encode() in response.content
+    
+    def test_get_tasks_served_from_cache(self, client, auth_headers, test_task):
+        """Teste: Página repetida vem do cache e escritas a invalidam"""
+        from common.revisions import task_list_cache
+        first = client.get("/tasks?limit=10", headers=auth_headers)
+        hits = task_list_cache.stats()["hits"]
+        second = client.get("/tasks?limit=10", headers=auth_headers)
+        assert second.content == first.content
+        assert second.headers["ETag"] == first.headers["ETag"]
+        assert task_list_cache.stats()["hits"] == hits + 1
+        
+        client.put(f"/tasks/{test_task.id}", headers=auth_headers, json={"title": "Editada"})
+        assert task_list_cache.stats()["size"] == 0
+        response = client.get("/tasks?limit=10", headers=auth_headers)
+        assert [task["title"] for task in response.json()] == ["Editada"]
+    
+    def test_get_tasks_cache_keeps_next_cursor(self, client, auth_headers, db_session, test_user):
+        """Teste: Página em cache mantém o header X-Next-Cursor"""
+        from models.task import Task
+        db_session.add_all([Task(title=f"Tarefa {i}", user_id=test_user.id) for i in range(3)])
+        db_session.commit()
+        
+        first = client.get("/tasks?limit=2", headers=auth_headers)
+        second = client.get("/tasks?limit=2", headers=auth_headers)
+        assert second.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+    
     def test_get_tasks_unauthorized(self, client):
         """Teste: Listar tarefas sem autenticação"""
         response = client.get("/tasks")
@@ -186,4 +368,137 @@ class TestTasks:
     def test_delete_task_unauthorized(self, client, test_task):
         """Teste: Deletar tarefa sem autenticação"""
         response = client.delete(f"/tasks/{test_task.id}")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_update_task_keeps_description_when_omitted(self, client, auth_headers, test_task):
+        """Teste: Atualizar só o título mantém a descrição e retorna a tarefa completa"""
+        response = client.put(f"/tasks/{test_task.id}", headers=auth_headers, json={"title": "Só o título"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "title": "Só o título", "description": "Test Description", "id": test_task.id,
+            "status": "Pendente", "user_id": test_task.user_id,
+        }
+    
+    def test_single_task_writes_other_user(self, client, auth_headers, db_session):
+        """Teste: Escritas em tarefa de outro usuário retornam 404 sem alterá-la"""
+        from models.task import Task
+        from models.user import User
+        other = User(username="outro", email="outro@example.com", hashed_password="x")
+        db_session.add(other)
+        db_session.commit()
+        task = Task(title="Alheia", status="Pendente", user_id=other.id)
+        db_session.add(task)
+        db_session.commit()
+    
+        assert client.put(f"/tasks/{task.id}", headers=auth_headers, json={"title": "Invadida"}).status_code == status.HTTP_404_NOT_FOUND
+        assert client.patch(f"/tasks/{task.id}/status", headers=auth_headers, json={"status": "Concluída"}).status_code == status.HTTP_404_NOT_FOUND
+        assert client.delete(f"/tasks/{task.id}", headers=auth_headers).status_code == status.HTTP_404_NOT_FOUND
+    
+        db_session.expire_all()
+        task = db_session.get(Task, task.id)
+        assert (task.title, task.status, task.revision) == ("Alheia", "Pendente", 0)
+    
+    def test_single_task_writes_statement_count(self, client, auth_headers, test_task, monkeypatch):
+        """Teste: Editar e mudar status usam 2 statements (revisão + UPDATE); deletar, 3 (+ tombstone)"""
+        from common import metrics
+        monkeypatch.setattr(metrics, "DEBUG_SERVER_TIMING", True)
+        client.get("/users/me", headers=auth_headers)
+    
+        def queries(response):
+            assert response.status_code == status.HTTP_200_OK
+            return int(response.headers["server-timing"].split('desc="')[1].split(" ")[0])
+    
+        assert queries(client.put(f"/tasks/{test_task.id}", headers=auth_headers, json={"title": "Editada"})) == 2
+        assert queries(client.patch(f"/tasks/{test_task.id}/status", headers=auth_headers, json={"status": "Concluída"})) == 2
+        assert queries(client.delete(f"/tasks/{test_task.id}", headers=auth_headers)) == 3
+    
+class TestTasksBulk:
+    """Testes para endpoints de tarefas em lote"""
+    
+    def test_create_tasks_bulk_success(self, client, auth_headers):
+        """Teste: Criar tarefas em lote"""
+        response = client.post("/tasks/bulk", headers=auth_headers, json=[
+            {"title": "Tarefa 1", "description": "Descrição 1"},
+            {"title": "Tarefa 2"}
+        ])
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [task["title"] for task in data] == ["Tarefa 1", "Tarefa 2"]
+        assert all(task["status"] == "Pendente" for task in data)
+        assert len(client.get("/tasks", headers=auth_headers).json()) == 2
+    
+    def test_create_tasks_bulk_keeps_request_order(self, client, auth_headers):
+        """Teste: Resultado do lote segue a ordem dos itens enviados"""
+        from schemas.task import TASKS_BULK_MAX_SIZE
+        titles = [f"Tarefa {(n * 7919) % TASKS_BULK_MAX_SIZE}" for n in range(TASKS_BULK_MAX_SIZE)]
+        response = client.post("/tasks/bulk", headers=auth_headers, json=[{"title": title} for title in titles])
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [task["title"] for task in data] == titles
+        assert [task["id"] for task in data] == sorted(task["id"] for task in data)
+    
+    def test_create_tasks_bulk_invalid_item(self, client, auth_headers):
+        """Teste: Lote com item inválido não cria nenhuma tarefa"""
+        response = client.post("/tasks/bulk", headers=auth_headers, json=[
+            {"title": "Tarefa válida"},
+            {"title": ""}
+        ])
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert client.get("/tasks", headers=auth_headers).json() == []
+    
+    def test_create_tasks_bulk_too_large(self, client, auth_headers):
+        """Teste: Lote acima do tamanho máximo"""
+        from schemas.task import TASKS_BULK_MAX_SIZE
+        response = client.post("/tasks/bulk", headers=auth_headers, json=[
+            {"title": "Tarefa"} for _ in range(TASKS_BULK_MAX_SIZE + 1)
+        ])
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    def test_update_tasks_bulk(self, client, auth_headers, test_task):
+        """Teste: Atualizar tarefas em lote com item inexistente"""
+        response = client.put("/tasks/bulk", headers=auth_headers, json=[
+            {"id": test_task.id, "title": "Atualizada"},
+            {"id": 999, "title": "Inexistente"}
+        ])
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [
+            {"id": test_task.id, "success": True, "detail": None},
+            {"id": 999, "success": False, "detail": "Tarefa não encontrada ou não pertence ao usuário"}
+        ]
+        task = client.get("/tasks", headers=auth_headers).json()[0]
+        assert task["title"] == "Atualizada"
+        assert task["description"] == "Test Description"
+    
+    def test_update_tasks_status_bulk(self, client, auth_headers, test_task):
+        """Teste: Atualizar status em lote"""
+        response = client.patch("/tasks/bulk/status", headers=auth_headers, json={
+            "ids": [test_task.id, 0],
+            "status": "Concluída"
+        })
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()
+        assert results[0]["success"] is True
+        assert results[1]["success"] is False
+        assert client.get("/tasks", headers=auth_headers).json()[0]["status"] == "Concluída"
+    
+    def test_update_tasks_status_bulk_invalid_status(self, client, auth_headers, test_task):
+        """Teste: Status inválido em lote"""
+        response = client.patch("/tasks/bulk/status", headers=auth_headers, json={
+            "ids": [test_task.id],
+            "status": "Status Inválido"
+        })
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    def test_delete_tasks_bulk(self, client, auth_headers, test_task):
+        """Teste: Deletar tarefas em lote"""
+        response = client.post("/tasks/bulk/delete", headers=auth_headers, json={
+            "ids": [test_task.id, 999]
+        })
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["success"] for item in response.json()] == [True, False]
+        assert client.get("/tasks", headers=auth_headers).json() == []
+    
+    def test_tasks_bulk_unauthorized(self, client):
+        """Teste: Lote sem autenticação"""
+        response = client.post("/tasks/bulk", json=[{"title": "Tarefa"}])
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
\ No newline at end of file
@@ -94,4 +94,72 @@ class TestUsers:
     def test_delete_user_unauthorized(self, client):
         """Teste: Deletar conta sem autenticação"""
         response = client.delete("/users/me")
-        assert response.status_code == status.HTTP_401_UNAUTHORIZED
\ No newline at end of file
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_current_user_cached(self, client, auth_headers):
+        """Teste: Usuário autenticado é servido do cache na segunda requisição"""
+        from common.auth import user_cache
+        client.get("/users/me", headers=auth_headers)
+        hits = user_cache.stats()["hits"]
+        response = client.get("/users/me", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["username"] == "testuser"
+        assert user_cache.stats()["hits"] == hits + 1
+    
+    def test_update_user_from_cache(self, client, auth_headers):
+        """Teste: Atualizar perfil com usuário vindo do cache persiste e invalida o cache"""
+        client.get("/users/me", headers=auth_headers)
+        response = client.put("/users/me", headers=auth_headers, json={
+            "username": "renamed",
+            "email": "renamed@example.com"
+        })
+        assert response.status_code == status.HTTP_200_OK
+        
+        # Token identifica o usuário pelo id: continua válido após renomear
+        response = client.get("/users/me", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["username"] == "renamed"
+        
+        login_response = client.post("/token", json={"username": "renamed", "password": "testpass123"})
+        assert login_response.status_code == status.HTTP_200_OK
+    
+    def test_delete_user_invalidates_cache(self, client, auth_headers):
+        """Teste: Token do usuário deletado deixa de funcionar mesmo com cache"""
+        from common.revisions import task_list_cache
+        client.get("/users/me", headers=auth_headers)
+        client.get("/tasks", headers=auth_headers)
+        assert task_list_cache.stats()["size"] == 1
+        assert client.delete("/users/me", headers=auth_headers).status_code == status.HTTP_200_OK
+        assert task_list_cache.stats()["size"] == 0
+        response = client.get("/users/me", headers=auth_headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_get_current_user_not_modified(self, client, auth_headers):
+        """Teste: Perfil com If-None-Match retorna 304 até a próxima alteração"""
+        etag = client.get("/users/me", headers=auth_headers).headers["ETag"]
+        response = client.get("/users/me", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        
+        client.put("/users/me", headers=auth_headers, json={"username": "renamed", "email": "renamed@example.com"})
+        response = client.get("/users/me", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["username"] == "renamed"
+        assert response.headers["ETag"] != etag
+    
+    def test_get_current_user_etag_matches_body(self, client, auth_headers, db_session, test_user):
+        """Teste: Perfil alterado por outro processo não volta do cache com o ETag novo"""
+        from sqlalchemy import update
+        from models.user import User
+        etag = client.get("/users/me", headers=auth_headers).headers["ETag"]
+        
+        # Escrita de outro processo: o user_cache deste não é invalidado
+        db_session.execute(update(User).where(User.id == test_user.id).values(username="externo", revision=User.revision + 1))
+        db_session.commit()
+        
+        response = client.get("/users/me", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["username"] == "externo"
+        assert response.headers["ETag"] == f'W/"{test_user.id}-1"'
+        
+        response = client.get("/users/me", headers={**auth_headers, "If-None-Match": response.headers["ETag"]})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
\ No newline at end of file